@@ -32,6 +32,7 @@ __all__ = [
     "install_project",
     "lci_matrices_to_excel",
     "lci_matrices_to_matlab",
+    "lci_matrices_to_npz",
     "load_json_data_file",
     "Migration",
     "migrations",
@@ -73,6 +74,7 @@ from .export import (
     keyword_to_gephi_graph,
     lci_matrices_to_excel,
     lci_matrices_to_matlab,
+    lci_matrices_to_npz,
 )
 from .importers import (
     CSVImporter,
@@ -130,7 +132,11 @@ def create_default_biosphere3(overwrite=False):
 
 
 def create_default_lcia_methods(
-    overwrite=False, rationalize_method_names=False, shortcut=True
+    overwrite=False,
+    rationalize_method_names=False,
+    shortcut=True,
+    bulk=True,
+    processes=1,
 ):
     if shortcut:
         import json
@@ -146,10 +152,12 @@ def create_default_lcia_methods(
 
         for method in data:
             method["name"] = tuple(method["name"])
+            for cf in method["exchanges"]:
+                cf["input"] = tuple(cf["input"])
 
         ei = LCIAImporter("lcia_39_ecoinvent.zip")
         ei.data = data
-        ei.write_methods(overwrite=overwrite)
+        ei.write_methods(overwrite=overwrite, bulk=bulk, processes=processes)
     else:
         from .importers import EcoinventLCIAImporter
 
@@ -157,7 +165,7 @@ def create_default_lcia_methods(
         if rationalize_method_names:
             ei.add_rationalize_method_names_strategy()
         ei.apply_strategies()
-        ei.write_methods(overwrite=overwrite)
+        ei.write_methods(overwrite=overwrite, bulk=bulk, processes=processes)
 
 
 def bw2setup():
@@ -224,6 +232,7 @@ def exiobase_monetary(
     products=False,
     name=None,
     ignore_small_balancing_corrections=True,
+    cache=None,
 ):
     import tempfile
     from pathlib import Path
@@ -268,6 +277,7 @@ def exiobase_monetary(
             filepath,
             name,
             ignore_small_balancing_corrections=ignore_small_balancing_corrections,
+            cache=cache,
         )
         ex.apply_strategies()
         ex.write_database()
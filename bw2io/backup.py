@@ -3,16 +3,221 @@ import datetime
 import json
 import os
 import shutil
+import struct
 import tarfile
 import tempfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Union
+from time import perf_counter
+from typing import Iterator, Optional, Tuple, Union
 
 from bw2data import projects
 from bw_processing import safe_filename
 
 _METADATA_FIELDS = {"is_sourced", "revision", "data", "full_hash"}
 
+# Files which are already compressed, or compress badly, are stored uncompressed in
+# parallel backups, e.g. processed datapackages
+_STORED_SUFFIXES = {".zip", ".gz", ".bz2", ".xz", ".zst", ".7z", ".npy", ".npz"}
+
+# Parallel backups are gzip files of independently compressed members ("blocks"),
+# which have their size in the extra field of their header, so that they can be
+# found without decompressing them; similar to BGZF
+_BLOCK_HEADER = struct.Struct("<BBBBIBBH2sHI")
+_BLOCK_SUBFIELD = b"BW"
+
+
+def _compress_block(data: bytes, level: int) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    deflated = compressor.compress(data) + compressor.flush()
+    size = _BLOCK_HEADER.size + len(deflated) + 8
+    return b"".join(
+        [
+            _BLOCK_HEADER.pack(
+                0x1F, 0x8B, 8, 4, 0, 0, 255, 8, _BLOCK_SUBFIELD, 4, size
+            ),
+            deflated,
+            struct.pack("<II", zlib.crc32(data), len(data) & 0xFFFFFFFF),
+        ]
+    )
+
+
+def _block_size(header: bytes) -> Optional[int]:
+    """Size of the block starting with ``header``, or ``None`` if it isn't a block."""
+    if len(header) != _BLOCK_HEADER.size:
+        return None
+    id1, id2, cm, flg, _, _, _, xlen, subfield, length, size = _BLOCK_HEADER.unpack(
+        header
+    )
+    if (id1, id2, cm, flg, xlen, subfield, length) != (
+        0x1F,
+        0x8B,
+        8,
+        4,
+        8,
+        _BLOCK_SUBFIELD,
+        4,
+    ):
+        return None
+    return size
+
+
+def _is_parallel_backup(filepath: Union[str, Path]) -> bool:
+    with open(filepath, "rb") as f:
+        return _block_size(f.read(_BLOCK_HEADER.size)) is not None
+
+
+class _BlockGzipWriter:
+    """
+    Write-only file object which compresses its input in blocks of about
+    ``block_size`` bytes on ``threads`` threads, and writes them to ``fileobj`` in
+    order. Data written while ``stored`` is set isn't compressed.
+    """
+
+    def __init__(self, fileobj, threads: int, level: int = 6, block_size: int = 2**22):
+        self.fileobj = fileobj
+        self.threads = threads
+        self.level = level
+        self.block_size = block_size
+        self.stored = False
+        self.bytes_in = 0
+        self._buffer = bytearray()
+        self._futures = deque()
+        self._executor = ThreadPoolExecutor(threads)
+
+    def write(self, data) -> int:
+        self._buffer += data
+        self.bytes_in += len(data)
+        if len(self._buffer) >= self.block_size:
+            self._submit()
+        return len(data)
+
+    def set_stored(self, stored: bool) -> None:
+        if stored != self.stored:
+            self._submit()
+            self.stored = stored
+
+    def _submit(self) -> None:
+        if self._buffer:
+            self._futures.append(
+                self._executor.submit(
+                    _compress_block,
+                    bytes(self._buffer),
+                    0 if self.stored else self.level,
+                )
+            )
+            self._buffer.clear()
+        # Limit memory use to a few blocks per thread
+        while len(self._futures) > 2 * self.threads:
+            self.fileobj.write(self._futures.popleft().result())
+
+    def close(self) -> None:
+        self._submit()
+        while self._futures:
+            self.fileobj.write(self._futures.popleft().result())
+        self._executor.shutdown()
+
+
+class _BlockGzipReader:
+    """
+    Read-only file object which decompresses the blocks written by
+    ``_BlockGzipWriter`` on ``threads`` threads, ahead of them being read.
+    """
+
+    def __init__(self, fileobj, threads: int):
+        self.threads = threads
+        self._blocks = self._iter_blocks(fileobj)
+        self._futures = deque()
+        self._executor = ThreadPoolExecutor(threads)
+        self._buffer = b""
+        self._position = 0
+
+    @staticmethod
+    def _iter_blocks(fileobj) -> Iterator[bytes]:
+        while True:
+            header = fileobj.read(_BLOCK_HEADER.size)
+            if not header:
+                return
+            size = _block_size(header)
+            if size is None:
+                raise ValueError("Invalid block in parallel backup archive")
+            yield header + fileobj.read(size - len(header))
+
+    def read(self, size: int = -1) -> bytes:
+        chunks, remaining = [], size
+        while remaining:
+            if self._position >= len(self._buffer):
+                for block in self._blocks:
+                    self._futures.append(
+                        self._executor.submit(
+                            zlib.decompress, block, 16 + zlib.MAX_WBITS
+                        )
+                    )
+                    if len(self._futures) >= 2 * self.threads:
+                        break
+                if not self._futures:
+                    break
+                self._buffer, self._position = self._futures.popleft().result(), 0
+            end = len(self._buffer) if remaining < 0 else self._position + remaining
+            chunk = self._buffer[self._position : end]
+            self._position += len(chunk)
+            remaining -= len(chunk)
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    def close(self) -> None:
+        self._executor.shutdown(cancel_futures=True)
+
+
+def _iter_tree(path: Path, arcname: str) -> Iterator[Tuple[Path, str]]:
+    # Same order as ``TarFile.add``
+    yield path, arcname
+    if path.is_dir() and not path.is_symlink():
+        for name in sorted(os.listdir(path)):
+            yield from _iter_tree(path / name, arcname + "/" + name)
+
+
+def _report_throughput(action: str, num_bytes: int, seconds: float) -> None:
+    print(
+        "{} {:.1f} MB in {:.1f} seconds ({:.1f} MB/s)".format(
+            action, num_bytes / 1e6, seconds, num_bytes / 1e6 / max(seconds, 1e-9)
+        )
+    )
+
+
+def _create_tarball(
+    filepath: Path,
+    dirpath: Path,
+    arcname: str,
+    parallel: bool = False,
+    threads: Optional[int] = None,
+) -> None:
+    start = perf_counter()
+    if parallel:
+        with open(filepath, "wb") as f:
+            writer = _BlockGzipWriter(f, threads or os.cpu_count() or 1)
+            with tarfile.open(fileobj=writer, mode="w|") as tar:
+                for path, name in _iter_tree(dirpath, arcname):
+                    writer.set_stored(
+                        path.suffix.lower() in _STORED_SUFFIXES and path.is_file()
+                    )
+                    tar.add(path, arcname=name, recursive=False)
+            writer.close()
+    else:
+        with tarfile.open(filepath, "w:gz") as tar:
+            tar.add(dirpath, arcname=arcname)
+    _report_throughput(
+        "Compressed",
+        sum(
+            path.stat().st_size
+            for path, _ in _iter_tree(dirpath, arcname)
+            if path.is_file()
+        ),
+        perf_counter() - start,
+    )
+
 
 def _add_project_metadata() -> None:
     fp = projects.dir / "project-metadata.json"
@@ -41,7 +246,9 @@ def _restore_project_metadata() -> None:
     projects.dataset.save()
 
 
-def _extract_single_directory_tarball(filepath: Path, output_dir: Path) -> Path:
+def _extract_single_directory_tarball(
+    filepath: Path, output_dir: Path, threads: Optional[int] = None
+) -> Path:
     def is_within_directory(directory, target):
         abs_directory = os.path.abspath(directory)
         abs_target = os.path.abspath(target)
@@ -56,8 +263,24 @@ def _extract_single_directory_tarball(filepath: Path, output_dir: Path) -> Path:
 
         tar.extractall(path, members, numeric_owner=numeric_owner)
 
-    with tarfile.open(filepath, "r:gz") as tar:
-        safe_extract(tar, output_dir)
+    if _is_parallel_backup(filepath):
+        # Decompress blocks on other threads while writing files. The archive is
+        # read as a stream, so members are checked one by one.
+        with open(filepath, "rb") as f:
+            reader = _BlockGzipReader(f, threads or os.cpu_count() or 1)
+            try:
+                with tarfile.open(fileobj=reader, mode="r|") as tar:
+                    for member in tar:
+                        if not is_within_directory(
+                            output_dir, os.path.join(output_dir, member.name)
+                        ):
+                            raise Exception("Attempted path traversal in tar file")
+                        tar.extract(member, output_dir)
+            finally:
+                reader.close()
+    else:
+        with tarfile.open(filepath, "r:gz") as tar:
+            safe_extract(tar, output_dir)
 
     # Find single extracted directory; don't know it ahead of time
     extracted_dirs = [
@@ -71,7 +294,10 @@ def _extract_single_directory_tarball(filepath: Path, output_dir: Path) -> Path:
 
 
 def backup_data_directory(
-    timestamp: Optional[bool] = True, dir_backup: Optional[Union[str, Path]] = None
+    timestamp: Optional[bool] = True,
+    dir_backup: Optional[Union[str, Path]] = None,
+    parallel: bool = False,
+    threads: Optional[int] = None,
 ):
     """
     Backup the Brightway2 data directory to a `.tar.gz` (compressed tar archive) in a specified directory, or in the user's home directory by default.
@@ -86,6 +312,14 @@ def backup_data_directory(
     dir_backup : str, Path, optional
         Directory to backup. If None, use the user's home directory.
 
+    parallel : bool, optional
+        If True, compress in blocks on several threads, and store already compressed
+        files like processed datapackages uncompressed. The archive is still a
+        ``.tar.gz`` file, and can be restored in parallel.
+
+    threads : int, optional
+        Number of threads for ``parallel`` compression. Default is the number of CPUs.
+
     Raises
     ------
     FileNotFoundError
@@ -120,9 +354,8 @@ def backup_data_directory(
     print(
         "Creating backup archive of data directory - this could take a few minutes..."
     )
-    with tarfile.open(fp, "w:gz") as tar:
-        data_directory = Path(projects._base_data_dir)
-        tar.add(data_directory, arcname=data_directory.name)
+    data_directory = Path(projects._base_data_dir)
+    _create_tarball(fp, data_directory, data_directory.name, parallel, threads)
 
     print(f"Saved to: {fp}")
     return fp
@@ -132,6 +365,8 @@ def backup_project_directory(
     project: str,
     timestamp: Optional[bool] = True,
     dir_backup: Optional[Union[str, Path]] = None,
+    parallel: bool = False,
+    threads: Optional[int] = None,
 ) -> Path:
     """
     Backup project data directory to a ``.tar.gz`` (compressed tar archive) in the user's home directory, or a directory specified by ``dir_backup``.
@@ -149,6 +384,14 @@ def backup_project_directory(
     dir_backup : str, Path, optional
         Directory to backup. If None, use the default (home)).
 
+    parallel : bool, optional
+        If True, compress in blocks on several threads, and store already compressed
+        files like processed datapackages uncompressed. The archive is still a
+        ``.tar.gz`` file, and can be restored in parallel.
+
+    threads : int, optional
+        Number of threads for ``parallel`` compression. Default is the number of CPUs.
+
     Returns
     -------
     filepath : Path
@@ -192,8 +435,7 @@ def backup_project_directory(
 
     print("Creating project backup archive - this could take a few minutes...")
 
-    with tarfile.open(fp, "w:gz") as tar:
-        tar.add(dir_path, arcname=safe_filename(project))
+    _create_tarball(fp, dir_path, safe_filename(project), parallel, threads)
 
     print(f"Saved to: {fp}")
 
@@ -206,6 +448,7 @@ def restore_project_directory(
     project_name: Optional[str] = None,
     overwrite_existing: Optional[bool] = False,
     switch: bool = False,
+    threads: Optional[int] = None,
 ):
     """
     Restore a backed up project data directory from a ``.tar.gz`` (compressed tar archive) specified by ``fp``. Choose a custom name, or use the name of the project in the archive. If the project already exists, you must set ``overwrite_existing`` to True.
@@ -219,6 +462,9 @@ def restore_project_directory(
     overwrite_existing : bool, optional
     switch: bool, optional.
         Switch to new project after restoring it.
+    threads : int, optional
+        Number of threads to decompress archives created with ``parallel=True``.
+        Default is the number of CPUs.
 
     Returns
     -------
@@ -259,7 +505,19 @@ def restore_project_directory(
         )
 
     with tempfile.TemporaryDirectory() as td:
-        extracted_path = _extract_single_directory_tarball(filepath=fp, output_dir=td)
+        start = perf_counter()
+        extracted_path = _extract_single_directory_tarball(
+            filepath=fp, output_dir=td, threads=threads
+        )
+        _report_throughput(
+            "Extracted",
+            sum(
+                path.stat().st_size
+                for path in extracted_path.rglob("*")
+                if path.is_file()
+            ),
+            perf_counter() - start,
+        )
 
         _from_project_name = projects.current
         projects.set_current(project_name, update=False)
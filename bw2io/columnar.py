@@ -0,0 +1,473 @@
+"""
+Columnar representation of importer data.
+
+Importers normally hold ``self.data`` as a list of nested dictionaries. For large
+inventories this uses a lot of memory, and every strategy has to loop over each
+exchange in Python. ``ColumnarData`` instead stores nodes and exchanges as tables:
+
+* Numeric fields (``amount``, ``loc``, ``scale``, ...) are NumPy arrays, with a
+  mask recording which rows have the field;
+* Frequently repeated fields (``type``, ``unit``, ``name``, ``categories``, ...)
+  are stored as integer codes into a list of unique values;
+* All other fields are kept per row in plain dictionaries.
+
+Strategies with a vectorized implementation (see ``COLUMNAR_STRATEGIES``) work on
+whole columns; all other strategies are applied to a temporary list of
+dictionaries created with ``ColumnarData.to_data``.
+
+Round-tripping through ``ColumnarData`` doesn't change data, except that numbers in
+numeric fields come back as ``float`` (``uncertainty type`` as ``int``).
+"""
+
+import functools
+from numbers import Number
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from stats_arrays import LognormalUncertainty, UndefinedUncertainty
+
+from .strategies import (
+    fix_unreasonably_high_lognormal_uncertainties,
+    normalize_units,
+    remove_uncertainty_from_negative_loss_exchanges,
+    remove_zero_amount_coproducts,
+    remove_zero_amount_inputs_with_no_activity,
+    set_lognormal_loc_value,
+)
+from .units import normalize_units as normalize_units_function
+
+NUMERIC_FIELDS = ("amount", "loc", "scale", "shape", "minimum", "maximum")
+INTEGER_FIELDS = ("uncertainty type",)
+NODE_CATEGORICAL_FIELDS = (
+    "database",
+    "name",
+    "reference product",
+    "unit",
+    "location",
+    "type",
+)
+EXCHANGE_CATEGORICAL_FIELDS = (
+    "type",
+    "name",
+    "unit",
+    "reference unit",
+    "location",
+    "categories",
+    "input",
+    "flow",
+    "activity",
+)
+
+
+def _is_number(value) -> bool:
+    return (
+        isinstance(value, Number)
+        and not isinstance(value, (bool, complex))
+        and value == value
+    )
+
+
+class Table:
+    """
+    Rows of dictionaries stored as columns.
+
+    Parameters
+    ----------
+    numeric_fields : tuple[str]
+        Fields stored as float arrays.
+    integer_fields : tuple[str]
+        Fields stored as float arrays and returned as ``int``.
+    categorical_fields : tuple[str]
+        Fields stored as codes into a list of unique (hashable) values.
+
+    """
+
+    def __init__(
+        self,
+        numeric_fields: Tuple[str, ...] = (),
+        integer_fields: Tuple[str, ...] = (),
+        categorical_fields: Tuple[str, ...] = (),
+    ):
+        self.numeric_fields = tuple(numeric_fields) + tuple(integer_fields)
+        self.integer_fields = set(integer_fields)
+        self.categorical_fields = tuple(categorical_fields)
+        self.values = {field: np.zeros(0) for field in self.numeric_fields}
+        self.mask = {field: np.zeros(0, dtype=bool) for field in self.numeric_fields}
+        self.codes = {
+            field: np.zeros(0, dtype=np.int32) for field in self.categorical_fields
+        }
+        self.labels = {field: [] for field in self.categorical_fields}
+        self.extra = []
+        # Numeric fields with non-numeric values for some rows, stored in `extra`
+        self.extra_fields = set()
+
+    @classmethod
+    def from_dicts(
+        cls,
+        rows: List[dict],
+        numeric_fields: Tuple[str, ...] = (),
+        integer_fields: Tuple[str, ...] = (),
+        categorical_fields: Tuple[str, ...] = (),
+        skip: Tuple[str, ...] = (),
+    ) -> "Table":
+        """Build a table from ``rows``; fields in ``skip`` are ignored."""
+        table = cls(numeric_fields, integer_fields, categorical_fields)
+        size = len(rows)
+        # Fill Python lists first; setting single NumPy array elements is slow
+        values = {f: [np.nan] * size for f in table.numeric_fields}
+        codes = {f: [-1] * size for f in table.categorical_fields}
+        lookups = {field: {} for field in table.categorical_fields}
+        labels = table.labels
+
+        for index, row in enumerate(rows):
+            extra = {}
+            for key, value in row.items():
+                if key in skip:
+                    continue
+                elif key in values:
+                    kind = type(value)
+                    if (
+                        (kind is float and value == value)
+                        or kind is int
+                        or (kind is not float and _is_number(value))
+                    ):
+                        values[key][index] = value
+                    else:
+                        table.extra_fields.add(key)
+                        extra[key] = value
+                elif key in lookups and value is not None:
+                    lookup = lookups[key]
+                    try:
+                        code = lookup.get(value)
+                    except TypeError:
+                        # Unhashable
+                        extra[key] = value
+                        continue
+                    if code is None:
+                        code = lookup[value] = len(labels[key])
+                        labels[key].append(value)
+                    codes[key][index] = code
+                else:
+                    extra[key] = value
+            table.extra.append(extra)
+
+        for field, column in values.items():
+            table.values[field] = np.array(column, dtype=np.float64)
+            # NaN values are stored in `extra`, so NaN here means missing
+            table.mask[field] = ~np.isnan(table.values[field])
+        for field, column in codes.items():
+            table.codes[field] = np.array(column, dtype=np.int32)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.extra)
+
+    def row(self, index: int) -> dict:
+        """Return row ``index`` as a new dictionary."""
+        return next(self.rows(index, index + 1))
+
+    def rows(self, start: int = 0, end: Optional[int] = None) -> Iterator[dict]:
+        """Iterate over rows ``start`` to ``end`` as new dictionaries."""
+        end = len(self) if end is None else end
+        columns = []
+        for field in self.categorical_fields:
+            labels = self.labels[field]
+            columns.append(
+                (field, labels, self.codes[field][start:end].tolist(), None, False)
+            )
+        for field in self.numeric_fields:
+            columns.append(
+                (
+                    field,
+                    None,
+                    self.values[field][start:end].tolist(),
+                    self.mask[field][start:end].tolist(),
+                    field in self.integer_fields,
+                )
+            )
+
+        for offset in range(end - start):
+            row = {}
+            for field, labels, column, mask, integer in columns:
+                if labels is not None:
+                    code = column[offset]
+                    if code >= 0:
+                        row[field] = labels[code]
+                elif mask[offset]:
+                    row[field] = int(column[offset]) if integer else column[offset]
+            row.update(self.extra[start + offset])
+            yield row
+
+    def take(self, indices: np.ndarray) -> "Table":
+        """Return a new table with only the rows in ``indices``."""
+        table = Table.__new__(Table)
+        table.numeric_fields = self.numeric_fields
+        table.integer_fields = self.integer_fields
+        table.categorical_fields = self.categorical_fields
+        table.values = {k: v[indices] for k, v in self.values.items()}
+        table.mask = {k: v[indices] for k, v in self.mask.items()}
+        table.codes = {k: v[indices] for k, v in self.codes.items()}
+        table.labels = self.labels
+        table.extra = [self.extra[i] for i in indices]
+        table.extra_fields = self.extra_fields
+        return table
+
+    def equals(self, field: str, value) -> np.ndarray:
+        """Boolean array of rows where categorical ``field`` equals ``value``."""
+        codes = [i for i, label in enumerate(self.labels[field]) if label == value]
+        if len(codes) == 1:
+            return self.codes[field] == codes[0]
+        return np.isin(self.codes[field], codes)
+
+    def map_labels(self, field: str, func: Callable) -> None:
+        """Apply ``func`` to every value of categorical ``field``."""
+        self.labels[field] = [func(label) for label in self.labels[field]]
+        for index in np.flatnonzero(self.codes[field] == -1):
+            if field in self.extra[index]:
+                self.extra[index][field] = func(self.extra[index][field])
+
+    def set_values(self, field: str, mask: np.ndarray, values) -> None:
+        """Set numeric ``field`` to ``values`` for rows in boolean ``mask``."""
+        self.values[field][mask] = values
+        self.mask[field][mask] = True
+        if field in self.extra_fields:
+            for index in np.flatnonzero(mask):
+                # Non-numeric values stored in `extra` would take precedence
+                self.extra[index].pop(field, None)
+
+    def delete(self, field: str, mask: np.ndarray) -> None:
+        """Remove numeric ``field`` from rows in boolean ``mask``."""
+        self.mask[field][mask] = False
+        self.values[field][mask] = np.nan
+
+    def nbytes(self) -> int:
+        """Memory used by the NumPy arrays of this table."""
+        return sum(
+            arr.nbytes
+            for group in (self.values, self.mask, self.codes)
+            for arr in group.values()
+        )
+
+
+class ColumnarData:
+    """
+    Importer data as a node table and an exchange table.
+
+    Behaves like a read-only sequence of datasets: iterating or indexing returns
+    newly created dictionaries, so changing them doesn't change the stored data.
+    Use ``apply`` to run strategies.
+
+    Examples
+    --------
+    >>> columnar = ColumnarData.from_data(importer.data)
+    >>> columnar = columnar.apply(normalize_units)
+    >>> importer.data = columnar.to_data()
+
+    """
+
+    def __init__(
+        self,
+        nodes: Table,
+        exchanges: Table,
+        exchange_node: np.ndarray,
+        has_exchanges: np.ndarray,
+    ):
+        self.nodes = nodes
+        self.exchanges = exchanges
+        self.exchange_node = exchange_node
+        self.has_exchanges = has_exchanges
+
+    @classmethod
+    def from_data(cls, data: Iterable[dict]) -> "ColumnarData":
+        data = list(data)
+        nodes = Table.from_dicts(
+            data,
+            NUMERIC_FIELDS,
+            INTEGER_FIELDS,
+            NODE_CATEGORICAL_FIELDS,
+            skip=("exchanges",),
+        )
+        has_exchanges = np.array(["exchanges" in ds for ds in data], dtype=bool)
+        exchanges = [exc for ds in data for exc in ds.get("exchanges", [])]
+        exchange_node = np.repeat(
+            np.arange(len(data), dtype=np.int64),
+            [len(ds.get("exchanges", [])) for ds in data],
+        )
+        return cls(
+            nodes,
+            Table.from_dicts(
+                exchanges, NUMERIC_FIELDS, INTEGER_FIELDS, EXCHANGE_CATEGORICAL_FIELDS
+            ),
+            exchange_node,
+            has_exchanges,
+        )
+
+    def _bounds(self) -> np.ndarray:
+        return np.searchsorted(self.exchange_node, np.arange(len(self.nodes) + 1))
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __iter__(self) -> Iterator[dict]:
+        bounds = self._bounds().tolist()
+        exchanges = self.exchanges.rows()
+        for index, ds in enumerate(self.nodes.rows()):
+            if self.has_exchanges[index]:
+                ds["exchanges"] = [
+                    next(exchanges) for _ in range(bounds[index + 1] - bounds[index])
+                ]
+            yield ds
+
+    def __getitem__(self, index: int) -> dict:
+        index = range(len(self.nodes))[index]
+        bounds = self._bounds()
+        ds = self.nodes.row(index)
+        if self.has_exchanges[index]:
+            ds["exchanges"] = list(
+                self.exchanges.rows(bounds[index], bounds[index + 1])
+            )
+        return ds
+
+    def to_data(self) -> List[dict]:
+        """Return data as a list of dictionaries."""
+        return list(self)
+
+    def keep_exchanges(self, mask: np.ndarray) -> None:
+        """Delete all exchanges not in boolean ``mask``."""
+        indices = np.flatnonzero(mask)
+        self.exchanges = self.exchanges.take(indices)
+        self.exchange_node = self.exchange_node[indices]
+
+    def nbytes(self) -> int:
+        """Memory used by the NumPy arrays of both tables."""
+        return (
+            self.nodes.nbytes()
+            + self.exchanges.nbytes()
+            + self.exchange_node.nbytes
+            + self.has_exchanges.nbytes
+        )
+
+    def apply(self, strategy: Callable) -> "ColumnarData":
+        """Apply ``strategy``, using its vectorized version if available.
+
+        Other strategies get a list of dictionaries, and their result is converted
+        back to ``ColumnarData``."""
+        vectorized = get_columnar_strategy(strategy)
+        if vectorized is not None:
+            return vectorized(self)
+        return ColumnarData.from_data(strategy(self.to_data()))
+
+
+def get_columnar_strategy(strategy: Callable) -> Optional[Callable]:
+    """Return the vectorized version of ``strategy``, or ``None`` if there isn't one.
+
+    Keyword arguments of ``functools.partial`` strategies are passed on."""
+    func, kwargs = strategy, {}
+    if isinstance(strategy, functools.partial) and not strategy.args:
+        func, kwargs = strategy.func, strategy.keywords
+    try:
+        vectorized = COLUMNAR_STRATEGIES.get(func)
+    except TypeError:
+        return None
+    if vectorized is None:
+        return None
+    return functools.partial(vectorized, **kwargs) if kwargs else vectorized
+
+
+def columnar_normalize_units(data: ColumnarData) -> ColumnarData:
+    """Vectorized version of ``normalize_units``."""
+    data.nodes.map_labels("unit", normalize_units_function)
+    data.exchanges.map_labels("unit", normalize_units_function)
+    data.exchanges.map_labels("reference unit", normalize_units_function)
+    for extra in data.nodes.extra:
+        for param in extra.get("parameters", {}).values():
+            if "unit" in param:
+                param["unit"] = normalize_units_function(param["unit"])
+    return data
+
+
+def columnar_remove_zero_amount_coproducts(data: ColumnarData) -> ColumnarData:
+    """Vectorized version of ``remove_zero_amount_coproducts``."""
+    exchanges = data.exchanges
+    data.keep_exchanges(
+        ~(exchanges.equals("type", "production") & (exchanges.values["amount"] == 0))
+    )
+    return data
+
+
+def columnar_remove_zero_amount_inputs_with_no_activity(
+    data: ColumnarData,
+) -> ColumnarData:
+    """Vectorized version of ``remove_zero_amount_inputs_with_no_activity``."""
+    exchanges = data.exchanges
+    data.keep_exchanges(
+        ~(
+            (exchanges.values["uncertainty type"] == UndefinedUncertainty.id)
+            & (exchanges.values["amount"] == 0)
+            & exchanges.equals("type", "technosphere")
+        )
+    )
+    return data
+
+
+def columnar_set_lognormal_loc_value(data: ColumnarData) -> ColumnarData:
+    """Vectorized version of ``set_lognormal_loc_value``."""
+    exchanges = data.exchanges
+    mask = exchanges.values["uncertainty type"] == LognormalUncertainty.id
+    amounts = np.abs(exchanges.values["amount"][mask])
+    if (amounts == 0).any():
+        raise ValueError("math domain error")
+    exchanges.set_values("loc", mask, np.log(amounts))
+    return data
+
+
+def columnar_fix_unreasonably_high_lognormal_uncertainties(
+    data: ColumnarData, cutoff: float = 2.5, replacement: float = 0.25
+) -> ColumnarData:
+    """Vectorized version of ``fix_unreasonably_high_lognormal_uncertainties``."""
+    exchanges = data.exchanges
+    mask = (exchanges.values["uncertainty type"] == LognormalUncertainty.id) & (
+        exchanges.values["scale"] > cutoff
+    )
+    exchanges.set_values("scale", mask, replacement)
+    return data
+
+
+def columnar_remove_uncertainty_from_negative_loss_exchanges(
+    data: ColumnarData,
+) -> ColumnarData:
+    """Vectorized version of ``remove_uncertainty_from_negative_loss_exchanges``."""
+    exchanges, nodes = data.exchanges, data.exchange_node
+    names = exchanges.codes["name"]
+    # Codes aren't unique if labels were changed, so compare by label
+    lookup = {}
+    canonical = np.array(
+        [lookup.setdefault(label, len(lookup)) for label in exchanges.labels["name"]]
+        + [-1],
+        dtype=np.int64,
+    )
+    names = canonical[names]
+    width = int(names.max(initial=0)) + 2
+    keys = nodes * width + (names + 1)
+
+    production = exchanges.equals("type", "production") & (names >= 0)
+    mask = (
+        (exchanges.values["amount"] < 0)
+        & (exchanges.values["uncertainty type"] == LognormalUncertainty.id)
+        & (names >= 0)
+        & np.isin(keys, keys[production])
+    )
+    exchanges.set_values("uncertainty type", mask, UndefinedUncertainty.id)
+    exchanges.set_values("loc", mask, exchanges.values["amount"][mask])
+    exchanges.delete("scale", mask)
+    return data
+
+
+COLUMNAR_STRATEGIES = {
+    normalize_units: columnar_normalize_units,
+    remove_zero_amount_coproducts: columnar_remove_zero_amount_coproducts,
+    remove_zero_amount_inputs_with_no_activity: columnar_remove_zero_amount_inputs_with_no_activity,
+    set_lognormal_loc_value: columnar_set_lognormal_loc_value,
+    fix_unreasonably_high_lognormal_uncertainties: columnar_fix_unreasonably_high_lognormal_uncertainties,
+    remove_uncertainty_from_negative_loss_exchanges: columnar_remove_uncertainty_from_negative_loss_exchanges,
+}
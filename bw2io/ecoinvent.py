@@ -1,16 +1,20 @@
 import re
 import zipfile
-from collections import defaultdict
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterable, Optional, Sequence
 
 import bw2data as bd
 import ecoinvent_interface as ei
+import numpy as np
 from ecoinvent_interface.core import SYSTEM_MODELS
 from ecoinvent_interface.string_distance import damerau_levenshtein
 
-from .extractors import ExcelExtractor
+from .extractors import ExcelExtractor, ExtractionCache
 from .importers import Ecospold2BiosphereImporter, SingleOutputEcospold2Importer
+from .lookup import database_nodes
+
+CF_LABELS = ("method", "category", "indicator", "name", "compartment", "subcompartment")
 
 
 def get_excel_sheet_names(file_path: Path) -> list[str]:
@@ -49,6 +53,190 @@ def pick_a_unit_label_already(obj: dict) -> str:
     raise KeyError("Can't find suitable column label for LCIA units")
 
 
+def header_columns(rows: Iterable[list], labels: Sequence[str]) -> dict[str, list]:
+    """Get the columns ``labels`` of worksheet ``rows`` as lists.
+
+    Like ``header_dict``, the first row gives the (case-insensitive) column labels
+    and empty rows are skipped, but only the given columns are kept, and no
+    dictionary is created per row."""
+    rows = iter(rows)
+    header = {
+        label.lower(): index
+        for index, label in enumerate(next(rows, []))
+        if isinstance(label, str)
+    }
+    for label in labels:
+        if label not in header:
+            raise KeyError(f"Can't find column {label} in {list(header)}")
+    getter = itemgetter(*(header[label] for label in labels))
+    selected = [getter(row) for row in rows if any(row)]
+    if len(labels) == 1:
+        return {labels[0]: selected}
+    columns = zip(*selected) if selected else [()] * len(labels)
+    return {label: list(column) for label, column in zip(labels, columns)}
+
+
+def biosphere_flow_mapping(database_name: str) -> dict[tuple, int]:
+    """Map ``(name, *categories)`` to node ids for all flows in ``database_name``.
+
+    Flow names starting with ``[Deleted]`` are also added without this prefix."""
+    mapping = {}
+    for flow in database_nodes(database_name, ("id", "name", "categories")):
+        mapping[(flow["name"],) + tuple(flow["categories"])] = flow["id"]
+        if flow["name"].startswith("[Deleted]"):
+            mapping[
+                (flow["name"].replace("[Deleted]", ""),) + tuple(flow["categories"])
+            ] = flow["id"]
+    return mapping
+
+
+def _match_biosphere_flow(
+    name: str,
+    compartment: str,
+    subcompartment: str,
+    biosphere_mapping: dict,
+    contexts: dict,
+    substituted: set,
+    unmatched: set,
+) -> int:
+    """Find the id of a biosphere flow, or -1 if it can't be found.
+
+    If there is no exact match, accept a single flow with the same categories and a
+    similar name. ``contexts`` caches the flows per categories, ``substituted`` and
+    ``unmatched`` make sure each problem is only printed once."""
+    try:
+        return biosphere_mapping[drop_unspecified(name, compartment, subcompartment)]
+    except KeyError:
+        # How is this possible? We are matching ecoinvent data against
+        # ecoinvent data from the same release! And yet it moves...
+        pass
+    category = (
+        (compartment, subcompartment)
+        if subcompartment.lower() != "unspecified"
+        else (compartment,)
+    )
+    if category not in contexts:
+        contexts[category] = {
+            k[0]: v for k, v in biosphere_mapping.items() if k[1:] == category
+        }
+    same_context = contexts[category]
+    candidates = sorted(
+        [(damerau_levenshtein(other, name), other) for other in same_context]
+    )
+    if (
+        candidates[0][0] < 3
+        and candidates[0][0] != candidates[1][0]
+        and candidates[0][1][0].lower() == name[0].lower()
+    ):
+        new_name = candidates[0][1]
+        pair = (new_name, name)
+        if pair not in substituted:
+            print(f"Substituting {new_name} for {name}")
+            substituted.add(pair)
+        return same_context[new_name]
+    if name not in unmatched:
+        print(
+            "Skipping unmatched flow {}:({}, {})".format(
+                name, compartment, subcompartment
+            )
+        )
+        unmatched.add(name)
+    return -1
+
+
+def group_characterization_factors(
+    columns: dict[str, list],
+    cf_col_label: str,
+    biosphere_mapping: dict[tuple, int],
+    prefix: tuple = (),
+) -> dict[tuple, list[tuple]]:
+    """Group the characterization factors of an ecoinvent LCIA ``CFs`` worksheet by
+    impact category.
+
+    Parameters
+    ----------
+    columns : dict
+        Columns ``CF_LABELS`` and ``cf_col_label`` of the worksheet, from
+        ``header_columns``.
+    cf_col_label : str
+        The label of the characterization factor column. Rows without a value are
+        skipped.
+    biosphere_mapping : dict
+        Biosphere flow ids, from ``biosphere_flow_mapping``. Flows which can't be
+        matched are skipped.
+    prefix : tuple, optional
+        Added to the start of each impact category name.
+
+    Returns
+    -------
+    dict
+        ``(method, category, indicator)`` impact category names (with ``prefix``)
+        to lists of ``(flow id, amount)``, in order of first appearance.
+    """
+    values = columns[cf_col_label]
+    rows = [index for index, value in enumerate(values) if value is not None]
+    amounts = np.array([values[index] for index in rows], dtype=float)
+
+    # Match each flow and impact category once, and only keep integer codes per row
+    names, compartments, subcompartments = (
+        columns[label] for label in ("name", "compartment", "subcompartment")
+    )
+    flows = {}
+    flow_codes = np.array(
+        [
+            flows.setdefault(
+                (names[index], compartments[index], subcompartments[index]),
+                len(flows),
+            )
+            for index in rows
+        ],
+        dtype=np.int64,
+    )
+    contexts, substituted, unmatched = {}, set(), set()
+    flow_ids = np.array(
+        [
+            _match_biosphere_flow(
+                *flow, biosphere_mapping, contexts, substituted, unmatched
+            )
+            for flow in flows
+        ],
+        dtype=np.int64,
+    )
+    methods, categories, indicators = (
+        columns[label] for label in ("method", "category", "indicator")
+    )
+    impact_categories = {}
+    category_codes = np.array(
+        [
+            impact_categories.setdefault(
+                (methods[index], categories[index], indicators[index]),
+                len(impact_categories),
+            )
+            for index in rows
+        ],
+        dtype=np.int64,
+    )
+
+    ids = flow_ids[flow_codes]
+    matched = ids >= 0
+    ids, amounts, category_codes = (
+        ids[matched],
+        amounts[matched],
+        category_codes[matched],
+    )
+    # Stable sort keeps the worksheet order within each impact category
+    order = np.argsort(category_codes, kind="stable")
+    bounds = np.flatnonzero(np.diff(category_codes[order])) + 1
+    keys = [prefix + key for key in impact_categories]
+    return {
+        keys[category_codes[chunk[0]]]: list(
+            zip(ids[chunk].tolist(), amounts[chunk].tolist())
+        )
+        for chunk in np.split(order, bounds)
+        if len(chunk)
+    }
+
+
 def import_ecoinvent_release(
     version: str,
     system_model: str,
@@ -62,6 +250,9 @@ def import_ecoinvent_release(
     namespace_lcia_methods: bool = True,
     use_mp: bool = True,
     separate_products: bool = False,
+    cache: Optional[ExtractionCache] = None,
+    incremental: bool = False,
+    database_name: Optional[str] = None,
 ) -> None:
     """
     Import an ecoinvent LCI and/or LCIA release.
@@ -118,6 +309,21 @@ def import_ecoinvent_release(
         allows for multiple LCIA implementation versions to be installed in parallel
     use_mp
         Use a multiprocessing pool when importing ecospold2 XML files
+    separate_products
+        Import processes and products as separate nodes in the supply chain graph
+    cache
+        An `ExtractionCache` of previously parsed ecospold2 files. Repeated imports of
+        the same release will skip XML parsing for all unchanged files
+    incremental
+        If the inventory database already exists, update it instead of raising an error.
+        Extracted datasets are compared with the stored nodes and exchanges, and only
+        added, removed and changed nodes and exchanges are written. The change report is
+        printed
+    database_name
+        Name of the inventory database. Default is `ecoinvent-{version}-{system_model}`.
+        With `incremental`, give the name of the database of a previous release, e.g.
+        `ecoinvent-3.9-cutoff`, to update it to this release. Pass its `biosphere_name`
+        as well, so that biosphere exchanges keep their links
 
     Examples
     --------
@@ -155,6 +361,18 @@ def import_ecoinvent_release(
         ecoinvent-3.9.1-biosphere
         ecoinvent-3.9.1-cutoff
 
+    Update the ecoinvent 3.9 cutoff database of an existing project to 3.9.1,
+    writing only the changed datasets:
+
+    >>> bi.import_ecoinvent_release(
+    ...     version="3.9.1",
+    ...     system_model="cutoff",
+    ...     database_name="ecoinvent-3.9-cutoff",
+    ...     biosphere_name="ecoinvent-3.9-biosphere",
+    ...     incremental=True,
+    ...     lcia=False,
+    ...     )
+
     Create a new database but use `biosphere3` for the biosphere database name
     and don't add LCIA methods:
 
@@ -211,8 +429,8 @@ def import_ecoinvent_release(
             release_type=ei.ReleaseType.ecospold,
         )
 
-        db_name = f"ecoinvent-{version}-{system_model}"
-        if db_name in bd.databases:
+        db_name = database_name or f"ecoinvent-{version}-{system_model}"
+        if db_name in bd.databases and not incremental:
             raise ValueError(f"Database {db_name} already exists")
 
         eb = Ecospold2BiosphereImporter(
@@ -251,13 +469,14 @@ def import_ecoinvent_release(
             signal=importer_signal,
             use_mp=use_mp,
             separate_products=separate_products,
+            cache=cache,
         )
         soup.apply_strategies()
         if not soup.all_linked:
             raise ValueError(
                 f"Can't ingest inventory database {db_name} - unlinked flows."
             )
-        soup.write_database()
+        soup.write_database(incremental=incremental)
 
     if lcia:
         subversion = int(version.split(".")[1])
@@ -288,10 +507,9 @@ def import_ecoinvent_release(
                 f"Can't find worksheet for characterization factors; expected `CFs`, found {sheet_names}"
             )
 
-        data = dict(ExcelExtractor.extract(lcia_file))
-        units = header_dict(data[units_sheetname])
-
-        cfs = header_dict(data["CFs"])
+        units = header_dict(
+            ExcelExtractor.extract(lcia_file, sheets=[units_sheetname])[0][1]
+        )
 
         CF_COLUMN_LABELS = {
             "3.4": "cf 3.4",
@@ -299,6 +517,9 @@ def import_ecoinvent_release(
             "3.6": "cf 3.6",
         }
         cf_col_label = CF_COLUMN_LABELS.get(version, "cf")
+        cfs = header_columns(
+            ExcelExtractor.iter_rows(lcia_file, "CFs"), CF_LABELS + (cf_col_label,)
+        )
         units_col_label = pick_a_unit_label_already(units[0])
         if namespace_lcia_methods:
             units_mapping = {
@@ -316,83 +537,12 @@ def import_ecoinvent_release(
                 for row in units
             }
 
-        biosphere_mapping = {}
-        for flow in bd.Database(biosphere_name):
-            biosphere_mapping[(flow["name"],) + tuple(flow["categories"])] = flow.id
-            if flow["name"].startswith("[Deleted]"):
-                biosphere_mapping[
-                    (flow["name"].replace("[Deleted]", ""),) + tuple(flow["categories"])
-                ] = flow.id
-
-        lcia_data_as_dict = defaultdict(list)
-
-        unmatched = set()
-        substituted = set()
-
-        for row in cfs:
-            if namespace_lcia_methods:
-                impact_category = (
-                    f"ecoinvent-{version}",
-                    row["method"],
-                    row["category"],
-                    row["indicator"],
-                )
-            else:
-                impact_category = (row["method"], row["category"], row["indicator"])
-            if row[cf_col_label] is None:
-                continue
-            try:
-                lcia_data_as_dict[impact_category].append(
-                    (
-                        biosphere_mapping[
-                            drop_unspecified(
-                                row["name"], row["compartment"], row["subcompartment"]
-                            )
-                        ],
-                        float(row[cf_col_label]),
-                    )
-                )
-            except KeyError:
-                # How is this possible? We are matching ecoinvent data against
-                # ecoinvent data from the same release! And yet it moves...
-                category = (
-                    (row["compartment"], row["subcompartment"])
-                    if row["subcompartment"].lower() != "unspecified"
-                    else (row["compartment"],)
-                )
-                same_context = {
-                    k[0]: v for k, v in biosphere_mapping.items() if k[1:] == category
-                }
-                candidates = sorted(
-                    [
-                        (damerau_levenshtein(name, row["name"]), name)
-                        for name in same_context
-                    ]
-                )
-                if (
-                    candidates[0][0] < 3
-                    and candidates[0][0] != candidates[1][0]
-                    and candidates[0][1][0].lower() == row["name"][0].lower()
-                ):
-                    new_name = candidates[0][1]
-                    pair = (new_name, row["name"])
-                    if pair not in substituted:
-                        print(f"Substituting {new_name} for {row['name']}")
-                        substituted.add(pair)
-                    lcia_data_as_dict[impact_category].append(
-                        (
-                            same_context[new_name],
-                            float(row[cf_col_label]),
-                        )
-                    )
-                else:
-                    if row["name"] not in unmatched:
-                        print(
-                            "Skipping unmatched flow {}:({}, {})".format(
-                                row["name"], row["compartment"], row["subcompartment"]
-                            )
-                        )
-                        unmatched.add(row["name"])
+        lcia_data_as_dict = group_characterization_factors(
+            cfs,
+            cf_col_label,
+            biosphere_flow_mapping(biosphere_name),
+            prefix=(f"ecoinvent-{version}",) if namespace_lcia_methods else (),
+        )
 
         for key in lcia_data_as_dict:
             method = bd.Method(key)
@@ -1,10 +1,16 @@
 import csv
 import os
+from collections import defaultdict
+from itertools import islice
 
-from bw2data import Database, databases, projects
+from bw2data import Database, databases, get_node, projects
+from bw2data.backends import ExchangeDataset
+from bw2data.backends.proxies import Exchange
 from bw2data.parameters import ActivityParameter, DatabaseParameter, ProjectParameter
 from bw_processing import safe_filename
 
+from ..lookup import database_nodes
+
 
 def reformat(value):
     if isinstance(value, (list, tuple)):
@@ -44,14 +50,17 @@ MAPPING = {
     "exchange": EXCHANGE_COLUMNS,
     "parameter": PARAMETER_COLUMNS,
 }
+# Input node attributes added to exchanges
+INPUT_FIELDS = ("name", "unit", "location", "categories")
 
 
 class CSVFormatter(object):
-    def __init__(self, database_name, objs=None):
+    def __init__(self, database_name, objs=None, batch_size=500):
         assert database_name in databases, "Database {} not found".format(database_name)
         self.db = Database(database_name)
         self.db.order_by = "name"
         self.objs = objs or iter(self.db)
+        self.batch_size = batch_size
 
     def get_project_parameters(self):
         return self.order_dicts(
@@ -68,20 +77,22 @@ class CSVFormatter(object):
         return self.order_dicts(data, "parameter")
 
     def get_activity_parameters(self, act):
-        data = [
-            o.dict
-            for o in ActivityParameter.select().where(
-                ActivityParameter.database == act[0],
-                ActivityParameter.code == act[1],
+        return self.format_activity_parameters(
+            list(
+                ActivityParameter.select().where(
+                    ActivityParameter.database == act[0],
+                    ActivityParameter.code == act[1],
+                )
             )
-        ]
-        if not data:
+        )
+
+    def format_activity_parameters(self, params):
+        """Format the ``ActivityParameter`` objects of one activity; the group is
+        taken from the first parameter."""
+        if not params:
             return {}
-        dct = self.order_dicts(data, "parameter")
-        dct["group"] = ActivityParameter.get(
-            database=act[0],
-            code=act[1],
-        ).group
+        dct = self.order_dicts([o.dict for o in params], "parameter")
+        dct["group"] = params[0].group
         return dct
 
     def get_database_metadata(self):
@@ -108,7 +119,7 @@ class CSVFormatter(object):
             "project parameters": self.get_project_parameters(),
         }
 
-    def get_activity_metadata(self, act):
+    def get_activity_metadata(self, act, parameters=None):
         excluded = {"database", "name"}
         return {
             "name": act.get("name"),
@@ -121,15 +132,19 @@ class CSVFormatter(object):
                     and not isinstance(v, (dict, list))
                 ]
             ),
-            "parameters": self.get_activity_parameters(act),
+            "parameters": (
+                self.get_activity_parameters(act) if parameters is None else parameters
+            ),
         }
 
-    def exchange_as_dict(self, exc):
-        inp = exc.input
-        inp_fields = ("name", "unit", "location", "categories")
+    def exchange_as_dict(self, exc, inp=None):
+        """Exchange data with the ``INPUT_FIELDS`` of its input node. ``inp`` can be
+        any mapping of these fields, and is looked up if not given."""
+        if inp is None:
+            inp = exc.input
         skip_fields = ("input", "output")
         data = {k: v for k, v in exc._data.items() if k not in skip_fields}
-        data.update(**{k: inp[k] for k in inp_fields if inp.get(k)})
+        data.update(**{k: inp[k] for k in INPUT_FIELDS if inp.get(k)})
         return data
 
     def order_dicts(self, data, kind="exchange"):
@@ -144,16 +159,78 @@ class CSVFormatter(object):
             "data": [[reformat(dct.get(c)) for c in columns] for dct in data],
         }
 
-    def get_exchanges(self, act):
-        exchanges = [self.exchange_as_dict(exc) for exc in act.exchanges()]
+    def get_exchanges(self, act, exchanges=None):
+        if exchanges is None:
+            exchanges = [self.exchange_as_dict(exc) for exc in act.exchanges()]
         exchanges.sort(key=lambda x: (x.get("type"), x.get("name")))
         return self.order_dicts(exchanges)
 
-    def get_activity(self, act):
-        data = self.get_activity_metadata(act)
-        data["exchanges"] = self.get_exchanges(act)
+    def get_activity(self, act, exchanges=None, parameters=None):
+        data = self.get_activity_metadata(act, parameters)
+        data["exchanges"] = self.get_exchanges(act, exchanges)
         return data
 
+    def iter_activities(self):
+        """
+        Iterate over ``get_activity`` for each object in ``self.objs``.
+
+        Reads the exchanges and activity parameters of ``batch_size`` activities at
+        a time in one query each, instead of several queries per activity. Input
+        nodes are looked up with ``database_nodes``, which reads the needed
+        attributes of all nodes in a database in one query.
+        """
+        objs = iter(self.objs)
+        nodes = {}
+        while True:
+            batch = list(islice(objs, self.batch_size))
+            if not batch:
+                break
+            codes = defaultdict(list)
+            for act in batch:
+                codes[act["database"]].append(act["code"])
+
+            exchanges, parameters = defaultdict(list), defaultdict(list)
+            for database, batch_codes in codes.items():
+                for row in (
+                    ExchangeDataset.select()
+                    .where(
+                        ExchangeDataset.output_database == database,
+                        ExchangeDataset.output_code << batch_codes,
+                    )
+                    .order_by(ExchangeDataset.id)
+                ):
+                    key = (row.input_database, row.input_code)
+                    if row.input_database not in nodes:
+                        nodes[row.input_database] = {
+                            node["key"]: node
+                            for node in database_nodes(
+                                row.input_database, ("key",) + INPUT_FIELDS
+                            )
+                        }
+                    if key not in nodes[row.input_database]:
+                        # Raises ``UnknownObject`` like ``exc.input``
+                        nodes[row.input_database][key] = get_node(
+                            database=key[0], code=key[1]
+                        )
+                    exchanges[(database, row.output_code)].append(
+                        self.exchange_as_dict(
+                            Exchange(row), nodes[row.input_database][key]
+                        )
+                    )
+                for param in ActivityParameter.select().where(
+                    ActivityParameter.database == database,
+                    ActivityParameter.code << batch_codes,
+                ):
+                    parameters[(database, param.code)].append(param)
+
+            for act in batch:
+                key = (act["database"], act["code"])
+                yield self.get_activity(
+                    act,
+                    exchanges[key],
+                    self.format_activity_parameters(parameters[key]),
+                )
+
     def get_unformatted_data(self):
         """
         Return all database data as a nested dictionary:
@@ -194,10 +271,15 @@ class CSVFormatter(object):
 
         return {
             "database": self.get_database_metadata(),
-            "activities": [self.get_activity(obj) for obj in self.objs],
+            "activities": list(self.iter_activities()),
         }
 
     def get_formatted_data(self, sections=None):
+        return list(self.iter_formatted_data(sections))
+
+    def iter_formatted_data(self, sections=None):
+        """Iterate over the rows of ``get_formatted_data``, reading activities in
+        batches as they are needed."""
         if sections is None:
             sections = [
                 "project parameters",
@@ -208,48 +290,43 @@ class CSVFormatter(object):
                 "exchanges",
             ]
 
-        result = []
-        data = self.get_unformatted_data()
-        db = data["database"]
+        db = self.get_database_metadata()
         if db["project parameters"] and "project parameters" in sections:
-            result.extend([["Project parameters"], db["project parameters"]["columns"]])
-            result.extend(db["project parameters"]["data"])
-            result.append([])
+            yield ["Project parameters"]
+            yield db["project parameters"]["columns"]
+            yield from db["project parameters"]["data"]
+            yield []
 
         if "database" in sections:
-            result.append(["Database", db["name"]])
-            result.extend(db["metadata"])
-            result.append([])
+            yield ["Database", db["name"]]
+            yield from db["metadata"]
+            yield []
 
         if db["parameters"] and "database parameters" in sections:
-            result.extend([["Database parameters"], db["parameters"]["columns"]])
-            result.extend(db["parameters"]["data"])
-            result.append([])
+            yield ["Database parameters"]
+            yield db["parameters"]["columns"]
+            yield from db["parameters"]["data"]
+            yield []
 
         if "activities" not in sections:
-            return result
-        for act in data["activities"]:
-            result.append(["Activity", act["name"]])
-            result.extend(act["metadata"])
+            return
+        for act in self.iter_activities():
+            yield ["Activity", act["name"]]
+            yield from act["metadata"]
 
             if act["parameters"] and "activity parameters" in sections:
-                result.extend(
-                    [
-                        ["Parameters", act["parameters"]["group"]],
-                        act["parameters"]["columns"],
-                    ]
-                )
-                result.extend(act["parameters"]["data"])
-                result.append([])
+                yield ["Parameters", act["parameters"]["group"]]
+                yield act["parameters"]["columns"]
+                yield from act["parameters"]["data"]
+                yield []
 
             if "exchanges" in sections:
-                result.append(["Exchanges"])
+                yield ["Exchanges"]
                 if act["exchanges"]:
-                    result.append(act["exchanges"]["columns"])
-                    result.extend(act["exchanges"]["data"])
+                    yield act["exchanges"]["columns"]
+                    yield from act["exchanges"]["data"]
 
-            result.append([])
-        return result
+            yield []
 
 
 def write_lci_csv(database_name, objs=None, sections=None, dirpath=None):
@@ -284,8 +361,6 @@ def write_lci_csv(database_name, objs=None, sections=None, dirpath=None):
 
     """
 
-    data = CSVFormatter(database_name, objs).get_formatted_data(sections)
-
     if dirpath is None:
         dirpath = projects.output_dir
     if not os.path.isdir(dirpath) or not os.access(dirpath, os.W_OK):
@@ -294,9 +369,8 @@ def write_lci_csv(database_name, objs=None, sections=None, dirpath=None):
     safe_name = safe_filename(database_name, False)
     filepath = os.path.join(dirpath, "lci-" + safe_name + ".csv")
 
+    data = CSVFormatter(database_name, objs).iter_formatted_data(sections)
     with open(filepath, "w", newline="") as f:
-        writer = csv.writer(f)
-        for line in data:
-            writer.writerow(line)
+        csv.writer(f).writerows(data)
 
     return filepath
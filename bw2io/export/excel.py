@@ -4,12 +4,15 @@ import os
 from pathlib import Path
 from typing import List, Optional
 
+import numpy as np
 import xlsxwriter
-from bw2data import Database, projects
+from bw2data import projects
 from bw_processing import safe_filename
+from scipy import sparse
 
 from ..utils import activity_hash
 from .csv import CSVFormatter
+from .matrices import lci_matrices, write_label_sheets
 
 
 def create_valid_worksheet_name(string):
@@ -40,16 +43,55 @@ def create_valid_worksheet_name(string):
     return string[:30]
 
 
-def lci_matrices_to_excel(database_name, include_descendants=True):
+def _sorted_positions(nodes):
+    """Position of each node when sorted by name, as in the Excel worksheets"""
+    order = sorted(
+        range(len(nodes)),
+        key=lambda i: (
+            nodes[i].get("name") or "Unknown",
+            (nodes[i].get("database") or "", nodes[i].get("code") or ""),
+        ),
+    )
+    positions = np.empty(len(nodes), dtype=np.int64)
+    positions[order] = np.arange(len(nodes))
+    return order, positions
+
+
+def _write_matrix_sheet(sheet, matrix, row_labels, col_labels):
+    """Write row and column labels and the nonzero values of a COO matrix, row by
+    row, as needed by ``constant_memory`` mode"""
+    sheet.set_column("A:A", 50)
+    for index, label in enumerate(col_labels):
+        sheet.write_string(0, index + 1, label)
+    order = np.lexsort((matrix.col, matrix.row))
+    rows, cols, values = matrix.row[order], matrix.col[order], matrix.data[order]
+    bounds = np.searchsorted(rows, np.arange(len(row_labels) + 1)).tolist()
+    cols, values = cols.tolist(), values.tolist()
+    for index, label in enumerate(row_labels):
+        sheet.write_string(index + 1, 0, label)
+        for col, value in zip(
+            cols[bounds[index] : bounds[index + 1]],
+            values[bounds[index] : bounds[index + 1]],
+        ):
+            sheet.write_number(index + 1, col + 1, value)
+
+
+def lci_matrices_to_excel(database_name, include_descendants=True, dirpath=None):
     """
     Export LCI matrices to Excel.
 
+    Rows and columns are sorted by name. Biosphere flows which aren't used by any
+    activity are left out. For matrices too large for Excel, use
+    ``lci_matrices_to_npz``.
+
     Parameters
     ----------
     database_name : str
         Name of database to export.
     include_descendants : bool
         Include databases which are linked from ``database_name``. (default True)
+    dirpath : str, optional
+        Directory to save the file to. Default is ``projects.output_dir``.
 
     Returns
     -------
@@ -61,156 +103,64 @@ def lci_matrices_to_excel(database_name, include_descendants=True):
     >>> lci_matrices_to_excel(database_name='example_db', include_descendants=True)
     '/path/to/example_db.xlsx'
     """
-
-    from bw2calc import LCA
-
     print("Starting Excel export. This can be slow for large matrices!")
     safe_name = safe_filename(database_name, False)
-    filepath = os.path.join(projects.output_dir, safe_name + ".xlsx")
-
-    lca = LCA({Database(database_name).random(): 1})
-    lca.load_lci_data()
-    lca.fix_dictionaries()
-
-    if not include_descendants:
-        lca.activity_dict = {
-            key: value
-            for key, value in lca.activity_dict.items()
-            if key[0] == database_name
-        }
-
-    # Drop biosphere flows with zero references
-    # TODO: This will ignore (-1 + 1 = 0) references
-    lca.biosphere_dict = {
-        key: value
-        for key, value in lca.biosphere_dict.items()
-        if lca.biosphere_matrix[lca.biosphere_dict[key], :].sum() != 0
-    }
+    filepath = os.path.join(dirpath or projects.output_dir, safe_name + ".xlsx")
 
-    workbook = xlsxwriter.Workbook(filepath)
-    bold = workbook.add_format({"bold": True})
+    data = lci_matrices(database_name, include_descendants, drop_unused_flows=True)
 
     print("Sorting objects")
 
-    sorted_activity_keys = sorted(
-        [(Database.get(key).get("name") or "Unknown", key) for key in lca.activity_dict]
-    )
-    sorted_product_keys = sorted(
-        [(Database.get(key).get("name") or "Unknown", key) for key in lca.product_dict]
-    )
-    sorted_bio_keys = sorted(
-        [
-            (Database.get(key).get("name") or "Unknown", key)
-            for key in lca.biosphere_dict
-        ]
-    )
-
-    tm_sheet = workbook.add_worksheet("technosphere")
-    tm_sheet.set_column("A:A", 50)
-
-    data = Database(database_name).load()
+    labels, positions = {}, {}
+    for dimension in ("activities", "products", "flows"):
+        order, positions[dimension] = _sorted_positions(data[dimension])
+        labels[dimension] = [data[dimension][i] for i in order]
+    names = {
+        dimension: [node.get("name") or "Unknown" for node in nodes]
+        for dimension, nodes in labels.items()
+    }
 
-    # Labels
-    for index, data in enumerate(sorted_activity_keys):
-        tm_sheet.write_string(0, index + 1, data[0])
-    for index, data in enumerate(sorted_product_keys):
-        tm_sheet.write_string(index + 1, 0, data[0])
+    # Rows and columns are written in order, so only the current row is kept in memory
+    workbook = xlsxwriter.Workbook(filepath, {"constant_memory": True})
 
     print("Entering technosphere matrix data")
 
-    coo = lca.technosphere_matrix.tocoo()
-
-    # Translate row index to sorted product index
-    act_dict = {obj[1]: idx for idx, obj in enumerate(sorted_activity_keys)}
-    pro_dict = {obj[1]: idx for idx, obj in enumerate(sorted_product_keys)}
-    bio_dict = {obj[1]: idx for idx, obj in enumerate(sorted_bio_keys)}
-
-    pro_lookup = {v: pro_dict[k] for k, v in lca.product_dict.items()}
-    bio_lookup = {v: bio_dict[k] for k, v in lca.biosphere_dict.items()}
-    act_lookup = {v: act_dict[k] for k, v in lca.activity_dict.items()}
-
-    # Matrix values
-    for row, col, value in zip(coo.row, coo.col, coo.data):
-        tm_sheet.write_number(pro_lookup[row] + 1, act_lookup[col] + 1, value)
-
-    bm_sheet = workbook.add_worksheet("biosphere")
-    bm_sheet.set_column("A:A", 50)
-
-    data = Database(database_name).load()
-
-    # Labels
-    for index, data in enumerate(sorted_activity_keys):
-        bm_sheet.write_string(0, index + 1, data[0])
-    for index, data in enumerate(sorted_bio_keys):
-        bm_sheet.write_string(index + 1, 0, data[0])
+    matrix = data["technosphere_matrix"]
+    _write_matrix_sheet(
+        workbook.add_worksheet("technosphere"),
+        sparse.coo_matrix(
+            (
+                matrix.data,
+                (
+                    positions["products"][matrix.row],
+                    positions["activities"][matrix.col],
+                ),
+            ),
+            shape=matrix.shape,
+        ),
+        names["products"],
+        names["activities"],
+    )
 
     print("Entering biosphere matrix data")
 
-    coo = lca.biosphere_matrix.tocoo()
-
-    # Matrix values
-    for row, col, value in zip(coo.row, coo.col, coo.data):
-        bm_sheet.write_number(bio_lookup[row] + 1, act_lookup[col] + 1, value)
-
-    COLUMNS = (
-        "Index",
-        "Name",
-        "Reference product",
-        "Unit",
-        "Categories",
-        "Location",
+    matrix = data["biosphere_matrix"]
+    _write_matrix_sheet(
+        workbook.add_worksheet("biosphere"),
+        sparse.coo_matrix(
+            (
+                matrix.data,
+                (positions["flows"][matrix.row], positions["activities"][matrix.col]),
+            ),
+            shape=matrix.shape,
+        ),
+        names["flows"],
+        names["activities"],
     )
 
-    tech_sheet = workbook.add_worksheet("technosphere-labels")
-    tech_sheet.set_column("B:B", 60)
-    tech_sheet.set_column("C:C", 30)
-    tech_sheet.set_column("D:D", 15)
-    tech_sheet.set_column("E:E", 30)
-
     print("Writing metadata")
 
-    # Header
-    for index, col in enumerate(COLUMNS):
-        tech_sheet.write_string(0, index, col, bold)
-
-    tech_sheet.write_comment(
-        "C1",
-        "Only for ecoinvent 3, where names =/= products.",
-    )
-
-    for index, data in enumerate(sorted_activity_keys):
-        obj = Database.get(data[1])
-
-        tech_sheet.write_number(index + 1, 0, index + 1)
-        tech_sheet.write_string(index + 1, 1, obj.get("name") or "Unknown")
-        tech_sheet.write_string(index + 1, 2, obj.get("reference product") or "")
-        tech_sheet.write_string(index + 1, 3, obj.get("unit") or "Unknown")
-        tech_sheet.write_string(index + 1, 4, " - ".join(obj.get("categories") or []))
-        tech_sheet.write_string(index + 1, 5, obj.get("location") or "Unknown")
-
-    COLUMNS = (
-        "Index",
-        "Name",
-        "Unit",
-        "Categories",
-    )
-
-    bio_sheet = workbook.add_worksheet("biosphere-labels")
-    bio_sheet.set_column("B:B", 60)
-    bio_sheet.set_column("C:C", 15)
-    bio_sheet.set_column("D:D", 30)
-
-    # Header
-    for index, col in enumerate(COLUMNS):
-        bio_sheet.write_string(0, index, col, bold)
-
-    for index, data in enumerate(sorted_bio_keys):
-        obj = Database.get(data[1])
-
-        bio_sheet.write_number(index + 1, 0, index + 1)
-        bio_sheet.write_string(index + 1, 1, obj.get("name") or "Unknown")
-        bio_sheet.write_string(index + 1, 2, obj.get("unit") or "Unknown")
-        bio_sheet.write_string(index + 1, 3, " - ".join(obj.get("categories") or []))
+    write_label_sheets(workbook, labels["activities"], labels["flows"])
 
     workbook.close()
     return filepath
@@ -254,7 +204,8 @@ def write_lci_excel(database_name, objs=None, sections=None, dirpath=None):
         raise ValueError(f"Directory path {dirpath} is not a writable directory")
     filepath = os.path.join(dirpath, "lci-" + safe_name + ".xlsx")
 
-    workbook = xlsxwriter.Workbook(filepath)
+    # Rows are written in order, so only the current row needs to be kept in memory
+    workbook = xlsxwriter.Workbook(filepath, {"constant_memory": True})
     bold = workbook.add_format({"bold": True})
     bold.set_font_size(12)
     highlighted = {
@@ -269,7 +220,7 @@ def write_lci_excel(database_name, objs=None, sections=None, dirpath=None):
 
     sheet = workbook.add_worksheet(create_valid_worksheet_name(database_name))
 
-    data = CSVFormatter(database_name, objs).get_formatted_data(sections)
+    data = CSVFormatter(database_name, objs).iter_formatted_data(sections)
 
     for row_index, row in enumerate(data):
         for col_index, value in enumerate(row):
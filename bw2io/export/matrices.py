@@ -0,0 +1,257 @@
+from pathlib import Path
+
+import numpy as np
+from bw2data import Database, projects
+from bw_processing import safe_filename
+from scipy import sparse
+
+from ..lookup import database_nodes
+
+# Node attributes in label tables
+LABEL_FIELDS = (
+    "id",
+    "database",
+    "code",
+    "name",
+    "reference product",
+    "unit",
+    "categories",
+    "location",
+)
+
+
+def _remap(indices, keep):
+    """New indices of ``indices`` after dropping the indices not in mask ``keep``;
+    dropped indices map to -1."""
+    new = np.cumsum(keep) - 1
+    new[~keep] = -1
+    return new[indices]
+
+
+def _filter_matrix(matrix, keep_rows=None, keep_cols=None):
+    """Drop rows and/or columns of a COO matrix, given boolean masks"""
+    row, col, data = matrix.row, matrix.col, matrix.data
+    shape = list(matrix.shape)
+    mask = np.ones(len(data), dtype=bool)
+    if keep_rows is not None:
+        row = _remap(row, keep_rows)
+        mask &= row >= 0
+        shape[0] = int(keep_rows.sum())
+    if keep_cols is not None:
+        col = _remap(col, keep_cols)
+        mask &= col >= 0
+        shape[1] = int(keep_cols.sum())
+    return sparse.coo_matrix((data[mask], (row[mask], col[mask])), shape=tuple(shape))
+
+
+def lci_matrices(
+    database_name: str,
+    include_descendants: bool = True,
+    drop_unused_flows: bool = False,
+) -> dict:
+    """
+    Build the LCI matrices of a database and the labels of their rows and columns.
+
+    Node attributes are read with one ``database_nodes`` query per database in the
+    supply chain, instead of one lookup per node.
+
+    Parameters
+    ----------
+    database_name : str
+        Name of database to export.
+    include_descendants : bool
+        Include the activities of databases which are linked from
+        ``database_name``. Their products are always included. (default True)
+    drop_unused_flows : bool
+        Drop biosphere flows whose row in the biosphere matrix sums to zero.
+        (default False)
+
+    Returns
+    -------
+    dict
+        ``technosphere_matrix`` (products by activities) and ``biosphere_matrix``
+        (flows by activities) as ``scipy.sparse.coo_matrix``, and ``activities``,
+        ``products`` and ``flows`` lists of node dictionaries (with
+        ``LABEL_FIELDS``) in matrix order.
+    """
+    from bw2calc import LCA
+
+    lca = LCA({Database(database_name).random(): 1})
+    lca.load_lci_data()
+
+    nodes = {
+        node["id"]: node
+        for name in Database(database_name).find_graph_dependents()
+        for node in database_nodes(name, LABEL_FIELDS)
+    }
+
+    def labels(dct):
+        reversed_dct = dct.reversed
+        return [
+            nodes.get(reversed_dct[index], {"id": reversed_dct[index]})
+            for index in range(len(dct))
+        ]
+
+    activities = labels(lca.dicts.activity)
+    products = labels(lca.dicts.product)
+    flows = labels(lca.dicts.biosphere)
+    technosphere = lca.technosphere_matrix.tocoo()
+    biosphere = lca.biosphere_matrix.tocoo()
+
+    keep_cols = None
+    if not include_descendants:
+        keep_cols = np.array(
+            [node.get("database") == database_name for node in activities], dtype=bool
+        )
+        activities = [node for node, keep in zip(activities, keep_cols) if keep]
+    keep_rows = None
+    if drop_unused_flows:
+        # TODO: This will ignore (-1 + 1 = 0) references
+        keep_rows = np.asarray(lca.biosphere_matrix.sum(axis=1)).ravel() != 0
+        flows = [node for node, keep in zip(flows, keep_rows) if keep]
+
+    return {
+        "technosphere_matrix": _filter_matrix(technosphere, keep_cols=keep_cols),
+        "biosphere_matrix": _filter_matrix(biosphere, keep_rows, keep_cols),
+        "activities": activities,
+        "products": products,
+        "flows": flows,
+    }
+
+
+def write_label_sheets(
+    workbook,
+    activities,
+    flows,
+    sheet_names=("technosphere-labels", "biosphere-labels"),
+):
+    """Write worksheets with the attributes of ``activities`` and biosphere
+    ``flows``, in the given order, to an ``xlsxwriter`` workbook"""
+    bold = workbook.add_format({"bold": True})
+    COLUMNS = (
+        "Index",
+        "Name",
+        "Reference product",
+        "Unit",
+        "Categories",
+        "Location",
+    )
+
+    tech_sheet = workbook.add_worksheet(sheet_names[0])
+    tech_sheet.set_column("B:B", 60)
+    tech_sheet.set_column("C:C", 30)
+    tech_sheet.set_column("D:D", 15)
+    tech_sheet.set_column("E:E", 30)
+
+    # Header
+    for index, col in enumerate(COLUMNS):
+        tech_sheet.write_string(0, index, col, bold)
+
+    tech_sheet.write_comment(
+        "C1",
+        "Only for ecoinvent 3, where names =/= products.",
+    )
+
+    for index, obj in enumerate(activities):
+        tech_sheet.write_number(index + 1, 0, index + 1)
+        tech_sheet.write_string(index + 1, 1, obj.get("name") or "Unknown")
+        tech_sheet.write_string(index + 1, 2, obj.get("reference product") or "")
+        tech_sheet.write_string(index + 1, 3, obj.get("unit") or "Unknown")
+        tech_sheet.write_string(index + 1, 4, " - ".join(obj.get("categories") or []))
+        tech_sheet.write_string(index + 1, 5, obj.get("location") or "Unknown")
+
+    COLUMNS = (
+        "Index",
+        "Name",
+        "Unit",
+        "Categories",
+    )
+
+    bio_sheet = workbook.add_worksheet(sheet_names[1])
+    bio_sheet.set_column("B:B", 60)
+    bio_sheet.set_column("C:C", 15)
+    bio_sheet.set_column("D:D", 30)
+
+    # Header
+    for index, col in enumerate(COLUMNS):
+        bio_sheet.write_string(0, index, col, bold)
+
+    for index, obj in enumerate(flows):
+        bio_sheet.write_number(index + 1, 0, index + 1)
+        bio_sheet.write_string(index + 1, 1, obj.get("name") or "Unknown")
+        bio_sheet.write_string(index + 1, 2, obj.get("unit") or "Unknown")
+        bio_sheet.write_string(index + 1, 3, " - ".join(obj.get("categories") or []))
+
+
+def _label_column(nodes, field):
+    if field == "id":
+        return np.array([node["id"] for node in nodes], dtype=np.int64)
+    values = [node.get(field) for node in nodes]
+    if field == "categories":
+        values = ["::".join(value) if value else "" for value in values]
+    return np.array([value or "" for value in values], dtype=str)
+
+
+def lci_matrices_to_npz(database_name, include_descendants=True, dirpath=None):
+    """
+    Export LCI matrices and their labels to a NumPy ``.npz`` file, for matrices
+    too large for Excel.
+
+    The file has the arrays ``{matrix}_row``, ``{matrix}_col``, ``{matrix}_data``
+    and ``{matrix}_shape`` for ``technosphere`` (products by activities) and
+    ``biosphere`` (flows by activities), and label columns
+    ``{dimension}_{field}`` for ``activities``, ``products`` and ``flows``, where
+    ``field`` is one of ``LABEL_FIELDS`` with spaces replaced by underscores.
+    Categories are joined with ``::``; missing values are empty strings. No
+    arrays need ``allow_pickle``.
+
+    Parameters
+    ----------
+    database_name : str
+        Name of database to export.
+    include_descendants : bool
+        Include the activities of databases which are linked from
+        ``database_name``. (default True)
+    dirpath : str, optional
+        Directory to save the file to. Default is ``projects.output_dir``.
+
+    Returns
+    -------
+    filepath : pathlib.Path
+        Path to created ``.npz`` file.
+
+    Examples
+    --------
+    >>> fp = lci_matrices_to_npz("example_db")
+    >>> arrays = np.load(fp)
+    >>> technosphere = scipy.sparse.coo_matrix(
+    ...     (arrays["technosphere_data"],
+    ...      (arrays["technosphere_row"], arrays["technosphere_col"])),
+    ...     shape=arrays["technosphere_shape"],
+    ... )
+    >>> arrays["activities_name"][:2]
+    array(['an activity', 'another activity'], dtype='<U16')
+    """
+    data = lci_matrices(database_name, include_descendants)
+    arrays = {}
+    for label in ("technosphere", "biosphere"):
+        matrix = data[label + "_matrix"]
+        arrays.update(
+            {
+                f"{label}_row": matrix.row.astype(np.int64),
+                f"{label}_col": matrix.col.astype(np.int64),
+                f"{label}_data": matrix.data,
+                f"{label}_shape": np.array(matrix.shape, dtype=np.int64),
+            }
+        )
+    for dimension in ("activities", "products", "flows"):
+        for field in LABEL_FIELDS:
+            arrays[f"{dimension}_{field.replace(' ', '_')}"] = _label_column(
+                data[dimension], field
+            )
+
+    filepath = Path(dirpath or projects.output_dir) / (
+        safe_filename(database_name, False) + ".npz"
+    )
+    np.savez_compressed(filepath, **arrays)
+    return filepath
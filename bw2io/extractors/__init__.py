@@ -1,7 +1,8 @@
+from .cache import ExtractionCache, MatrixCache
 from .csv import CSVExtractor
 from .ecospold1 import Ecospold1DataExtractor
 from .ecospold1_lcia import Ecospold1LCIAExtractor
-from .ecospold2 import Ecospold2DataExtractor
+from .ecospold2 import Ecospold2DataExtractor, Ecospold2IterparseDataExtractor
 from .excel import ExcelExtractor
 from .exiobase import Exiobase3MonetaryDataExtractor
 from .simapro_csv import SimaProCSVExtractor
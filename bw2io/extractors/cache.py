@@ -0,0 +1,250 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import zlib
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+from platformdirs import user_cache_dir
+from scipy.sparse import coo_matrix
+
+
+class ExtractionCache:
+    """
+    On-disk cache of extracted datasets, keyed by the content hash of the source file.
+
+    Each entry is stored as a zlib-compressed pickle in a subdirectory named after the
+    extractor class and its ``version`` attribute, so changing the extractor
+    (and bumping its ``version``) automatically stops old entries from being used.
+
+    Entries are evicted in least-recently-used order once the total cache size
+    exceeds ``max_size``; using an entry updates its modification time.
+
+    Parameters
+    ----------
+    dirpath : str or Path, optional
+        Directory to store cache entries in. Defaults to the user cache directory.
+    max_size : int, optional
+        Maximum total size of the cache in bytes. Default is 2 GB.
+
+    Examples
+    --------
+    >>> cache = ExtractionCache()
+    >>> data = Ecospold2DataExtractor.extract(dirpath, "ecoinvent", cache=cache)
+    >>> cache.invalidate(Ecospold2DataExtractor, dirpath / "some_file.spold")
+    1
+
+    """
+
+    def __init__(
+        self,
+        dirpath: Optional[Union[str, Path]] = None,
+        max_size: int = 2 * 1024**3,
+    ):
+        self.dirpath = Path(dirpath or Path(user_cache_dir("bw2io")) / "extraction")
+        self.dirpath.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+
+    @staticmethod
+    def namespace(extractor) -> str:
+        """Subdirectory name for entries created by ``extractor``."""
+        return "{}-{}".format(extractor.__name__, getattr(extractor, "version", 0))
+
+    @staticmethod
+    def file_hash(filepath: Union[str, Path]) -> str:
+        """SHA-256 hex digest of the contents of ``filepath``."""
+        with open(filepath, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    def entry_path(self, extractor, file_hash: str) -> Path:
+        return self.dirpath / self.namespace(extractor) / f"{file_hash}.pickle.z"
+
+    def get(self, extractor, file_hash: str) -> Optional[dict]:
+        """Return cached data for a file with hash ``file_hash``, or ``None`` if
+        not cached."""
+        entry = self.entry_path(extractor, file_hash)
+        try:
+            with open(entry, "rb") as f:
+                data = pickle.loads(zlib.decompress(f.read()))
+        except (OSError, EOFError, zlib.error, pickle.UnpicklingError):
+            return None
+        try:
+            # Mark as recently used for LRU eviction
+            os.utime(entry)
+        except OSError:
+            pass
+        return data
+
+    def set(self, extractor, file_hash: str, data: dict) -> None:
+        """Store ``data`` as the extracted contents of a file with hash
+        ``file_hash``."""
+        entry = self.entry_path(extractor, file_hash)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first, as other processes could read this entry
+        tmp = entry.with_name("{}.{}.tmp".format(entry.name, os.getpid()))
+        with open(tmp, "wb") as f:
+            f.write(
+                zlib.compress(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL), 1)
+            )
+        os.replace(tmp, entry)
+
+    def _entries(self) -> list:
+        return [fp for fp in self.dirpath.glob("*/*.pickle.z") if fp.is_file()]
+
+    @property
+    def size(self) -> int:
+        """Total size of all cache entries in bytes."""
+        return sum(fp.stat().st_size for fp in self._entries())
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the cache fits in ``max_size``.
+
+        Returns the number of deleted entries."""
+        entries = sorted(
+            ((fp.stat(), fp) for fp in self._entries()),
+            key=lambda x: x[0].st_mtime,
+        )
+        total = sum(stat.st_size for stat, _ in entries)
+        deleted = 0
+        for stat, fp in entries:
+            if total <= self.max_size:
+                break
+            fp.unlink(missing_ok=True)
+            total -= stat.st_size
+            deleted += 1
+        return deleted
+
+    def invalidate(self, extractor=None, filepath: Optional[Union[str, Path]] = None):
+        """Delete cache entries.
+
+        * With ``extractor`` and ``filepath``, delete the entry for that file.
+        * With only ``extractor``, delete all entries for that extractor version.
+        * With no arguments, delete the whole cache.
+
+        Returns the number of deleted entries."""
+        if filepath is not None:
+            if extractor is None:
+                raise ValueError("Need `extractor` to invalidate a single file")
+            entries = [self.entry_path(extractor, self.file_hash(filepath))]
+        elif extractor is not None:
+            entries = list(
+                (self.dirpath / self.namespace(extractor)).glob("*.pickle.z")
+            )
+        else:
+            entries = self._entries()
+
+        deleted = 0
+        for fp in entries:
+            if fp.is_file():
+                fp.unlink()
+                deleted += 1
+        return deleted
+
+    def clear(self) -> int:
+        """Delete all cache entries."""
+        return self.invalidate()
+
+
+class MatrixCache:
+    """
+    On-disk cache of sparse matrices read from large text tables, like the EXIOBASE
+    ``A.txt`` and ``S.txt``.
+
+    Each entry is a directory with the row indices, column indices and values of the
+    matrix as ``.npy`` files, which are memory-mapped when read, and its row and
+    column labels as JSON. Entries are keyed by the content hash of the table and the
+    options it was read with, so that importing e.g. several years or both the ixi
+    and pxp variants of EXIOBASE doesn't parse the same table again. Like for
+    ``ExtractionCache``, entries are stored per extractor class and ``version``.
+
+    Entries are large and not evicted automatically; use ``clear`` to delete them.
+
+    Parameters
+    ----------
+    dirpath : str or Path, optional
+        Directory to store cache entries in. Defaults to the user cache directory.
+
+    Examples
+    --------
+    >>> cache = MatrixCache()
+    >>> Exiobase3MonetaryImporter(filepath, "EXIOBASE 3.8.1 2017", cache=cache)
+
+    """
+
+    def __init__(self, dirpath: Optional[Union[str, Path]] = None):
+        self.dirpath = Path(dirpath or Path(user_cache_dir("bw2io")) / "matrices")
+        self.dirpath.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(filepath, *options) -> str:
+        """SHA-256 hex digest of the contents of ``filepath`` and of ``options``.
+
+        ``filepath`` can also be a ``zipfile.Path``, which is read from the archive."""
+        if isinstance(filepath, (str, os.PathLike)):
+            filepath = Path(filepath)
+        digest = hashlib.sha256()
+        with filepath.open("rb") as f:
+            for block in iter(lambda: f.read(2**20), b""):
+                digest.update(block)
+        digest.update(repr(options).encode())
+        return digest.hexdigest()
+
+    def entry_path(self, extractor, key: str) -> Path:
+        return self.dirpath / ExtractionCache.namespace(extractor) / key
+
+    def get(self, extractor, key: str) -> Optional[tuple]:
+        """Return ``(row labels, column labels, matrix)`` for ``key``, or ``None`` if
+        not cached. ``matrix`` is a ``scipy.sparse.coo_matrix`` over memory-mapped
+        arrays; column labels are tuples."""
+        entry = self.entry_path(extractor, key)
+        try:
+            with open(entry / "labels.json", encoding="utf-8") as f:
+                labels = json.load(f)
+            row, col, data = (
+                np.load(entry / f"{name}.npy", mmap_mode="r")
+                for name in ("row", "col", "data")
+            )
+        except (OSError, ValueError):
+            return None
+        matrix = coo_matrix((data, (row, col)), shape=labels["shape"], copy=False)
+        return labels["rows"], [tuple(o) for o in labels["columns"]], matrix
+
+    def set(self, extractor, key: str, row_labels, col_labels, matrix) -> None:
+        """Store a sparse ``matrix`` with its row and column labels for ``key``."""
+        entry = self.entry_path(extractor, key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary directory first, as other processes could read this entry
+        tmp = entry.with_name("{}.{}.tmp".format(entry.name, os.getpid()))
+        tmp.mkdir(exist_ok=True)
+        for name in ("row", "col", "data"):
+            np.save(tmp / f"{name}.npy", getattr(matrix, name))
+        with open(tmp / "labels.json", "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "rows": list(row_labels),
+                    "columns": list(col_labels),
+                    "shape": list(matrix.shape),
+                },
+                f,
+                ensure_ascii=False,
+            )
+        try:
+            os.replace(tmp, entry)
+        except OSError:
+            # Written by another process in the meantime
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def clear(self) -> int:
+        """Delete all cache entries.
+
+        Returns the number of deleted entries."""
+        entries = [fp for fp in self.dirpath.glob("*/*") if fp.is_dir()]
+        for fp in entries:
+            shutil.rmtree(fp)
+        return len(entries)
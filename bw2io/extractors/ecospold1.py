@@ -1,13 +1,17 @@
+import functools
 import math
 import multiprocessing
 import os
-from io import StringIO
+from collections import deque
+from io import BytesIO, StringIO
 from pathlib import Path
-from typing import Any, Optional, Union
+from typing import Any, Iterator, List, Optional, Union
 
 import numpy as np
 import pyecospold
-from lxml import etree
+from lxml import etree, objectify
+from pyecospold.config import Defaults
+from pyecospold.core import EcospoldLookupV1
 from stats_arrays.distributions import (
     LognormalUncertainty,
     NormalUncertainty,
@@ -37,10 +41,54 @@ def robust_nested_attribute(root: etree.ElementBase, attr1: str, attr2: str) ->
         return None
 
 
+@functools.lru_cache(maxsize=None)
+def _schema_parser() -> etree.XMLParser:
+    # Same parser as ``pyecospold.parse_file_v1``, built once per process instead of
+    # once per parsed document
+    parser = objectify.makeparser(schema=etree.XMLSchema(file=Defaults.SCHEMA_V1_FILE))
+    parser.set_element_class_lookup(EcospoldLookupV1())
+    return parser
+
+
 class Ecospold1DataExtractor:
+    NAMESPACE = "http://www.EcoInvent.org/EcoSpold01"
+
+    @classmethod
+    def get_filelist(cls, path: Union[str, Path, StringIO]) -> list:
+        """
+        List the ecospold1 XML files in directory ``path``, or return ``[path]`` if
+        ``path`` is a file.
+
+        Raises
+        ------
+        OSError
+            If the directory doesn't contain any XML files.
+
+        """
+        if not isinstance(path, StringIO) and os.path.isdir(path):
+            filelist = [
+                os.path.join(path, filename)
+                for filename in os.listdir(path)
+                if filename[-4:].lower() == ".xml"
+                # Skip SimaPro-specific flow list
+                and filename != "ElementaryFlows.xml"
+            ]
+        else:
+            filelist = [path]
+
+        if not filelist:
+            raise OSError("Provided path doesn't appear to have any XML files")
+        return filelist
+
     @classmethod
     def extract(
-        cls, path: Union[str, Path, StringIO], db_name: str, use_mp: bool = True
+        cls,
+        path: Union[str, Path, StringIO],
+        db_name: str,
+        use_mp: bool = True,
+        processes: Optional[int] = None,
+        split_datasets: bool = False,
+        batch_size: int = 10,
     ):
         """
         Extract data from ecospold1 files.
@@ -53,6 +101,14 @@ class Ecospold1DataExtractor:
             Name of the database.
         use_mp : bool, optional
             If True, uses multiprocessing to parallelize extraction of data from multiple files, by default True.
+        processes : int, optional
+            Number of worker processes. Defaults to ``multiprocessing.cpu_count()``.
+        split_datasets : bool, optional
+            Split files into batches of datasets which are processed independently,
+            see ``iter_extract``. Useful for large files with many datasets, like
+            SimaPro exports. Default is False, which processes each file as a whole.
+        batch_size : int, optional
+            Number of datasets per batch when ``split_datasets`` is True. Default is 10.
 
         Returns
         -------
@@ -60,23 +116,24 @@ class Ecospold1DataExtractor:
             List of dictionaries containing data from the ecospold1 files.
 
         """
-        data = []
-        if os.path.isdir(path):
-            filelist = [
-                os.path.join(path, filename)
-                for filename in os.listdir(path)
-                if filename[-4:].lower() == ".xml"
-                # Skip SimaPro-specific flow list
-                and filename != "ElementaryFlows.xml"
-            ]
-        else:
-            filelist = [path]
-
-        if not filelist:
-            raise OSError("Provided path doesn't appear to have any XML files")
+        if split_datasets:
+            return list(
+                tqdm(
+                    cls.iter_extract(
+                        path,
+                        db_name,
+                        use_mp=use_mp,
+                        processes=processes,
+                        batch_size=batch_size,
+                    )
+                )
+            )
 
+        filelist = cls.get_filelist(path)
         if use_mp:
-            with multiprocessing.Pool(processes=multiprocessing.cpu_count()) as pool:
+            with multiprocessing.Pool(
+                processes=processes or multiprocessing.cpu_count()
+            ) as pool:
                 print("Extracting XML data from {} datasets".format(len(filelist)))
                 results = [
                     pool.apply_async(
@@ -96,6 +153,121 @@ class Ecospold1DataExtractor:
 
         return data
 
+    @classmethod
+    def iter_extract(
+        cls,
+        path: Union[str, Path, StringIO],
+        db_name: str,
+        use_mp: bool = True,
+        processes: Optional[int] = None,
+        batch_size: int = 10,
+        max_pending: Optional[int] = None,
+    ) -> Iterator[dict]:
+        """
+        Extract data from ecospold1 files, yielding each dataset in file order as soon
+        as it is available.
+
+        Each file is read incrementally and split into standalone documents of
+        ``batch_size`` datasets (see ``split_file``), so the datasets of a single large
+        file are also processed in parallel. With ``use_mp``, at most ``max_pending``
+        batches are waiting in or for the worker pool, which bounds the memory used
+        for unfinished work.
+
+        Parameters
+        ----------
+        path : str
+            Path to the directory containing the ecospold1 files or path to a single file.
+        db_name : str
+            Name of the database.
+        use_mp : bool, optional
+            Process the batches in a worker pool. Default is True.
+        processes : int, optional
+            Number of worker processes. Defaults to ``multiprocessing.cpu_count()``.
+        batch_size : int, optional
+            Number of datasets sent to a worker in one task. Default is 10.
+        max_pending : int, optional
+            Maximum number of submitted but not yet consumed batches. Defaults to four
+            per worker process.
+
+        """
+        tasks = (
+            (
+                document,
+                "StringIO" if isinstance(filepath, StringIO) else str(filepath),
+            )
+            for filepath in cls.get_filelist(path)
+            for document in cls.split_file(filepath, batch_size)
+        )
+        if not use_mp:
+            for document, filepath in tasks:
+                yield from cls.process_document(document, filepath, db_name)
+            return
+
+        processes = processes or multiprocessing.cpu_count()
+        max_pending = max_pending or processes * 4
+        with multiprocessing.Pool(processes=processes) as pool:
+            pending = deque()
+            for document, filepath in tasks:
+                pending.append(
+                    pool.apply_async(
+                        cls.process_document, args=(document, filepath, db_name)
+                    )
+                )
+                if len(pending) >= max_pending:
+                    yield from pending.popleft().get()
+            while pending:
+                yield from pending.popleft().get()
+
+    @classmethod
+    def split_file(
+        cls, filepath: Union[str, Path, StringIO], batch_size: int = 10
+    ) -> Iterator[bytes]:
+        """
+        Split an ecospold1 file into standalone documents with up to ``batch_size``
+        datasets each.
+
+        The file is parsed incrementally without validation or object mapping, and
+        each dataset is removed from the tree once it is serialized, so memory use
+        doesn't depend on the file size. Each document has the root element of the
+        original file.
+
+        """
+        if isinstance(filepath, StringIO):
+            source = BytesIO(filepath.getvalue().encode("utf-8"))
+        else:
+            source = str(filepath)
+        batch = None
+        for _, element in etree.iterparse(
+            source, tag="{{{}}}dataset".format(cls.NAMESPACE), huge_tree=True
+        ):
+            root = element.getparent()
+            if batch is None:
+                batch = etree.Element(root.tag, attrib=root.attrib, nsmap=root.nsmap)
+            # Moves the dataset out of the parsed tree
+            batch.append(element)
+            if len(batch) >= batch_size:
+                yield etree.tostring(batch)
+                batch = None
+        if batch is not None:
+            yield etree.tostring(batch)
+
+    @classmethod
+    def process_document(
+        cls, document: bytes, filepath: Union[str, Path, StringIO], db_name: str
+    ) -> List[dict]:
+        """
+        Process an ecospold1 document given as bytes, like ``process_file``.
+
+        ``filepath`` is the path of the file the document comes from.
+
+        """
+        root = objectify.fromstring(document, _schema_parser())
+        return [
+            cls.process_dataset(dataset, filepath, db_name)
+            for dataset in root.datasets
+            if dataset.tag != "comment"
+        ]
+
     @classmethod
     def process_file(cls, filepath: Union[str, Path, StringIO], db_name: str):
         """
@@ -335,24 +507,26 @@ class Ecospold1DataExtractor:
 
         """
 
-        if exc.groupsStr[0] in (
+        # ``groupsStr`` is expensive to compute
+        group = exc.groupsStr[0]
+        if group in (
             "ReferenceProduct",
             "Allocated by product",
             "WasteToTreatment",
         ):
             kind = "production"
-        elif exc.groupsStr[0] == "Include avoided product system":
+        elif group == "Include avoided product system":
             kind = "substitution"
-        elif exc.groupsStr[0] == "ToNature":
+        elif group == "ToNature":
             kind = "biosphere"
-        elif exc.groupsStr[0] in (
+        elif group in (
             "Materials/Fuels",
             "Electricity/Heat",
             "Services",
             "FromTechnosphere",
         ):
             kind = "technosphere"
-        elif exc.groupsStr[0] == "FromNature":
+        elif group == "FromNature":
             kind = "biosphere"  # Resources
         else:
             raise ValueError("Can't understand exchange group {}".format(exc.groupsStr))
@@ -1,9 +1,11 @@
 import math
 import multiprocessing
 import os
+from functools import partial
 from pathlib import Path
+from typing import Iterator, Optional
 
-from lxml import objectify
+from lxml import etree, objectify
 from stats_arrays.distributions import (
     LognormalUncertainty,
     NormalUncertainty,
@@ -13,6 +15,8 @@ from stats_arrays.distributions import (
 )
 from tqdm import tqdm
 
+from .cache import ExtractionCache
+
 PM_MAPPING = {
     "reliability": "reliability",
     "completeness": "completeness",
@@ -59,6 +63,8 @@ def getattr2(obj, attr):
         return {}
 
 
+NS = "{http://www.EcoInvent.org/EcoSpold02}"
+
 TOO_LOW = """Lognormal scale value at or below zero: {}.
 Reverting to undefined uncertainty."""
 TOO_HIGH = """Lognormal scale value impossibly high: {}.
@@ -66,6 +72,9 @@ Reverting to undefined uncertainty."""
 
 
 class Ecospold2DataExtractor(object):
+    # Increment when the extracted data changes; used to invalidate cached results
+    version = 1
+
     @classmethod
     def extract_technosphere_metadata(cls, dirpath: Path):
         """
@@ -104,28 +113,19 @@ class Ecospold2DataExtractor(object):
         return [extract_metadata(ds) for ds in root.iterchildren()]
 
     @classmethod
-    def extract(
-        cls,
-        dirpath: Path,
-        db_name: str,
-        use_mp: bool = True,
-    ):
+    def get_filelist(cls, dirpath: Path) -> list:
         """
-        Extract data from all ecospold2 files in a directory.
+        List the ``.spold`` files to extract.
 
         Parameters
         ----------
-        dirpath : str
-            The path to the directory containing the ecospold2 files.
-        db_name : str
-            The name of the database to create.
-        use_mp : bool, optional
-            Whether to use multiprocessing to extract the data (default is True).
+        dirpath : Path
+            Either a directory containing ecospold2 files, or a single file.
 
         Returns
         -------
         list
-            A list of the extracted data from the ecospold2 files.
+            Filenames (relative to ``dirpath``), or ``[dirpath]`` for a single file.
 
         Raises
         ------
@@ -151,25 +151,154 @@ class Ecospold2DataExtractor(object):
             raise FileNotFoundError(
                 f"No .spold files found. Please check the path and try again: {dirpath}"
             )
+        return filelist
+
+    @classmethod
+    def iter_extract(
+        cls,
+        dirpath: Path,
+        db_name: str,
+        use_mp: bool = True,
+        processes: Optional[int] = None,
+        chunksize: Optional[int] = None,
+        ordered: bool = True,
+        cache: Optional[ExtractionCache] = None,
+    ) -> Iterator[dict]:
+        """
+        Extract data from all ecospold2 files in a directory, yielding each dataset
+        as soon as it is available.
+
+        With ``use_mp``, files are distributed to a worker pool in chunks of
+        ``chunksize`` filenames with ``Pool.imap``; the parent process only holds
+        the results which have been finished but not yet consumed, instead of one
+        pending result per file.
+
+        Parameters
+        ----------
+        dirpath : str
+            The path to the directory containing the ecospold2 files.
+        db_name : str
+            The name of the database to create.
+        use_mp : bool, optional
+            Whether to use multiprocessing to extract the data (default is True).
+        processes : int, optional
+            Number of worker processes. Defaults to ``multiprocessing.cpu_count()``.
+        chunksize : int, optional
+            Number of files sent to a worker in one task. Defaults to a value
+            based on the number of files and workers.
+        ordered : bool, optional
+            Yield datasets in file order (default). If False, datasets are yielded
+            in order of completion, which keeps fewer finished results waiting in
+            the parent process.
+        cache : ExtractionCache, optional
+            Reuse previously extracted data for files whose contents haven't
+            changed, and store newly extracted data.
+
+        Raises
+        ------
+        FileNotFoundError
+            If no .spold files are found in the directory.
+
+        """
+        yield from cls._iter_extract_files(
+            Path(dirpath),
+            cls.get_filelist(dirpath),
+            db_name,
+            use_mp=use_mp,
+            processes=processes,
+            chunksize=chunksize,
+            ordered=ordered,
+            cache=cache,
+        )
+
+    @classmethod
+    def _iter_extract_files(
+        cls, dirpath, filelist, db_name, use_mp, processes, chunksize, ordered, cache
+    ):
+        if cache is None:
+            func = partial(cls.extract_activity, dirpath, db_name=db_name)
+        else:
+            func = partial(
+                cls.extract_activity_cached, dirpath, db_name=db_name, cache=cache
+            )
 
         if use_mp:
-            with multiprocessing.Pool(processes=multiprocessing.cpu_count()) as pool:
+            processes = processes or multiprocessing.cpu_count()
+            if chunksize is None:
+                chunksize = max(1, min(64, len(filelist) // (processes * 4)))
+            with multiprocessing.Pool(processes=processes) as pool:
                 print("Extracting XML data from {} datasets".format(len(filelist)))
-                results = [
-                    pool.apply_async(
-                        Ecospold2DataExtractor.extract_activity,
-                        args=(dirpath, x, db_name),
-                    )
-                    for x in filelist
-                ]
-                data = [p.get() for p in results]
+                imap = pool.imap if ordered else pool.imap_unordered
+                yield from imap(func, filelist, chunksize=chunksize)
         else:
-            data = []
-            for index, filename in enumerate(tqdm(filelist)):
-                data.append(cls.extract_activity(dirpath, filename, db_name))
+            for filename in filelist:
+                yield func(filename)
+
+        if cache is not None:
+            cache.evict()
 
+    @classmethod
+    def extract_activity_cached(cls, dirpath, filename, db_name, cache):
+        """
+        Like ``extract_activity``, but look up the data in ``cache`` first, using
+        the hash of the file contents as key. Newly extracted data is added to
+        the cache.
+        """
+        file_hash = cache.file_hash(os.path.join(dirpath, filename))
+        data = cache.get(cls, file_hash)
+        if data is None:
+            data = cls.extract_activity(dirpath, filename, db_name)
+            cache.set(cls, file_hash, data)
+        else:
+            data["database"] = db_name
+            data["filename"] = os.path.basename(filename)
         return data
 
+    @classmethod
+    def extract(
+        cls,
+        dirpath: Path,
+        db_name: str,
+        use_mp: bool = True,
+        processes: Optional[int] = None,
+        chunksize: Optional[int] = None,
+        ordered: bool = True,
+        cache: Optional[ExtractionCache] = None,
+    ):
+        """
+        Extract data from all ecospold2 files in a directory.
+
+        See ``iter_extract`` for a description of the parameters.
+
+        Returns
+        -------
+        list
+            A list of the extracted data from the ecospold2 files.
+
+        Raises
+        ------
+        FileNotFoundError
+            If no .spold files are found in the directory.
+
+        """
+        dirpath = Path(dirpath)
+        filelist = cls.get_filelist(dirpath)
+        return list(
+            tqdm(
+                cls._iter_extract_files(
+                    dirpath,
+                    filelist,
+                    db_name,
+                    use_mp=use_mp,
+                    processes=processes,
+                    chunksize=chunksize,
+                    ordered=ordered,
+                    cache=cache,
+                ),
+                total=len(filelist),
+            )
+        )
+
     @classmethod
     def condense_multiline_comment(cls, element):
         """
@@ -383,73 +512,71 @@ class Ecospold2DataExtractor(object):
         data = {
             "amount": float(obj.get("amount")),
         }
-        if hasattr(obj, "uncertainty"):
-            unc = obj.uncertainty
-            if hasattr(unc, "pedigreeMatrix"):
+        unc = obj.find(NS + "uncertainty")
+        if unc is not None:
+            pedigree = unc.find(NS + "pedigreeMatrix")
+            if pedigree is not None:
                 data["pedigree"] = dict(
-                    [
-                        (PM_MAPPING[key], int(unc.pedigreeMatrix.get(key)))
-                        for key in PM_MAPPING
-                    ]
+                    [(PM_MAPPING[key], int(pedigree.get(key))) for key in PM_MAPPING]
                 )
 
-            if hasattr(unc, "lognormal"):
+            if (dist := unc.find(NS + "lognormal")) is not None:
                 data.update(
                     {
                         "uncertainty type": LognormalUncertainty.id,
-                        "loc": float(unc.lognormal.get("mu")),
+                        "loc": float(dist.get("mu")),
                         "scale": math.sqrt(
-                            float(unc.lognormal.get("varianceWithPedigreeUncertainty"))
+                            float(dist.get("varianceWithPedigreeUncertainty"))
                         ),
                     }
                 )
-                if unc.lognormal.get("variance"):
+                if dist.get("variance"):
                     data["scale without pedigree"] = math.sqrt(
-                        float(unc.lognormal.get("variance"))
+                        float(dist.get("variance"))
                     )
                 if data["scale"] <= 0:
                     cls.abort_exchange(data, TOO_LOW.format(data["scale"]))
                 elif data["scale"] > 25:
                     cls.abort_exchange(data, TOO_HIGH.format(data["scale"]))
-            elif hasattr(unc, "normal"):
+            elif (dist := unc.find(NS + "normal")) is not None:
                 data.update(
                     {
                         "uncertainty type": NormalUncertainty.id,
-                        "loc": float(unc.normal.get("meanValue")),
+                        "loc": float(dist.get("meanValue")),
                         "scale": math.sqrt(
-                            float(unc.normal.get("varianceWithPedigreeUncertainty"))
+                            float(dist.get("varianceWithPedigreeUncertainty"))
                         ),
                     }
                 )
-                if unc.normal.get("variance"):
+                if dist.get("variance"):
                     data["scale without pedigree"] = math.sqrt(
-                        float(unc.normal.get("variance"))
+                        float(dist.get("variance"))
                     )
                 if data["scale"] <= 0:
                     cls.abort_exchange(data)
-            elif hasattr(unc, "triangular"):
+            elif (dist := unc.find(NS + "triangular")) is not None:
                 data.update(
                     {
                         "uncertainty type": TriangularUncertainty.id,
-                        "minimum": float(unc.triangular.get("minValue")),
-                        "loc": float(unc.triangular.get("mostLikelyValue")),
-                        "maximum": float(unc.triangular.get("maxValue")),
+                        "minimum": float(dist.get("minValue")),
+                        "loc": float(dist.get("mostLikelyValue")),
+                        "maximum": float(dist.get("maxValue")),
                     }
                 )
                 if data["minimum"] >= data["maximum"]:
                     cls.abort_exchange(data)
-            elif hasattr(unc, "uniform"):
+            elif (dist := unc.find(NS + "uniform")) is not None:
                 data.update(
                     {
                         "uncertainty type": UniformUncertainty.id,
                         "loc": data["amount"],
-                        "minimum": float(unc.uniform.get("minValue")),
-                        "maximum": float(unc.uniform.get("maxValue")),
+                        "minimum": float(dist.get("minValue")),
+                        "maximum": float(dist.get("maxValue")),
                     }
                 )
                 if data["minimum"] >= data["maximum"]:
                     cls.abort_exchange(data)
-            elif hasattr(unc, "undefined"):
+            elif unc.find(NS + "undefined") is not None:
                 data.update(
                     {
                         "uncertainty type": UndefinedUncertainty.id,
@@ -481,13 +608,13 @@ class Ecospold2DataExtractor(object):
         """
         name = exc.get("variableName")
         data = {
-            "description": exc.name.text,
+            "description": exc.find(NS + "name").text,
             "id": exc.get("parameterId"),
         }
-        if hasattr(exc, "unitName"):
-            data["unit"] = exc.unitName.text
-        if hasattr(exc, "comment"):
-            data["comment"] = exc.comment.text
+        if (unit := exc.find(NS + "unitName")) is not None:
+            data["unit"] = unit.text
+        if (comment := exc.find(NS + "comment")) is not None:
+            data["comment"] = comment.text
         data.update(cls.extract_uncertainty_dict(exc))
         if name is None:
             name = "Unnamed parameter: {}".format(data["id"])
@@ -523,13 +650,14 @@ class Ecospold2DataExtractor(object):
             if not obj.tag.endswith("property"):
                 continue
 
-            properties[obj.name.text] = {"amount": float(obj.get("amount"))}
-            if hasattr(obj, "comment"):
-                properties[obj.name.text]["comment"] = obj.comment.text
-            if hasattr(obj, "unitName"):
-                properties[obj.name.text]["unit"] = obj.unitName.text
+            name = obj.find(NS + "name").text
+            properties[name] = {"amount": float(obj.get("amount"))}
+            if (comment := obj.find(NS + "comment")) is not None:
+                properties[name]["comment"] = comment.text
+            if (unit := obj.find(NS + "unitName")) is not None:
+                properties[name]["unit"] = unit.text
             if obj.get("variableName"):
-                properties[obj.name.text]["variable name"] = obj.get("variableName")
+                properties[name]["variable name"] = obj.get("variableName")
 
         return properties
 
@@ -554,17 +682,18 @@ class Ecospold2DataExtractor(object):
             5. Stock addition
 
         """
-        if exc.tag == "{http://www.EcoInvent.org/EcoSpold02}intermediateExchange":
+        if exc.tag == NS + "intermediateExchange":
             flow = "intermediateExchangeId"
             is_biosphere = False
-        elif exc.tag == "{http://www.EcoInvent.org/EcoSpold02}elementaryExchange":
+        elif exc.tag == NS + "elementaryExchange":
             flow = "elementaryExchangeId"
             is_biosphere = True
         else:
             print(exc.tag)
             raise ValueError
 
-        is_product = hasattr(exc, "outputGroup") and exc.outputGroup.text in ("0", "2")
+        output_group = exc.find(NS + "outputGroup")
+        is_product = output_group is not None and output_group.text in ("0", "2")
 
         if is_biosphere and is_product:
             raise ValueError("Impossible output group")
@@ -579,11 +708,12 @@ class Ecospold2DataExtractor(object):
         data = {
             "flow": exc.get(flow),
             "type": kind,
-            "name": exc.name.text,
+            "name": exc.find(NS + "name").text,
             "classifications": {
-                o.classificationSystem.text: o.classificationValue.text
-                for o in exc.iterchildren()
-                if o.tag == "{http://www.EcoInvent.org/EcoSpold02}classification"
+                o.find(NS + "classificationSystem").text: o.find(
+                    NS + "classificationValue"
+                ).text
+                for o in exc.iterfind(NS + "classification")
             },
             "production volume": float(exc.get("productionVolumeAmount") or 0),
             "properties": cls.extract_properties(exc),
@@ -591,10 +721,10 @@ class Ecospold2DataExtractor(object):
         }
         if not is_biosphere:
             data["activity"] = exc.get("activityLinkId")
-        if hasattr(exc, "unitName"):
-            data["unit"] = exc.unitName.text
-        if hasattr(exc, "comment"):
-            data["comment"] = exc.comment.text
+        if (unit := exc.find(NS + "unitName")) is not None:
+            data["unit"] = unit.text
+        if (comment := exc.find(NS + "comment")) is not None:
+            data["comment"] = comment.text
         if exc.get("variableName"):
             data["variable name"] = exc.get("variableName")
         if exc.get("formula"):
@@ -606,3 +736,138 @@ class Ecospold2DataExtractor(object):
 
         data.update(cls.extract_uncertainty_dict(exc))
         return data
+
+
+class Ecospold2IterparseDataExtractor(Ecospold2DataExtractor):
+    """
+    Streaming variant of ``Ecospold2DataExtractor``.
+
+    Instead of building a full ``lxml.objectify`` tree for each file, datasets are
+    read with ``etree.iterparse``, restricted to the elements we actually use.
+    Each element is processed when it is closed and then cleared, so only one
+    exchange at a time is held in memory. The extracted data is identical to that
+    of ``Ecospold2DataExtractor``.
+
+    Can be used in ``SingleOutputEcospold2Importer`` with
+    ``extractor=Ecospold2IterparseDataExtractor``.
+    """
+
+    TAGS = tuple(
+        NS + tag
+        for tag in (
+            "activity",
+            "classification",
+            "geography",
+            "technology",
+            "timePeriod",
+            "intermediateExchange",
+            "elementaryExchange",
+            "parameter",
+            "dataEntryBy",
+            "dataGeneratorAndPublication",
+        )
+    )
+
+    @classmethod
+    def extract_activity(cls, dirpath, filename, db_name):
+        """
+        Extract and return the data of an activity from an XML file with the given
+        `filename` in the directory with the path `dirpath`.
+
+        See ``Ecospold2DataExtractor.extract_activity`` for the returned data
+        structure.
+        """
+        data = {
+            "comment": "",
+            "classifications": [],
+            "activity type": None,
+            "activity": None,
+            "database": db_name,
+            "exchanges": [],
+            "filename": os.path.basename(filename),
+            "location": None,
+            "name": None,
+            "synonyms": [],
+            "parameters": {},
+            "authors": {},
+            "type": "process",
+        }
+        comments = {}
+
+        for _, elem in etree.iterparse(
+            os.path.join(dirpath, filename), events=("end",), tag=cls.TAGS
+        ):
+            tag, parent = elem.tag, elem.getparent()
+            if tag == NS + "classification":
+                if parent.tag != NS + "activityDescription":
+                    # Exchange classification; handled with the exchange
+                    continue
+                data["classifications"].append(
+                    (
+                        elem.find(NS + "classificationSystem").text,
+                        elem.find(NS + "classificationValue").text,
+                    )
+                )
+            elif tag == NS + "intermediateExchange" or tag == NS + "elementaryExchange":
+                data["exchanges"].append(cls.extract_exchange(elem))
+            elif tag == NS + "parameter":
+                name, parameter = cls.extract_parameter(elem)
+                data["parameters"][name] = parameter
+            elif tag == NS + "activity":
+                data["activity"] = elem.get("id")
+                data["activity type"] = ACTIVITY_TYPES[
+                    int(elem.get("specialActivityType") or 0)
+                ]
+                data["name"] = elem.find(NS + "activityName").text
+                data["synonyms"] = [s.text for s in elem.iterfind(NS + "synonym")]
+                comments["general"] = cls.condense_multiline_comment(
+                    elem.find(NS + "generalComment")
+                )
+                for key in ("includedActivitiesStart", "includedActivitiesEnd"):
+                    child = elem.find(NS + key)
+                    comments[key] = "" if child is None else child.text
+            elif tag == NS + "geography":
+                data["location"] = elem.find(NS + "shortname").text
+                comments[tag] = cls.condense_multiline_comment(
+                    elem.find(NS + "comment")
+                )
+            elif tag == NS + "technology" or tag == NS + "timePeriod":
+                comments[tag] = cls.condense_multiline_comment(
+                    elem.find(NS + "comment")
+                )
+            elif tag == NS + "dataEntryBy":
+                data["authors"]["data entry"] = {
+                    "name": elem.get("personName"),
+                    "email": elem.get("personEmail"),
+                }
+            elif tag == NS + "dataGeneratorAndPublication":
+                data["authors"]["data generator"] = {
+                    "name": elem.get("personName"),
+                    "email": elem.get("personEmail"),
+                }
+
+            elem.clear()
+            while elem.getprevious() is not None:
+                del parent[0]
+
+        data["comment"] = "\n".join(
+            [
+                (" ".join(x) if isinstance(x, tuple) else x)
+                for x in [
+                    comments.get("general"),
+                    (
+                        "Included activities start: ",
+                        comments.get("includedActivitiesStart"),
+                    ),
+                    (
+                        "Included activities end: ",
+                        comments.get("includedActivitiesEnd"),
+                    ),
+                    ("Geography: ", comments.get(NS + "geography")),
+                    ("Technology: ", comments.get(NS + "technology")),
+                    ("Time period: ", comments.get(NS + "timePeriod")),
+                ]
+                if (x[1] if isinstance(x, tuple) else x)
+            ]
+        )
+        return data
@@ -1,8 +1,17 @@
+import datetime
 import os
 from pathlib import Path
+from typing import Iterator, List, Optional, Sequence
 
 from openpyxl import cell, load_workbook, workbook
 
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
+BACKENDS = ("calamine", "openpyxl")
+
 
 def get_cell_value_handle_error(cell: cell.cell.Cell):
     """
@@ -35,6 +44,50 @@ def get_cell_value_handle_error(cell: cell.cell.Cell):
         return cell.value
 
 
+def _calamine_value(value):
+    """Convert a ``python_calamine`` cell value to the value ``openpyxl`` returns.
+
+    ``calamine`` returns empty and error cells as ``""``, all numbers as floats, and
+    date cells as dates; ``openpyxl`` returns ``None``, integers for numbers stored
+    without a decimal point or exponent, and datetimes."""
+    if value == "":
+        return None
+    elif type(value) is float:
+        # Numbers at or above 1e16 are written in exponent notation
+        if value.is_integer() and abs(value) < 1e16:
+            return int(value)
+    elif type(value) is datetime.date:
+        return datetime.datetime.combine(value, datetime.time())
+    return value
+
+
+def _calamine_rows(wb, name: str) -> Iterator[list]:
+    """Iterate over rows of sheet ``name`` in a ``CalamineWorkbook``.
+
+    ``calamine`` starts each row at the first used column; ``openpyxl`` starts at
+    column ``A``, so we add leading empty cells."""
+    if name not in wb.sheet_names:
+        raise KeyError("Worksheet {0} does not exist.".format(name))
+    sheet = wb.get_sheet_by_name(name)
+    if not sheet.height:
+        return
+    width = sheet.end[1] + 1
+    for row in sheet.iter_rows():
+        yield [None] * (width - len(row)) + [_calamine_value(value) for value in row]
+
+
+def _resolve_backend(backend: Optional[str]) -> str:
+    if backend is None:
+        return "calamine" if CalamineWorkbook is not None else "openpyxl"
+    elif backend not in BACKENDS:
+        raise ValueError(
+            "Unknown Excel backend {}; must be one of {}".format(backend, BACKENDS)
+        )
+    elif backend == "calamine" and CalamineWorkbook is None:
+        raise ImportError("The `calamine` backend requires `python-calamine`")
+    return backend
+
+
 class ExcelExtractor:
     """
     A class used to extract data from an Excel file.
@@ -55,7 +108,11 @@ class ExcelExtractor:
 
     Notes
     -----
-    This class requires the openpyxl package to be installed.
+    Workbooks are read with ``python-calamine`` if it is installed, and otherwise
+    with ``openpyxl``. Both backends return the same cell values: stripped strings,
+    integers or floats, datetimes, booleans, and ``None`` for empty and error cells.
+    Blank cells can differ: ``calamine`` returns ``None`` for empty strings, and
+    doesn't add the empty rows and columns of formatted but unused cells.
 
     Raises
     ------
@@ -80,7 +137,13 @@ class ExcelExtractor:
     """
 
     @classmethod
-    def extract(cls, filepath: Path, **kwargs):
+    def extract(
+        cls,
+        filepath: Path,
+        sheets: Optional[Sequence[str]] = None,
+        backend: Optional[str] = None,
+        **kwargs,
+    ):
         """
         Extract data from an Excel file.
 
@@ -88,6 +151,11 @@ class ExcelExtractor:
         ----------
         filepath : str
             The path to the Excel file.
+        sheets : sequence of str, optional
+            Names of the sheets to extract, in this order. Default is all sheets.
+        backend : str, optional
+            ``"calamine"`` or ``"openpyxl"``. Default is ``"calamine"`` if
+            ``python-calamine`` is installed.
 
         Returns
         -------
@@ -98,14 +166,80 @@ class ExcelExtractor:
         ------
         AssertionError
             If the file at 'filepath' does not exist.
+        KeyError
+            If one of ``sheets`` is not in the workbook.
         """
         filepath = Path(filepath)
         assert filepath.is_file(), "Can't file file at path {}".format(filepath)
-        wb = load_workbook(filepath, data_only=True, read_only=True)
-        data = [(name, cls.extract_sheet(wb, name)) for name in wb.sheetnames]
+        if _resolve_backend(backend) == "calamine":
+            wb = CalamineWorkbook.from_path(str(filepath))
+            data = [
+                (name, cls._strip_rows(_calamine_rows(wb, name)))
+                for name in (wb.sheet_names if sheets is None else sheets)
+            ]
+        else:
+            wb = load_workbook(filepath, data_only=True, read_only=True)
+            data = [
+                (name, cls.extract_sheet(wb, name))
+                for name in (wb.sheetnames if sheets is None else sheets)
+            ]
         wb.close()
         return data
 
+    @classmethod
+    def iter_rows(
+        cls,
+        filepath: Path,
+        name: str,
+        strip: bool = True,
+        backend: Optional[str] = None,
+    ) -> Iterator[list]:
+        """
+        Iterate over the rows of a single sheet without reading the whole sheet
+        into a list first.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the Excel file.
+        name : str
+            The name of the sheet.
+        strip : bool, optional
+            If True, strip whitespace from cell values, by default True.
+        backend : str, optional
+            ``"calamine"`` or ``"openpyxl"``. Default is ``"calamine"`` if
+            ``python-calamine`` is installed.
+
+        Yields
+        ------
+        list
+            The cell values of each row, as returned by ``extract``.
+        """
+        filepath = Path(filepath)
+        assert filepath.is_file(), "Can't file file at path {}".format(filepath)
+        if _resolve_backend(backend) == "calamine":
+            wb = CalamineWorkbook.from_path(str(filepath))
+            rows = _calamine_rows(wb, name)
+        else:
+            wb = load_workbook(filepath, data_only=True, read_only=True)
+            rows = (
+                [get_cell_value_handle_error(cell) for cell in row]
+                for row in wb[name].rows
+            )
+        try:
+            for row in rows:
+                yield cls._strip_row(row) if strip else row
+        finally:
+            wb.close()
+
+    @staticmethod
+    def _strip_row(row: list) -> list:
+        return [x.strip() if isinstance(x, str) else x for x in row]
+
+    @classmethod
+    def _strip_rows(cls, rows: Iterator[list]) -> List[list]:
+        return [cls._strip_row(row) for row in rows]
+
     @classmethod
     def extract_sheet(cls, wb: workbook.Workbook, name: str, strip: bool = True):
         """
@@ -1,8 +1,11 @@
 import csv
+import itertools
 import re
 import zipfile
 from pathlib import Path
 
+import numpy as np
+from scipy.sparse import coo_matrix
 from tqdm import tqdm
 
 
@@ -24,11 +27,17 @@ def remove_numerics(string):
 
 
 class Exiobase3MonetaryDataExtractor(object):
+    # Increment when the parsed matrices change; used to invalidate cached results
+    version = 2
+
     @classmethod
     def _get_path(cls, dirpath):
         """
         Get the directory path of the EXIOBASE data file.
 
+        Zip archives are read directly, without extracting them. Their EXIOBASE
+        directory is the one with ``A.txt``, at the top level or in a subdirectory.
+
         Parameters
         ----------
         dirpath : str
@@ -36,17 +45,18 @@ class Exiobase3MonetaryDataExtractor(object):
 
         Returns
         -------
-        Path
+        Path or zipfile.Path
             The directory path of the EXIOBASE data file.
         """
         path = Path(dirpath)
         if path.is_file() and path.suffix.lower() == ".zip":
             zf = zipfile.ZipFile(path)
-            if zf.namelist()[0].startswith("IOT_"):
-                root_dir = zf.namelist()[0].split("/")[0]
-                path = zipfile.Path(zf, root_dir)
-            else:
-                path = zipfile.Path(zf)
+            tables = sorted(
+                (name for name in zf.namelist() if re.match(r"(.*/)?A\.txt$", name)),
+                key=len,
+            )
+            assert tables, "Zip archive must include Exiobase files"
+            path = zipfile.Path(zf, tables[0][: -len("A.txt")])
         else:
             assert path.is_dir(), "Must supply path to EXIOBASE data folder"
             assert (
@@ -162,6 +172,181 @@ class Exiobase3MonetaryDataExtractor(object):
             for key in units
         ]
 
+    @classmethod
+    def _read_matrix(
+        cls,
+        filepath,
+        num_labels,
+        ignore_small_balancing_corrections,
+        chunksize=500,
+        cache=None,
+    ):
+        """
+        Read a tab-separated EXIOBASE table into a sparse matrix.
+
+        The first two lines give the region and sector of each column. Tables with
+        two row labels have a third header line with the names of the row labels,
+        which is skipped. Each following line has ``num_labels`` label cells and
+        then the values of one row. Values are parsed ``chunksize`` rows at a time
+        with ``numpy.loadtxt``, and zero or empty cells (and, if
+        ``ignore_small_balancing_corrections``, absolute values below ``1e-15``) are
+        dropped from each chunk at once.
+
+        Parameters
+        ----------
+        filepath : Path or zipfile.Path
+            The table file.
+        num_labels : int
+            The number of label cells at the start of each row.
+        ignore_small_balancing_corrections : bool
+            Drop values whose absolute value is below ``1e-15``.
+        chunksize : int, optional
+            The number of rows to parse at once. Default is 500.
+        cache : MatrixCache, optional
+            If given, the matrix is read from this cache if the same table was
+            parsed before, and stored in it otherwise.
+
+        Returns
+        -------
+        tuple
+            ``(row labels, column labels, matrix)``. Row labels are lists of the
+            label cells of each row, column labels ``(sector, region)`` tuples, and
+            ``matrix`` a ``scipy.sparse.coo_matrix`` in row-major order.
+        """
+        if cache is not None:
+            key = cache.key(filepath, num_labels, ignore_small_balancing_corrections)
+            cached = cache.get(cls, key)
+            if cached is not None:
+                return cached
+
+        with filepath.open() as f:
+            reader = csv.reader(f, delimiter="\t")
+            locations = next(reader)[num_labels:]
+            names = [remove_numerics(o) for o in next(reader)[num_labels:]]
+            if num_labels == 2:
+                # Header line with the names of the row labels, like "region, sector"
+                next(reader)
+            num_columns = len(names)
+
+            row_labels, rows, cols, data = [], [], [], []
+            for lines in tqdm(iter(lambda: list(itertools.islice(f, chunksize)), [])):
+                offset, chunk = len(row_labels), []
+                for line in lines:
+                    if not line.strip():
+                        continue
+                    elif '"' in line:
+                        cells = next(csv.reader([line], delimiter="\t"))
+                        cells[num_labels:] = ["\t".join(cells[num_labels:])]
+                    else:
+                        cells = line.rstrip("\r\n").split("\t", num_labels)
+                    row_labels.append(cells[:num_labels])
+                    values = "".join(cells[num_labels:])
+                    if (
+                        values.count("\t") != num_columns - 1
+                        or "\t\t" in values
+                        or values.startswith("\t")
+                        or values.endswith("\t")
+                        or not values
+                    ):
+                        # Read empty and missing cells as NaN, which is dropped below
+                        cells = values.split("\t") if values else []
+                        cells += [""] * (num_columns - len(cells))
+                        values = "\t".join(cell or "nan" for cell in cells)
+                    chunk.append(values)
+
+                if not chunk:
+                    continue
+                values = np.loadtxt(
+                    chunk, delimiter="\t", dtype=np.float64, comments=None, ndmin=2
+                )
+                magnitude = np.abs(values)
+                if ignore_small_balancing_corrections:
+                    mask = magnitude >= 1e-15
+                else:
+                    mask = magnitude > 0
+                chunk_rows, chunk_cols = np.nonzero(mask)
+                rows.append(chunk_rows + offset)
+                cols.append(chunk_cols)
+                data.append(values[chunk_rows, chunk_cols])
+
+        matrix = coo_matrix(
+            (
+                np.concatenate(data or [np.zeros(0)]),
+                (
+                    np.concatenate(rows or [np.zeros(0, dtype=int)]),
+                    np.concatenate(cols or [np.zeros(0, dtype=int)]),
+                ),
+            ),
+            shape=(len(row_labels), num_columns),
+        )
+        col_labels = list(zip(names, locations))
+        if cache is not None:
+            cache.set(cls, key, row_labels, col_labels, matrix)
+        return row_labels, col_labels, matrix
+
+    @classmethod
+    def get_technosphere_matrix(
+        cls, dirpath, ignore_small_balancing_corrections=True, cache=None
+    ):
+        """
+        Read the technosphere table ``A.txt`` into a sparse matrix.
+
+        Parameters
+        ----------
+        dirpath : str
+            The path to the directory with the data.
+        ignore_small_balancing_corrections : bool, optional
+            Ignore small balancing corrections. By default True.
+        cache : MatrixCache, optional
+            Cache of parsed matrices, so that the same table is only parsed once.
+
+        Returns
+        -------
+        tuple
+            ``(inputs, outputs, matrix)``, where ``inputs`` and ``outputs`` are lists
+            of ``(sector, region)`` tuples for the rows and columns of ``matrix``, a
+            ``scipy.sparse.coo_matrix`` with the nonzero values.
+        """
+        dirpath = cls._get_path(dirpath)
+        rows, outputs, matrix = cls._read_matrix(
+            dirpath / "A.txt", 2, ignore_small_balancing_corrections, cache=cache
+        )
+        inputs = [(remove_numerics(sector), region) for region, sector in rows]
+        return inputs, outputs, matrix
+
+    @classmethod
+    def get_biosphere_matrix(
+        cls, dirpath, ignore_small_balancing_corrections=True, cache=None
+    ):
+        """
+        Read the satellite table ``satellite/S.txt`` into a sparse matrix.
+
+        Parameters
+        ----------
+        dirpath : str
+            The path to the directory with the data.
+        ignore_small_balancing_corrections : bool, optional
+            Ignore small balancing corrections. By default True.
+        cache : MatrixCache, optional
+            Cache of parsed matrices, so that the same table is only parsed once.
+
+        Returns
+        -------
+        tuple
+            ``(flows, outputs, matrix)``, where ``flows`` is a list of flow names
+            for the rows of ``matrix``, a ``scipy.sparse.coo_matrix`` with the nonzero
+            values, and ``outputs`` a list of ``(sector, region)`` tuples for its
+            columns.
+        """
+        dirpath = cls._get_path(dirpath)
+        rows, outputs, matrix = cls._read_matrix(
+            dirpath / "satellite" / "S.txt",
+            1,
+            ignore_small_balancing_corrections,
+            cache=cache,
+        )
+        return [flow for flow, in rows], outputs, matrix
+
     @classmethod
     def get_technosphere_iterator(
         cls, dirpath, num_products, ignore_small_balancing_corrections=True
@@ -178,24 +363,13 @@ class Exiobase3MonetaryDataExtractor(object):
         ignore_small_balancing_corrections : bool, optional
             Ignore small balancing corrections. By default True.
         """
-        dirpath = cls._get_path(dirpath)
-
-        with (dirpath / "A.txt").open() as f:
-            reader = csv.reader(f, delimiter="\t")
-            locations = next(reader)[2:]
-            names = [remove_numerics(o) for o in next(reader)[2:]]
-
-            for line in tqdm(reader):
-                inpt = (remove_numerics(line[1]), line[0])
-                for index, elem in enumerate(line[2:]):
-                    if elem and float(elem) != 0:
-                        if (
-                            ignore_small_balancing_corrections
-                            and abs(float(elem)) < 1e-15
-                        ):
-                            continue
-                        else:
-                            yield (inpt, (names[index], locations[index]), float(elem))
+        inputs, outputs, matrix = cls.get_technosphere_matrix(
+            dirpath, ignore_small_balancing_corrections
+        )
+        for row, col, value in zip(
+            matrix.row.tolist(), matrix.col.tolist(), matrix.data.tolist()
+        ):
+            yield (inputs[row], outputs[col], value)
 
     @classmethod
     def get_biosphere_iterator(cls, dirpath, ignore_small_balancing_corrections=True):
@@ -209,20 +383,10 @@ class Exiobase3MonetaryDataExtractor(object):
         ignore_small_balancing_corrections : bool, optional
             Ignore small balancing corrections. By default True.
         """
-        dirpath = cls._get_path(dirpath)
-        with (dirpath / "satellite" / "S.txt").open() as f:
-            reader = csv.reader(f, delimiter="\t")
-            locations = next(reader)[1:]
-            names = [remove_numerics(o) for o in next(reader)[1:]]
-
-            for line in tqdm(reader):
-                flow = line[0]
-                for index, elem in enumerate(line[1:]):
-                    if elem and float(elem) != 0:
-                        if (
-                            ignore_small_balancing_corrections
-                            and abs(float(elem)) < 1e-15
-                        ):
-                            continue
-                        else:
-                            yield (flow, (names[index], locations[index]), float(elem))
+        flows, outputs, matrix = cls.get_biosphere_matrix(
+            dirpath, ignore_small_balancing_corrections
+        )
+        for row, col, value in zip(
+            matrix.row.tolist(), matrix.col.tolist(), matrix.data.tolist()
+        ):
+            yield (flows[row], outputs[col], value)
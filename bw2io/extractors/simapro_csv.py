@@ -1,4 +1,5 @@
 import csv
+import functools
 import math
 import os
 import re
@@ -17,6 +18,7 @@ from stats_arrays import (
 )
 
 from ..compatibility import SIMAPRO_BIOSPHERE
+from ..strategies.parameterization import evaluate_parameters
 from ..strategies.simapro import normalize_simapro_formulae
 
 INTRODUCTION = """Starting SimaPro import:
@@ -45,6 +47,14 @@ SIMAPRO_END_OF_DATASETS = {
 }
 
 
+SIMAPRO_GLOBAL_PARAMETERS = {
+    "Database Calculated parameters",
+    "Database Input parameters",
+    "Project Calculated parameters",
+    "Project Input parameters",
+}
+
+
 class EndOfDatasets(Exception):
     """Raise exception when there are no more datasets to iterate."""
 
@@ -95,17 +105,41 @@ strip_whitespace_and_delete = lambda obj: (
     obj.replace("\x7f", "").strip() if isinstance(obj, str) else obj
 )
 
-uppercase_expression = (
-    "(?:"  # Don't capture this group
-    "^"  # Match the beginning of the string
-    "|"  # Or
-    "[^a-zA-Z_])"  # Anything other than a letter or underscore. SimaPro is limited to ASCII characters
-    "(?P<variable>{})"  # The variable name string will be substituted here
-    "(?:[^a-zA-Z_]|$)"  # Match anything other than a letter or underscore, or the end of the line
+identifier_expression = re.compile(
+    "(?<![a-zA-Z_])"  # Not preceded by a letter or underscore
+    "[a-zA-Z_][a-zA-Z0-9_]*"  # A variable name. SimaPro is limited to ASCII characters
 )
 
 
-def replace_with_uppercase(string, names, precompiled):
+def compile_uppercase_names(names):
+    """
+    Build a function which replaces all occurrences of elements of ``names`` in a
+    string with their uppercase equivalents.
+
+    Variable names in the string are found with a single regular expression and looked
+    up case-insensitively in a dictionary, so each string is scanned once, however many
+    names there are. Only whole variable names are replaced.
+
+    Parameters
+    ----------
+    names : iterable
+        Variable name strings that should already all be uppercase.
+
+    Returns
+    -------
+    callable
+        Function which takes a string and returns the modified string.
+
+    """
+    lookup = {name.upper(): name for name in names}
+
+    def uppercase(match):
+        return lookup.get(match.group().upper(), match.group())
+
+    return functools.partial(identifier_expression.sub, uppercase)
+
+
+def replace_with_uppercase(string, names, precompiled=None):
     """
     Replace all occurrences of elements of ``names`` in ``string`` with their uppercase equivalents.
 
@@ -115,18 +149,18 @@ def replace_with_uppercase(string, names, precompiled):
         String to be modified.
     names : list
         List of variable name strings that should already all be uppercase.
-    precompiled : dict
-        Dictionary #TODO.
+    precompiled : callable, optional
+        Function returned by ``compile_uppercase_names(names)``. Pass it when
+        modifying many strings with the same ``names``.
 
     Returns
     -------
         The modified string.
 
     """
-    for name in names:
-        for result in precompiled[name].findall(string):
-            string = string.replace(result, name)
-    return string
+    if precompiled is None:
+        precompiled = compile_uppercase_names(names)
+    return precompiled(string)
 
 
 class SimaProCSVExtractor(object):
@@ -186,6 +220,42 @@ class SimaProCSVExtractor(object):
                 - a dictionary containing global parameters extracted from the SimaPro export file, and
                 - a dictionary containing project metadata extracted from the SimaPro export file.
         """
+        datasets, global_parameters, project_metadata = cls.iter_extract(
+            filepath, delimiter=delimiter, name=name, encoding=encoding, **kwargs
+        )
+        return list(datasets), global_parameters, project_metadata
+
+    @classmethod
+    def iter_extract(
+        cls,
+        filepath,
+        delimiter=";",
+        name=None,
+        encoding="cp1252",
+        batch_size=100,
+        **kwargs,
+    ):
+        """
+        Extract data from a SimaPro export file (.csv) as a stream of datasets.
+
+        The file is read twice, one line at a time. The first pass only keeps the
+        project metadata and the global parameter sections, so that the global
+        parameters can be evaluated. The second pass happens while the returned
+        iterator is consumed: each process block is parsed as soon as its ``End`` line
+        is read. Parameters and exchange formulas are evaluated together for
+        ``batch_size`` datasets with ``evaluate_parameters``, so only that many
+        blocks are held in memory.
+
+        Takes the same parameters as ``extract``, and ``batch_size``.
+
+        Returns:
+        --------
+        Tuple[Iterator[Dict], Dict, Dict]
+            A tuple containing:
+                - an iterator of dictionaries representing each dataset extracted from the SimaPro export file,
+                - a dictionary containing global parameters extracted from the SimaPro export file, and
+                - a dictionary containing project metadata extracted from the SimaPro export file.
+        """
         assert os.path.exists(filepath), "Can't find file %s" % filepath
         log, logfile = get_io_logger("SimaPro-extractor")
 
@@ -197,45 +267,110 @@ class SimaProCSVExtractor(object):
                 name,
             )
         )
-        with open(filepath, "r", encoding=encoding) as csv_file:
-            reader = csv.reader(csv_file, delimiter=delimiter)
-            lines = [
-                [strip_whitespace_and_delete(obj) for obj in line] for line in reader
-            ]
+        first_lines, header, parameter_lines = cls.read_file_outline(
+            filepath, delimiter, encoding
+        )
 
         # Check if valid SimaPro file
         assert (
-            "SimaPro" in lines[0][0] or "CSV separator" in lines[0][0]
+            "SimaPro" in first_lines[0][0] or "CSV separator" in first_lines[0][0]
         ), "File is not valid SimaPro export"
 
-        project_name = name or cls.get_project_name(lines)
-        datasets = []
-
-        project_metadata = cls.get_project_metadata(lines)
+        project_name = name or cls.get_project_name(first_lines)
+        project_metadata = cls.get_project_metadata(header)
         global_parameters, global_precompiled = cls.get_global_parameters(
-            lines, project_metadata
+            parameter_lines, project_metadata
         )
+        close_log(log)
 
-        index = cls.get_next_process_index(lines, 0)
+        datasets = cls.iter_datasets(
+            cls.iter_lines(filepath, delimiter, encoding),
+            project_name,
+            filepath,
+            global_parameters,
+            project_metadata,
+            global_precompiled,
+            batch_size,
+        )
+        return datasets, global_parameters, project_metadata
 
-        while True:
-            try:
-                ds, index = cls.read_data_set(
-                    lines,
-                    index,
-                    project_name,
-                    filepath,
-                    global_parameters,
-                    project_metadata,
-                    global_precompiled,
-                )
-                datasets.append(ds)
-                index = cls.get_next_process_index(lines, index)
-            except EndOfDatasets:
-                break
+    @classmethod
+    def iter_lines(cls, filepath, delimiter=";", encoding="cp1252"):
+        """
+        Yield the lines of a SimaPro export file as lists of stripped strings.
+        """
+        with open(filepath, "r", encoding=encoding) as csv_file:
+            for line in csv.reader(csv_file, delimiter=delimiter):
+                yield [strip_whitespace_and_delete(obj) for obj in line]
 
-        close_log(log)
-        return datasets, global_parameters, project_metadata
+    @classmethod
+    def read_file_outline(cls, filepath, delimiter=";", encoding="cp1252"):
+        """
+        Read the parts of a SimaPro export file needed before datasets can be parsed.
+
+        Returns:
+        --------
+        Tuple[List[List[str]], List[List[str]], List[List[str]]]
+            A tuple containing the first 25 lines, the header lines up to and including
+            the first blank line, and the lines of the global parameter sections, each
+            followed by its closing blank line.
+        """
+        first_lines, header, parameter_lines = [], [], []
+        in_header, in_parameters = True, False
+        for line in cls.iter_lines(filepath, delimiter, encoding):
+            if len(first_lines) < 25:
+                first_lines.append(line)
+            if in_header:
+                header.append(line)
+                in_header = bool(line)
+            if line and line[0] in SIMAPRO_GLOBAL_PARAMETERS:
+                in_parameters = True
+            if in_parameters:
+                parameter_lines.append(line)
+                in_parameters = bool(line)
+        return first_lines, header, parameter_lines
+
+    @classmethod
+    def iter_datasets(
+        cls, lines, db_name, filepath, gp, pm, global_precompiled, batch_size=100
+    ):
+        """
+        Parse the process blocks in ``lines``, an iterator of lines of a SimaPro
+        export file, and yield the datasets of every ``batch_size`` blocks once their
+        parameters and formulas are evaluated.
+
+        Like ``get_next_process_index``, stops at the first section which comes after
+        the datasets.
+        """
+        global_values = {key: value["amount"] for key, value in gp.items()}
+        batch = []
+        for line in lines:
+            if line and line[0] in SIMAPRO_END_OF_DATASETS:
+                break
+            elif line and line[0] == "Process":
+                block = []
+                for line in lines:
+                    block.append(line)
+                    if line and line[0] == "End":
+                        break
+                try:
+                    ds, _ = cls.read_data_set(
+                        block,
+                        0,
+                        db_name,
+                        filepath,
+                        gp,
+                        pm,
+                        global_precompiled,
+                        evaluate=False,
+                    )
+                except EndOfDatasets:
+                    break
+                batch.append(ds)
+                if len(batch) >= batch_size:
+                    yield from evaluate_parameters(batch, global_values)
+                    batch = []
+        yield from evaluate_parameters(batch, global_values)
 
     @classmethod
     def get_next_process_index(cls, data, index):
@@ -326,7 +461,7 @@ class SimaProCSVExtractor(object):
         Returns:
             A tuple containing:
                 - parameters (Dict[str, Dict[str, Any]]): A dictionary containing global parameters extracted from the SimaPro export file. Each parameter is represented as a dictionary with keys 'name', 'unit', 'formula', and 'amount'.
-                - global_precompiled (Dict[str, Pattern]): A dictionary containing compiled regular expression patterns used to search for parameter names in the SimaPro export file.
+                - global_precompiled (Callable[[str], str]): A function from ``compile_uppercase_names`` which changes references to global parameters in formulas to uppercase.
 
         Raises:
             ValueError: If an invalid parameter is encountered in the SimaPro export file.
@@ -354,10 +489,7 @@ class SimaProCSVExtractor(object):
 
         # Extract name and uppercase
         parameters = {obj.pop("name").upper(): obj for obj in parameters}
-        global_precompiled = {
-            name: re.compile(uppercase_expression.format(name), flags=re.IGNORECASE)
-            for name in parameters
-        }
+        global_precompiled = compile_uppercase_names(parameters)
 
         # Change all formula values to uppercase if referencing global parameters
         for obj in parameters.values():
@@ -809,11 +941,17 @@ class SimaProCSVExtractor(object):
             index += 1
 
     @classmethod
-    def read_data_set(cls, data, index, db_name, filepath, gp, pm, global_precompiled):
+    def read_data_set(
+        cls, data, index, db_name, filepath, gp, pm, global_precompiled, evaluate=True
+    ):
         metadata, index = cls.read_dataset_metadata(data, index)
         """
         Read a SimaPro data set from a list of tuples.
 
+        Parameters and exchange formulas are evaluated with a ``ParameterSet``,
+        unless ``evaluate`` is false, e.g. to evaluate many datasets together with
+        ``evaluate_parameters``.
+
         Returns
         -------
         Tuple[Dict[str, Any], int]
@@ -907,10 +1045,7 @@ class SimaProCSVExtractor(object):
 
         # Extract name and uppercase
         ds["parameters"] = {obj.pop("name").upper(): obj for obj in ds["parameters"]}
-        local_precompiled = {
-            name: re.compile(uppercase_expression.format(name), flags=re.IGNORECASE)
-            for name in ds["parameters"]
-        }
+        local_precompiled = compile_uppercase_names(ds["parameters"])
 
         # Change all parameter formula values to uppercase if referencing
         # global or local parameters
@@ -933,11 +1068,12 @@ class SimaProCSVExtractor(object):
                     obj["formula"], gp, global_precompiled
                 )
 
-        ps = ParameterSet(
-            ds["parameters"], {key: value["amount"] for key, value in gp.items()}
-        )
-        # Changes in-place
-        ps(ds["exchanges"])
+        if evaluate:
+            ps = ParameterSet(
+                ds["parameters"], {key: value["amount"] for key, value in gp.items()}
+            )
+            # Changes in-place
+            ps(ds["exchanges"])
 
         if not ds["parameters"]:
             del ds["parameters"]
@@ -11,6 +11,7 @@ from .excel import CSVImporter, ExcelImporter
 from .excel_lcia import CSVLCIAImporter, ExcelLCIAImporter
 from .exiobase3_hybrid import Exiobase3HybridImporter
 from .exiobase3_monetary import Exiobase3MonetaryImporter
+from .profiling import StrategyReport
 from .simapro_csv import SimaProCSVImporter
 from .simapro_lcia_csv import SimaProLCIACSVImporter
 
@@ -1,13 +1,17 @@
 import functools
+import multiprocessing
 import warnings
 from datetime import datetime
 from time import time
 
+from ..columnar import ColumnarData, get_columnar_strategy
 from ..errors import StrategyError
 from ..migrations import migrations
 from ..strategies import migrate_datasets, migrate_exchanges
+from ..strategies.parallel import apply_per_dataset_strategies, group_strategies
 from ..unlinked_data import UnlinkedData, unlinked_data
 from ..utils import activity_hash
+from .profiling import StrategyReport, profile_strategy
 
 
 class ImportBase(object):
@@ -48,7 +52,7 @@ class ImportBase(object):
         for ds in self.data:
             yield ds
 
-    def apply_strategy(self, strategy, verbose=True):
+    def apply_strategy(self, strategy, verbose=True, profile=False):
         """
         Apply the specified strategy transform to the importer's data.
 
@@ -62,6 +66,10 @@ class ImportBase(object):
             The strategy function to apply to the importer's data.
         verbose : bool, optional
             If True, print a message indicating which strategy is being applied. Defaults to True.
+        profile : bool or str, optional
+            If True, append the wall time, peak memory and node and exchange counts of the
+            strategy to `self.strategy_report`. If "cprofile", also store `cProfile` statistics.
+            Defaults to False.
 
         Returns
         -------
@@ -80,22 +88,127 @@ class ImportBase(object):
         """
         if not hasattr(self, "applied_strategies"):
             self.applied_strategies = []
+        if profile and not hasattr(self, "strategy_report"):
+            self.strategy_report = StrategyReport()
 
-        try:
-            func_name = strategy.__name__
-        except AttributeError:  # Curried function
-            func_name = strategy.func.__name__
+        func_name = self._strategy_name(strategy)
 
         if verbose:
             print("Applying strategy: {}".format(func_name))
 
         try:
-            self.data = strategy(self.data)
+            if profile:
+                with profile_strategy(
+                    func_name, lambda: self.data, use_cprofile=profile == "cprofile"
+                ) as row:
+                    self.strategy_report.append(row)
+                    self._apply_strategy(strategy)
+            else:
+                self._apply_strategy(strategy)
             self.applied_strategies.append(func_name)
         except StrategyError as err:
             print("Couldn't apply strategy {}:\n\t{}".format(func_name, err))
 
-    def apply_strategies(self, strategies=None, verbose=True):
+    def apply_strategies_in_parallel(
+        self, strategies, verbose=True, profile=False, processes=None
+    ):
+        """
+        Apply per-dataset strategies to the importer's data in one pass over partitions of
+        the data in a worker pool.
+
+        The strategies must be marked with `bw2io.strategies.per_dataset`, and be picklable.
+        The result is the same as applying them one by one with `apply_strategy`. If one
+        of them raises a `StrategyError`, the data is left unchanged and the strategies are
+        applied one by one instead.
+
+        Parameters
+        ----------
+        strategies : list
+            Per-dataset strategies to apply, in order.
+        verbose : bool, optional
+            If True, print a message indicating which strategies are being applied. Defaults to True.
+        profile : bool or str, optional
+            If True or "cprofile", add one row for all strategies to `self.strategy_report`. See
+            `apply_strategy`. Defaults to False.
+        processes : int, optional
+            Number of worker processes. Defaults to the number of CPUs.
+
+        Returns
+        -------
+        None
+            Modifies the importer's data in place.
+
+        """
+        if (processes or multiprocessing.cpu_count()) == 1:
+            for strategy in strategies:
+                self.apply_strategy(strategy, verbose, profile=profile)
+            return
+
+        if not hasattr(self, "applied_strategies"):
+            self.applied_strategies = []
+        if profile and not hasattr(self, "strategy_report"):
+            self.strategy_report = StrategyReport()
+
+        func_names = [self._strategy_name(strategy) for strategy in strategies]
+        if verbose:
+            print("Applying strategies in parallel: {}".format(", ".join(func_names)))
+
+        if isinstance(self.data, ColumnarData):
+            self.data = self.data.to_data()
+        elif not isinstance(self.data, list):
+            self.data = list(self.data)
+
+        try:
+            if profile:
+                with profile_strategy(
+                    " + ".join(func_names),
+                    lambda: self.data,
+                    use_cprofile=profile == "cprofile",
+                ) as row:
+                    self.strategy_report.append(row)
+                    self.data = apply_per_dataset_strategies(
+                        self.data, strategies, processes
+                    )
+            else:
+                self.data = apply_per_dataset_strategies(
+                    self.data, strategies, processes
+                )
+            self.applied_strategies.extend(func_names)
+        except StrategyError:
+            for strategy in strategies:
+                self.apply_strategy(strategy, verbose, profile=profile)
+
+    @staticmethod
+    def _strategy_name(strategy):
+        try:
+            return strategy.__name__
+        except AttributeError:  # Curried function
+            return strategy.func.__name__
+
+    def _apply_strategy(self, strategy):
+        vectorized = (
+            get_columnar_strategy(strategy)
+            if getattr(self, "_columnar", False)
+            else None
+        )
+        if vectorized is not None:
+            if not isinstance(self.data, ColumnarData):
+                self.data = ColumnarData.from_data(self.data)
+            self.data = vectorized(self.data)
+        else:
+            if isinstance(self.data, ColumnarData):
+                self.data = self.data.to_data()
+            self.data = strategy(self.data)
+
+    def apply_strategies(
+        self,
+        strategies=None,
+        verbose=True,
+        columnar=False,
+        profile=False,
+        parallel=False,
+        processes=None,
+    ):
         """
         Apply a list of strategies to the importer's data.
 
@@ -108,6 +221,23 @@ class ImportBase(object):
             List of strategies to apply. Defaults to `self.strategies`.
         verbose : bool, optional
             If True, print a message indicating which strategy is being applied. Defaults to True.
+        columnar : bool, optional
+            If True, strategies with vectorized versions (see `bw2io.columnar`) are applied to
+            the data stored as `ColumnarData`, operating on whole columns. The data is only
+            converted when switching between vectorized and other strategies. Defaults to False.
+        profile : bool or str, optional
+            If True, record the wall time, peak memory and node and exchange counts of each
+            strategy in a new `StrategyReport` in `self.strategy_report`, and print it if
+            `verbose`. If "cprofile", also store `cProfile` statistics for each strategy.
+            Memory tracing slows down strategies considerably. Defaults to False.
+        parallel : bool, optional
+            If True, consecutive strategies marked with `bw2io.strategies.per_dataset` are
+            fused and applied in one pass over partitions of the data in a worker pool (see
+            `apply_strategies_in_parallel`). Other strategies are applied as usual. The result
+            is the same as without `parallel`. Can't be combined with `columnar`. Defaults to
+            False.
+        processes : int, optional
+            Number of worker processes if `parallel`. Defaults to the number of CPUs.
 
         Returns
         -------
@@ -119,15 +249,45 @@ class ImportBase(object):
         The method `apply_strategy` is called to apply each individual strategy to the importer's data. Strategies
         that partially modify data before raising a `StrategyError` should be avoided.
 
+        After each strategy, `self.signal.emit(done, total)` is called if `self.signal` has an `emit`
+        method. When profiling, `self.signal.report(row)` is also called with the report row of
+        the strategy if `self.signal` has a `report` method, so UIs can show live progress.
+
         """
+        if parallel and columnar:
+            raise ValueError("`parallel` and `columnar` can't be combined")
         start = time()
         func_list = self.strategies if strategies is None else strategies
         total = len(func_list)
-        for i, func in enumerate(func_list):
-            self.apply_strategy(func, verbose)
-            if hasattr(self, "signal") and hasattr(self.signal, "emit"):
-                self.signal.emit(i + 1, total)
+        groups = group_strategies(func_list) if parallel else [[f] for f in func_list]
+        self._columnar = columnar
+        if profile:
+            self.strategy_report = StrategyReport()
+        try:
+            done = 0
+            for group in groups:
+                if len(group) > 1:
+                    self.apply_strategies_in_parallel(
+                        group, verbose, profile=profile, processes=processes
+                    )
+                else:
+                    self.apply_strategy(group[0], verbose, profile=profile)
+                done += len(group)
+                if hasattr(self, "signal") and hasattr(self.signal, "emit"):
+                    self.signal.emit(done, total)
+                if (
+                    profile
+                    and hasattr(self, "signal")
+                    and hasattr(self.signal, "report")
+                ):
+                    self.signal.report(self.strategy_report[-1])
+        finally:
+            self._columnar = False
+            if isinstance(self.data, ColumnarData):
+                self.data = self.data.to_data()
         if verbose:
+            if profile:
+                print(self.strategy_report)
             print(
                 "Applied {} strategies in {:.2f} seconds".format(
                     len(func_list), time() - start
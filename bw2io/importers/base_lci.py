@@ -19,6 +19,7 @@ from bw2data.parameters import (
 
 from ..errors import NonuniqueCode, StrategyError, WrongDatabase
 from ..export.excel import write_lci_matching
+from ..lookup import database_nodes, iter_database_nodes
 from ..migrations import migrations
 from ..strategies import (
     assign_only_product_as_production,
@@ -32,8 +33,10 @@ from ..strategies import (
     normalize_units,
     strip_biosphere_exc_locations,
 )
-from ..utils import activity_hash
+from ..utils import DEFAULT_FIELDS, activity_hash
 from .base import ImportBase
+from .bulk_write import bulk_write
+from .incremental import incremental_write
 
 EXCHANGE_SPECIFIC_KEYS = (
     "amount",
@@ -295,6 +298,9 @@ class LCIImporter(ImportBase):
         db_name: Optional[str] = None,
         searchable: bool = True,
         check_typos: bool = True,
+        bulk: bool = False,
+        batch_size: int = 10_000,
+        incremental: bool = False,
         **kwargs,
     ) -> ProcessedDataStore:
         """
@@ -309,6 +315,9 @@ class LCIImporter(ImportBase):
             * *delete_existing* (bool, default ``True``): See above.
             * *activate_parameters* (bool, default ``False``). Instead of storing parameters in ``Activity`` and other proxy objects, create ``ActivityParameter`` and other parameter objects, and evaluate all variables and formulas.
             * *backend* (string, optional): Storage backend to use when creating ``Database``. Default is the default backend.
+            * *bulk* (bool, default ``False``): Insert nodes and exchanges directly in batches of ``batch_size`` nodes in one SQLite transaction, with indices rebuilt at the end, instead of calling ``Database.write``. With ``delete_existing=False``, existing nodes with the same codes are replaced without loading the existing database. Write statistics (nodes, exchanges, seconds, rows per second, peak memory) are stored in ``self.write_report``. Requires the ``sqlite`` backend.
+            * *batch_size* (int, default 10.000): Number of nodes per batch when ``bulk`` is True.
+            * *incremental* (bool, default ``False``): If the database exists, compare ``data`` with the stored nodes and exchanges by content hash, and only write the added, removed, and changed nodes and exchanges. The change report is stored in ``self.write_report``. Ignores ``delete_existing``; nodes not in ``data`` are removed. Requires the ``sqlite`` backend.
 
         Returns:
             ``Database`` instance.
@@ -341,12 +350,14 @@ class LCIImporter(ImportBase):
             error = "The following activities have non-unique codes: {}"
             raise NonuniqueCode(error.format(duplicates))
 
-        data = {(ds["database"], ds["code"]): ds for ds in data}
+        incremental = incremental and db_name in databases
+        if not (bulk or incremental):
+            data = {(ds["database"], ds["code"]): ds for ds in data}
 
         if db_name in databases:
             # TODO: Raise error if unlinked exchanges?
             db = self.database_class(db_name)
-            if delete_existing:
+            if delete_existing or bulk or incremental:
                 existing = {}
             else:
                 existing = db.load(as_dict=True)
@@ -366,8 +377,34 @@ class LCIImporter(ImportBase):
 
         self.write_database_parameters(activate_parameters, delete_existing)
 
-        existing.update(data)
-        db.write(existing, searchable=searchable, check_typos=check_typos)
+        if incremental:
+            self.write_report = incremental_write(
+                db, data, searchable=searchable, check_typos=check_typos
+            )
+            print(
+                "Updated database: {} nodes added, {} removed, {} changed, {} unchanged".format(
+                    len(self.write_report["added"]),
+                    len(self.write_report["removed"]),
+                    len(self.write_report["changed"]),
+                    self.write_report["unchanged"],
+                )
+            )
+        elif bulk:
+            self.write_report = bulk_write(
+                db,
+                data,
+                batch_size=batch_size,
+                upsert=not delete_existing,
+                searchable=searchable,
+                check_typos=check_typos,
+            )
+            print(
+                "Wrote {nodes} nodes and {exchanges} exchanges in {seconds:.2f} seconds "
+                "({rows_per_second:.0f} rows per second)".format(**self.write_report)
+            )
+        else:
+            existing.update(data)
+            db.write(existing, searchable=searchable, check_typos=check_typos)
 
         if activate_parameters:
             self._write_activity_parameters(activity_parameters)
@@ -554,15 +591,12 @@ class LCIImporter(ImportBase):
             )
 
         ffields = [field for field in fields if field != "categories"]
+        nodes = database_nodes(target_db_name, ffields + ["categories", "key"])
         mapping = {
-            get_key(obj, ffields): obj.key
-            for obj in Database(target_db_name)
-            if obj.get("categories")
+            get_key(obj, ffields): obj["key"] for obj in nodes if obj.get("categories")
         }
         existence = {
-            get_key(obj, ffields, False)
-            for obj in Database(target_db_name)
-            if obj.get("categories")
+            get_key(obj, ffields, False) for obj in nodes if obj.get("categories")
         }
 
         for ds in self.data:
@@ -666,10 +700,10 @@ class LCIImporter(ImportBase):
         self.apply_strategy(
             functools.partial(
                 link_iterable_by_fields,
-                other=(
-                    obj
-                    for obj in Database(biosphere_name)
-                    if obj.get("type") == "emission"
+                other=iter_database_nodes(
+                    biosphere_name,
+                    DEFAULT_FIELDS + ("database", "code"),
+                    kinds=["emission"],
                 ),
                 edge_kinds=["biosphere"],
             ),
@@ -6,6 +6,7 @@ from bw2data import Database, Method, config, databases, mapping, methods
 from bw2data.utils import recursive_str_to_unicode
 
 from ..export.excel import write_lcia_matching
+from ..lookup import iter_database_nodes
 from ..strategies import (
     drop_unlinked_cfs,
     drop_unspecified_subcategories,
@@ -16,7 +17,9 @@ from ..strategies import (
     normalize_units,
     set_biosphere_type,
 )
+from ..utils import DEFAULT_FIELDS
 from .base import ImportBase
+from .bulk_lcia import bulk_write_methods
 
 
 class LCIAImporter(ImportBase):
@@ -36,10 +39,10 @@ class LCIAImporter(ImportBase):
             functools.partial(normalize_biosphere_names, lcia=True),
             functools.partial(
                 link_iterable_by_fields,
-                other=(
-                    obj
-                    for obj in Database(self.biosphere_name)
-                    if obj.get("type") == "emission"
+                other=iter_database_nodes(
+                    self.biosphere_name,
+                    DEFAULT_FIELDS + ("database", "code"),
+                    kinds=["emission"],
                 ),
                 edge_kinds=["biosphere"],
             ),
@@ -48,34 +51,65 @@ class LCIAImporter(ImportBase):
             ),
         ]
 
-    def write_methods(self, overwrite=False, verbose=True):
+    def write_methods(self, overwrite=False, verbose=True, bulk=False, processes=1):
+        """
+        Write and process the linked LCIA methods.
+
+        Parameters
+        ----------
+        overwrite : bool, optional
+            Replace existing methods with the same names. Default is False.
+        verbose : bool, optional
+            Print the number of written methods and characterization factors. Default is
+            True.
+        bulk : bool, optional
+            Resolve all flows at once and save the method metadata once, after all
+            method files are written, instead of calling ``Method.write`` and
+            ``Method.process`` for each method. The result is the same. Statistics are
+            stored in ``self.write_report``. Default is False.
+        processes : int, optional
+            Number of worker processes writing the processed datapackages when ``bulk``
+            is True. ``None`` uses all CPUs. Default is 1.
+
+        Raises
+        ------
+        ValueError
+            If there are unlinked characterization factors, or if a method already
+            exists and ``overwrite`` is False.
+
+        """
         num_methods, num_cfs, num_unlinked = self.statistics(False)
         if num_unlinked:
             raise ValueError(
                 ("Can't write unlinked methods ({} unlinked cfs)").format(num_unlinked)
             )
-        for ds in self.data:
-            if ds["name"] in methods:
-                if overwrite:
-                    del methods[ds["name"]]
-                else:
-                    raise ValueError(
-                        (
-                            "Method {} already exists. Use "
-                            "``overwrite=True`` to overwrite existing methods"
-                        ).format(ds["name"])
+        if bulk:
+            self.write_report = bulk_write_methods(
+                self.data, overwrite=overwrite, processes=processes
+            )
+        else:
+            for ds in self.data:
+                if ds["name"] in methods:
+                    if overwrite:
+                        del methods[ds["name"]]
+                    else:
+                        raise ValueError(
+                            (
+                                "Method {} already exists. Use "
+                                "``overwrite=True`` to overwrite existing methods"
+                            ).format(ds["name"])
+                        )
+
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    method = Method(ds["name"])
+                    method.register(
+                        description=ds["description"],
+                        filename=ds["filename"],
+                        unit=ds["unit"],
                     )
-
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
-                method = Method(ds["name"])
-                method.register(
-                    description=ds["description"],
-                    filename=ds["filename"],
-                    unit=ds["unit"],
-                )
-                method.write(self._reformat_cfs(ds["exchanges"]))
-                method.process()
+                    method.write(self._reformat_cfs(ds["exchanges"]))
+                    method.process()
         if verbose:
             print(
                 "Wrote {} LCIA methods with {} characterization factors".format(
@@ -0,0 +1,210 @@
+import functools
+import multiprocessing
+import pickle
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from bw2data import Method, config, geomapping, methods, projects
+from bw2data.backends import sqlite3_lci_db
+from bw2data.errors import UnknownObject
+from bw2data.fatomic import open as atomic_open
+from bw2data.ia_data_store import abbreviate
+from bw2data.utils import as_uncertainty_dict, get_geocollection
+from bw_processing import clean_datapackage_name, create_datapackage
+from fsspec.implementations.zip import ZipFileSystem
+
+
+def node_ids(keys: Iterable[tuple]) -> Dict[tuple, int]:
+    """
+    Resolve ``(database, code)`` keys to node ids with one query per database.
+
+    The returned dictionary has the keys with codes as strings, as they are stored.
+    Keys which aren't found are missing.
+
+    """
+    codes_by_database = {}
+    for database, code in keys:
+        codes_by_database.setdefault(database, set()).add(str(code))
+    connection = sqlite3_lci_db.db.connection()
+    ids = {}
+    for database, codes in codes_by_database.items():
+        for code, id_ in connection.execute(
+            'SELECT "code", "id" FROM "activitydataset" WHERE "database" = ?',
+            (database,),
+        ):
+            if code in codes:
+                ids[(database, code)] = id_
+    return ids
+
+
+def _method_rows(name: tuple, cfs: List[dict], ids: Dict[tuple, int]) -> List[tuple]:
+    rows = []
+    for cf in cfs:
+        flow = cf["input"]
+        if not isinstance(flow, int):
+            try:
+                flow = ids[(flow[0], str(flow[1]))]
+            except KeyError:
+                raise UnknownObject(
+                    "Can't find flow `{}`, specified in CF `{}` for method `{}`".format(
+                        tuple(flow), cf, name
+                    )
+                )
+        # Note: This assumes no uncertainty or regionalization, like
+        # ``LCIAImporter._reformat_cfs``
+        rows.append((flow, cf["amount"]))
+    return rows
+
+
+def _write_processed(
+    global_index: int, job: Tuple[str, tuple, str, List[tuple]]
+) -> None:
+    # Same datapackage as ``Method.process``, without loading the intermediate data
+    # again and looking up each flow
+    filepath, name, filename, rows = job
+    dp = create_datapackage(
+        fs=ZipFileSystem(filepath, mode="w"),
+        name=clean_datapackage_name(filename + ".zip"),
+        sum_intra_duplicates=True,
+        sum_inter_duplicates=False,
+    )
+    dp.add_persistent_vector_from_iterator(
+        matrix="characterization_matrix",
+        name=clean_datapackage_name(str(name) + " matrix data"),
+        dict_iterator=(
+            {**as_uncertainty_dict(row[1]), "row": row[0], "col": global_index}
+            for row in rows
+        ),
+        nrows=len(rows),
+        global_index=global_index,
+        identifier=list(name),
+    )
+    dp.finalize_serialization()
+
+
+def bulk_write_methods(
+    data: List[dict],
+    overwrite: bool = False,
+    processes: Optional[int] = 1,
+    batch_size: int = 50,
+) -> dict:
+    """
+    Write and process the linked LCIA methods ``data`` in bulk.
+
+    Gives the same metadata, intermediate data and processed datapackages as calling
+    ``Method.register``, ``Method.write`` and ``Method.process`` for each method, but
+    resolves all flow ids with one query per biosphere database instead of two queries
+    per characterization factor, and saves the ``methods`` metadata once instead of
+    several times per method.
+
+    Existing methods are deregistered and their files deleted before anything is
+    written. The new methods are only registered, with one save of the metadata,
+    after all their files have been written.
+
+    Parameters
+    ----------
+    data : list of dict
+        LCIA methods in the format of ``LCIAImporter.data``, with linked ``input`` keys.
+    overwrite : bool, optional
+        Replace existing methods with the same names. Default is False.
+    processes : int, optional
+        Number of worker processes writing the processed datapackages, in batches of
+        ``batch_size`` methods. ``None`` uses ``multiprocessing.cpu_count()``. Default is
+        1, which writes them in this process.
+    batch_size : int, optional
+        Number of methods sent to a worker at once. Default is 50.
+
+    Returns
+    -------
+    dict
+        Statistics with the numbers of ``methods`` and ``cfs`` written, and the
+        ``seconds`` needed.
+
+    Raises
+    ------
+    ValueError
+        If a method already exists and ``overwrite`` is False.
+    UnknownObject
+        If a flow can't be found.
+
+    """
+    start = perf_counter()
+    for ds in data:
+        if tuple(ds["name"]) in methods and not overwrite:
+            raise ValueError(
+                (
+                    "Method {} already exists. Use "
+                    "``overwrite=True`` to overwrite existing methods"
+                ).format(tuple(ds["name"]))
+            )
+
+    try:
+        global_index = geomapping[config.global_location]
+    except KeyError:
+        raise KeyError(
+            "Can't find default global location! It's supposed to be `{}`, defined in "
+            "`config`, but this isn't in the `geomapping`".format(
+                config.global_location
+            )
+        )
+
+    ids = node_ids(
+        tuple(cf["input"])
+        for ds in data
+        for cf in ds["exchanges"]
+        if not isinstance(cf["input"], int)
+    )
+    intermediate_dir = Path(projects.dir) / "intermediate"
+    processed_dir = Path(projects.dir) / "processed"
+
+    jobs, metadata = [], []
+    for ds in data:
+        name = tuple(ds["name"])
+        filename = abbreviate(name)
+        rows = _method_rows(name, ds["exchanges"], ids)
+        filepath = processed_dir / clean_datapackage_name(filename + ".zip")
+        jobs.append((filepath, name, filename, rows))
+        metadata.append(
+            {
+                "description": ds["description"],
+                "filename": ds["filename"],
+                "unit": ds["unit"],
+                "abbreviation": filename,
+                "num_cfs": len(rows),
+                "geocollections": [
+                    get_geocollection(None, default_global_location=True)
+                ],
+            }
+        )
+
+    existing = [name for _, name, _, _ in jobs if name in methods]
+    for name in existing:
+        method = Method(name)
+        (intermediate_dir / (method.filename + ".pickle")).unlink(missing_ok=True)
+        method.filepath_processed().unlink(missing_ok=True)
+        del methods.data[name]
+    if existing:
+        methods.flush()
+
+    for _, name, filename, rows in jobs:
+        with atomic_open(intermediate_dir / (filename + ".pickle"), "wb") as f:
+            pickle.dump(rows, f, protocol=4)
+
+    write = functools.partial(_write_processed, global_index)
+    if processes == 1:
+        for job in jobs:
+            write(job)
+    else:
+        with multiprocessing.Pool(processes=processes) as pool:
+            pool.map(write, jobs, chunksize=batch_size)
+
+    for (_, name, _, _), kwargs in zip(jobs, metadata):
+        methods.data[name] = kwargs
+    methods.flush()
+
+    return {
+        "methods": len(jobs),
+        "cfs": sum(len(job[3]) for job in jobs),
+        "seconds": perf_counter() - start,
+    }
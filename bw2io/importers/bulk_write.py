@@ -0,0 +1,294 @@
+import itertools
+import pickle
+import sys
+from time import perf_counter
+from typing import Iterable, Optional, Tuple
+
+from bw2data import databases, geomapping, projects
+from bw2data.backends import sqlite3_lci_db
+from bw2data.backends.typos import (
+    check_activity_keys,
+    check_activity_type,
+    check_exchange_keys,
+    check_exchange_type,
+)
+from bw2data.configuration import labels
+from bw2data.errors import InvalidExchange, UntypedExchange
+from bw2data.snowflake_ids import snowflake_id_generator
+from bw2data.utils import get_geocollection, set_correct_process_type
+
+from ..errors import NonuniqueCode, WrongDatabase
+
+INSERT_ACTIVITY = (
+    'INSERT INTO "activitydataset" ("id", "data", "code", "database", "location", '
+    '"name", "product", "type") VALUES (?, ?, ?, ?, ?, ?, ?, ?)'
+)
+INSERT_EXCHANGE = (
+    'INSERT INTO "exchangedataset" ("data", "input_code", "input_database", '
+    '"output_code", "output_database", "type") VALUES (?, ?, ?, ?, ?, ?)'
+)
+DELETE_ACTIVITY = 'DELETE FROM "activitydataset" WHERE "database" = ? AND "code" = ?'
+DELETE_EXCHANGES = (
+    'DELETE FROM "exchangedataset" WHERE "output_database" = ? AND "output_code" = ?'
+)
+INDICES = {
+    "activitydataset_key": 'CREATE UNIQUE INDEX IF NOT EXISTS "activitydataset_key" '
+    'ON "activitydataset" ("database", "code")',
+    "exchangedataset_input": 'CREATE INDEX IF NOT EXISTS "exchangedataset_input" '
+    'ON "exchangedataset" ("input_database", "input_code")',
+    "exchangedataset_output": 'CREATE INDEX IF NOT EXISTS "exchangedataset_output" '
+    'ON "exchangedataset" ("output_database", "output_code")',
+}
+
+
+def peak_rss() -> Optional[int]:
+    """Peak resident set size of this process in bytes, or ``None`` if not available."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _dump(obj) -> bytes:
+    # Same serialization as ``bw2data.sqlite.PickleField``
+    return pickle.dumps(obj, protocol=4)
+
+
+def _text(value) -> Optional[str]:
+    # Same coercion as ``peewee.TextField``
+    return value if value is None or isinstance(value, str) else str(value)
+
+
+def normalize(ds: dict, db_name: str, check_typos: bool = True) -> Tuple[dict, list]:
+    """
+    Validate ``ds`` and split it into the node and exchange dictionaries which
+    ``Database.write`` would store.
+
+    Exchanges get an ``output`` if missing.
+
+    """
+    ds = set_correct_process_type(ds)
+    if ds.get("database") != db_name:
+        raise WrongDatabase(
+            "Can't write activity in database {} to database {}".format(
+                ds.get("database"), db_name
+            )
+        )
+    key = (ds["database"], ds["code"])
+
+    exchanges = ds.get("exchanges", [])
+    for exc in exchanges:
+        if "input" not in exc or "amount" not in exc:
+            raise InvalidExchange
+        if "type" not in exc:
+            raise UntypedExchange
+        if check_typos:
+            check_exchange_type(exc.get("type"))
+            check_exchange_keys(exc)
+        if "output" not in exc:
+            exc["output"] = key
+
+    node = {k: v for k, v in ds.items() if k != "exchanges"}
+    if check_typos:
+        check_activity_type(node.get("type"))
+        check_activity_keys(node)
+    return node, exchanges
+
+
+def activity_row(node: dict) -> tuple:
+    """Values for ``INSERT_ACTIVITY``; the first element is a new snowflake id."""
+    return (
+        next(snowflake_id_generator),
+        _dump(node),
+        _text(node["code"]),
+        _text(node["database"]),
+        _text(node.get("location")),
+        _text(node.get("name")),
+        _text(node.get("reference product")),
+        _text(node.get("type", labels.process_node_default)),
+    )
+
+
+def exchange_row(exc: dict) -> tuple:
+    """Values for ``INSERT_EXCHANGE``."""
+    return (
+        _dump(exc),
+        _text(exc["input"][1]),
+        _text(exc["input"][0]),
+        _text(exc["output"][1]),
+        _text(exc["output"][0]),
+        _text(exc["type"]),
+    )
+
+
+def finish_write(
+    db,
+    locations: set,
+    geocollections: set,
+    searchable: bool = True,
+    process: bool = True,
+    keep_geocollections: bool = False,
+) -> None:
+    """
+    Update the database metadata and geomapping after writing rows directly, then make
+    the database searchable and process it, like ``Database.write`` does.
+
+    If ``keep_geocollections``, existing geocollections of ``db`` are kept in addition
+    to ``geocollections``.
+
+    """
+    if keep_geocollections:
+        geocollections = geocollections | set(
+            databases[db.name].get("geocollections", [])
+        )
+    geocollections.discard(None)
+    databases[db.name]["number"] = (
+        sqlite3_lci_db.db.connection()
+        .execute(
+            'SELECT COUNT(*) FROM "activitydataset" WHERE "database" = ?', (db.name,)
+        )
+        .fetchone()[0]
+    )
+    databases[db.name]["geocollections"] = sorted(geocollections)
+    databases.set_modified(db.name)
+    geomapping.add(locations)
+
+    if searchable:
+        db.make_searchable(reset=True, signal=False)
+    if process:
+        db.process()
+    if getattr(projects.dataset, "is_sourced", False):
+        from bw2data.signals import on_database_write
+
+        on_database_write.send(name=db.name)
+
+
+def bulk_write(
+    db,
+    data: Iterable[dict],
+    batch_size: int = 10_000,
+    upsert: bool = False,
+    searchable: bool = True,
+    process: bool = True,
+    check_typos: bool = True,
+) -> dict:
+    """
+    Write ``data`` to the SQLite database ``db`` in batches.
+
+    Nodes and exchanges are serialized and inserted ``batch_size`` nodes at a time with
+    ``executemany``, so ``data`` can be a generator and only one batch is held in memory.
+    All batches are written in one transaction, which is rolled back on errors, leaving
+    the existing data untouched.
+
+    If ``upsert`` is False, the existing nodes and exchanges of ``db`` are deleted first,
+    and the table indices are dropped during the write and rebuilt at the end. If
+    ``upsert`` is True, each node in ``data`` replaces the node with the same code (and
+    its exchanges), and other existing nodes are kept. The existing database is never
+    loaded into memory.
+
+    Parameters
+    ----------
+    db : SQLiteBackend
+        The database to write to. Must be registered and use the ``sqlite`` backend.
+    data : iterable of dict
+        Nodes with their ``exchanges``, all in database ``db.name``, with unique codes.
+    batch_size : int, optional
+        Number of nodes inserted per ``executemany`` call. Default is 10.000.
+    upsert : bool, optional
+        Update existing data instead of replacing it. Default is False.
+    searchable : bool, optional
+        Rebuild the search index after writing. Default is True.
+    process : bool, optional
+        Process the database after writing. Default is True.
+    check_typos : bool, optional
+        Check node and exchange types and keys for likely typos. Default is True.
+
+    Returns
+    -------
+    dict
+        Write statistics: ``nodes``, ``exchanges``, ``seconds``, ``rows_per_second``, and
+        ``peak_memory`` (peak resident set size of the process in bytes, ``None`` if not
+        available on this platform).
+
+    Raises
+    ------
+    ValueError
+        If ``db`` doesn't use the ``sqlite`` backend.
+    WrongDatabase
+        If a node is not in database ``db.name``.
+    NonuniqueCode
+        If two nodes have the same code.
+
+    """
+    if getattr(db, "backend", None) != "sqlite":
+        raise ValueError(
+            "Bulk writing requires the `sqlite` backend, not {}".format(
+                getattr(db, "backend", None)
+            )
+        )
+    if batch_size < 1:
+        raise ValueError("`batch_size` must be positive")
+
+    start = perf_counter()
+    num_nodes = num_exchanges = 0
+    codes, locations, geocollections = set(), set(), set()
+    connection = sqlite3_lci_db.db.connection()
+
+    with sqlite3_lci_db.db.atomic():
+        if not upsert:
+            db.delete(keep_params=True, warn=False, vacuum=False, signal=False)
+            for name in INDICES:
+                connection.execute('DROP INDEX IF EXISTS "{}"'.format(name))
+
+        iterator = iter(data)
+        while batch := list(itertools.islice(iterator, batch_size)):
+            activities, exchanges = [], []
+            for ds in batch:
+                node, rows = normalize(ds, db.name, check_typos)
+                activity = activity_row(node)
+                if activity[2] in codes:
+                    raise NonuniqueCode(
+                        "The following activity has a non-unique code: {} ({})".format(
+                            activity[2], activity[5]
+                        )
+                    )
+                codes.add(activity[2])
+                if ds.get("location"):
+                    locations.add(ds["location"])
+                    if activity[7] in labels.process_node_types:
+                        geocollections.add(get_geocollection(ds["location"]))
+                activities.append(activity)
+                exchanges.extend(exchange_row(exc) for exc in rows)
+
+            if upsert:
+                keys = [(db.name, activity[2]) for activity in activities]
+                connection.executemany(DELETE_EXCHANGES, keys)
+                connection.executemany(DELETE_ACTIVITY, keys)
+            connection.executemany(INSERT_ACTIVITY, activities)
+            connection.executemany(INSERT_EXCHANGE, exchanges)
+            num_nodes += len(activities)
+            num_exchanges += len(exchanges)
+
+        for sql in INDICES.values():
+            connection.execute(sql)
+
+    elapsed = perf_counter() - start
+    finish_write(
+        db,
+        locations,
+        geocollections,
+        searchable=searchable,
+        process=process,
+        keep_geocollections=upsert,
+    )
+
+    return {
+        "nodes": num_nodes,
+        "exchanges": num_exchanges,
+        "seconds": elapsed,
+        "rows_per_second": (num_nodes + num_exchanges) / elapsed if elapsed else 0.0,
+        "peak_memory": peak_rss(),
+    }
@@ -45,7 +45,13 @@ class SingleOutputEcospold1Importer(LCIImporter):
     format = "Ecospold1"
 
     def __init__(
-        self, filepath, db_name, use_mp=True, extractor=Ecospold1DataExtractor
+        self,
+        filepath,
+        db_name,
+        use_mp=True,
+        extractor=Ecospold1DataExtractor,
+        processes=None,
+        split_datasets=False,
     ):
         """
         Parameters
@@ -58,6 +64,12 @@ class SingleOutputEcospold1Importer(LCIImporter):
             Whether to use multiprocessing. Default is True.
         extractor: Type[Ecospold1DataExtractor], optional
             Data extractor to use. Default is Ecospold1DataExtractor.
+        processes: int, optional
+            Number of worker processes used during extraction. Uses all CPUs if not provided.
+        split_datasets: bool, optional
+            Split files into batches of datasets which are extracted in parallel, instead
+            of extracting each file as a whole. Use for large files with many datasets,
+            like SimaPro exports. Default is False.
         """
         self.strategies = [
             normalize_units,
@@ -80,9 +92,18 @@ class SingleOutputEcospold1Importer(LCIImporter):
             ),
         ]
         self.db_name = db_name
+        # Only passed on if given, as custom extractors may not support them
+        extractor_kwargs = {}
+        if processes is not None:
+            extractor_kwargs["processes"] = processes
+        if split_datasets:
+            extractor_kwargs["split_datasets"] = split_datasets
+
         start = time()
         try:
-            self.data = extractor.extract(filepath, db_name, use_mp=use_mp)
+            self.data = extractor.extract(
+                filepath, db_name, use_mp=use_mp, **extractor_kwargs
+            )
         except RuntimeError as e:
             raise MultiprocessingError(
                 "Multiprocessing error; re-run using `use_mp=False`"
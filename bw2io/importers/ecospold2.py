@@ -3,11 +3,11 @@ from pathlib import Path
 from time import time
 from typing import Any, Optional
 
-from bw2data import Database, config
+from bw2data import config
 from bw2data.logs import stdout_feedback_logger
 
 from ..errors import MultiprocessingError
-from ..extractors import Ecospold2DataExtractor
+from ..extractors import Ecospold2DataExtractor, ExtractionCache
 from ..strategies import (
     add_cpc_classification_from_single_reference_product,
     assign_single_product_as_activity,
@@ -61,6 +61,9 @@ class SingleOutputEcospold2Importer(LCIImporter):
         reparametrize_lognormals: bool = False,
         add_product_information: bool = True,
         separate_products: bool = False,
+        processes: Optional[int] = None,
+        chunksize: Optional[int] = None,
+        cache: Optional[ExtractionCache] = None,
     ):
         """
         Initializes the SingleOutputEcospold2Importer class instance.
@@ -75,6 +78,7 @@ class SingleOutputEcospold2Importer(LCIImporter):
             Name of biosphere database to link to. Uses `config.biosphere` if not provided.
         extractor : class
             Class for extracting data from the ecospold2 file, by default Ecospold2DataExtractor.
+            Use ``Ecospold2IterparseDataExtractor`` for lower memory use and faster parsing.
         use_mp : bool
             Flag to indicate whether to use multiprocessing, by default True.
         signal : object
@@ -88,6 +92,13 @@ class SingleOutputEcospold2Importer(LCIImporter):
             `product_information`.
         separate_products: bool
             Import processes and products as separate nodes in the supply chain graph.
+        processes: int | None
+            Number of worker processes used during extraction. Uses all CPUs if not provided.
+        chunksize: int | None
+            Number of files sent to each extraction worker at a time.
+        cache: ExtractionCache | None
+            Cache of previously extracted datasets. Unchanged files are read from the
+            cache instead of being parsed again.
         """
 
         self.dirpath = Path(dirpath)
@@ -123,7 +134,7 @@ class SingleOutputEcospold2Importer(LCIImporter):
             delete_none_synonyms,
             partial(
                 update_social_flows_in_older_consequential,
-                biosphere_db=Database(biosphere_database_name or config.biosphere),
+                biosphere_db=biosphere_database_name or config.biosphere,
             ),
         ]
 
@@ -135,9 +146,22 @@ class SingleOutputEcospold2Importer(LCIImporter):
         if separate_products:
             self.strategies.append(separate_processes_from_products)
 
+        # Only passed on if given, as custom extractors may not support them
+        extractor_kwargs = {
+            key: value
+            for key, value in (
+                ("processes", processes),
+                ("chunksize", chunksize),
+                ("cache", cache),
+            )
+            if value is not None
+        }
+
         start = time()
         try:
-            self.data = extractor.extract(self.dirpath, db_name, use_mp=use_mp)
+            self.data = extractor.extract(
+                self.dirpath, db_name, use_mp=use_mp, **extractor_kwargs
+            )
         except RuntimeError as e:
             raise MultiprocessingError(
                 "Multiprocessing error; re-run using `use_mp=False`"
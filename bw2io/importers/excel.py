@@ -1,6 +1,9 @@
+import bisect
 import functools
 import warnings
+from collections.abc import Sequence
 from time import time
+from typing import Dict, List, Optional
 
 from bw2data import Database, config
 
@@ -30,6 +33,88 @@ is_empty_line = lambda line: not line or not any(line)
 remove_empty = lambda dct: {k: v for k, v in dct.items() if (v or v == 0)}
 
 
+SECTION_LABELS = (
+    "activity",
+    "exchanges",
+    "parameters",
+    "database",
+    "database parameters",
+    "project parameters",
+)
+
+
+def index_sections(ws) -> Dict[str, List[int]]:
+    """
+    Find the rows which can start a section in a worksheet, in a single pass.
+
+    Returns a dictionary from each of ``SECTION_LABELS`` to the (ascending) indices
+    of the rows whose first cell is this label, ignoring case and whitespace. Callers
+    check the other conditions of their section headers on these rows.
+    """
+    sections = {label: [] for label in SECTION_LABELS}
+    for index, row in enumerate(ws):
+        if row and isinstance(row[0], str):
+            label = row[0].strip().lower()
+            if label in sections:
+                sections[label].append(index)
+    return sections
+
+
+class RowRange(Sequence):
+    """
+    Read-only view of the rows ``start:stop`` of a worksheet, without copying them.
+
+    Slices with step 1 are views too, and views compare equal to lists with the same
+    rows.
+    """
+
+    __slots__ = ("rows", "start", "stop")
+
+    def __init__(self, rows, start=0, stop=None):
+        if isinstance(rows, RowRange):
+            stop = rows.stop if stop is None else rows.start + stop
+            start, rows = rows.start + start, rows.rows
+        elif stop is None:
+            stop = len(rows)
+        self.rows, self.start, self.stop = rows, start, max(start, stop)
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return RowRange(self, start, stop)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Row index out of range")
+        return self.rows[self.start + index]
+
+    def __iter__(self):
+        return map(self.rows.__getitem__, range(self.start, self.stop))
+
+    def __eq__(self, other):
+        if isinstance(other, (list, RowRange)):
+            return len(self) == len(other) and all(x == y for x, y in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "RowRange({})".format(list(self))
+
+
+def _sheet_sections(data, sections):
+    """Iterate over ``(sheet name, rows view, section index)`` of each worksheet."""
+    for position, (sn, ws) in enumerate(data):
+        yield sn, RowRange(ws), (
+            sections[position] if sections is not None else index_sections(ws)
+        )
+
+
 def valid_first_cell(sheet, data):
     """Return boolean if first cell in worksheet is not ``skip``."""
     try:
@@ -114,18 +199,21 @@ class ExcelImporter(LCIImporter):
             )
         )
         if data and any(line for line in data):
-            self.db_name, self.metadata = self.get_database(data)
-            self.project_parameters = self.get_project_parameters(data)
-            self.database_parameters = self.get_database_parameters(data)
-            self.data = self.process_activities(data)
+            # Index section headers once per worksheet
+            sections = [index_sections(ws) for _, ws in data]
+            self.db_name, self.metadata = self.get_database(data, sections)
+            self.project_parameters = self.get_project_parameters(data, sections)
+            self.database_parameters = self.get_database_parameters(data, sections)
+            self.data = self.process_activities(data, sections)
         else:
             warnings.warn("No data in workbook found")
 
-    def get_database(self, data):
+    def get_database(self, data, sections: Optional[List[dict]] = None):
         results = []
         found = False
-        for sn, ws in data:
-            for index, line in enumerate(ws):
+        for sn, ws, headers in _sheet_sections(data, sections):
+            for index in headers["database"]:
+                line = ws[index]
                 if line and hasattr(line[0], "lower") and line[0].lower() == "database":
                     if found:
                         raise ValueError("Multiple `database` sections found")
@@ -137,10 +225,11 @@ class ExcelImporter(LCIImporter):
 
         return results[0]
 
-    def get_database_parameters(self, data):
+    def get_database_parameters(self, data, sections: Optional[List[dict]] = None):
         parameters, found = [], False
-        for sn, ws in data:
-            for index, line in enumerate(ws):
+        for sn, ws, headers in _sheet_sections(data, sections):
+            for index in headers["database parameters"]:
+                line = ws[index]
                 if (
                     line
                     and hasattr(line[0], "lower")
@@ -155,14 +244,17 @@ class ExcelImporter(LCIImporter):
         else:
             return parameters
 
-    def get_project_parameters(self, data):
+    def get_project_parameters(self, data, sections: Optional[List[dict]] = None):
         """Extract project parameters (variables and formulas).
 
         Project parameters are a section that starts with a line with the string "project parameters" (case-insensitive) in the first cell, and ends with a blank line. There can be multiple project parameter sections.
+
+        ``sections`` are the ``index_sections`` of each worksheet, if already known.
         """
         parameters, found = [], False
-        for sn, ws in data:
-            for index, line in enumerate(ws):
+        for sn, ws, headers in _sheet_sections(data, sections):
+            for index in headers["project parameters"]:
+                line = ws[index]
                 if (
                     line
                     and hasattr(line[0], "lower")
@@ -234,8 +326,13 @@ class ExcelImporter(LCIImporter):
 
         return name, data
 
-    def process_activities(self, data):
-        """Take list of `(sheet names, raw data)` and process it."""
+    def process_activities(self, data, sections: Optional[List[dict]] = None):
+        """Take list of `(sheet names, raw data)` and process it.
+
+        Each activity is passed to ``get_activity`` as a ``RowRange`` view of its rows,
+        up to the next activity, database or project parameters section, found with
+        ``index_sections`` (or ``sections``, if already known for each worksheet).
+        """
         new_activity = lambda x: (
             len(x)
             and isinstance(x[0], str)
@@ -256,14 +353,23 @@ class ExcelImporter(LCIImporter):
 
         results = []
 
-        for sn, ws in data:
+        for position, (sn, ws) in enumerate(data):
             ws = cut_worksheet(ws)
             if not any(line for line in ws):
                 warnings.warn("All data cutoff in worksheet {}".format(sn))
                 continue
-            for index, line in enumerate(ws):
-                if new_activity(line):
-                    results.append(self.get_activity(sn, ws[index:]))
+            # Cutting columns keeps the first cells, and so the section headers
+            headers = sections[position] if sections is not None else index_sections(ws)
+            ends = sorted(
+                headers["activity"]
+                + headers["database"]
+                + headers["project parameters"]
+            )
+            for index in headers["activity"]:
+                if new_activity(ws[index]):
+                    end = bisect.bisect_right(ends, index)
+                    end = ends[end] if end < len(ends) else len(ws)
+                    results.append(self.get_activity(sn, RowRange(ws, index, end)))
 
         return results
 
@@ -296,19 +402,12 @@ class ExcelImporter(LCIImporter):
             isinstance(x[0], str) and x[0].strip().lower() == "parameters"
         )
 
-        end = None
-        found_next_section = False
-        for end, row in enumerate(ws[1:]):
+        end = len(ws)
+        for index, row in enumerate(ws[1:], start=1):
             if activity_end(row):
-                found_next_section = True
+                end = index
                 break
 
-        # Started from row 1, not row 0
-        end += 1
-        # Worksheet ends; `end` is too small by 1
-        if not found_next_section:
-            end += 1
-
         ws = [row for row in ws[:end] if not is_empty_line(row)]
 
         param_index = exc_index = None
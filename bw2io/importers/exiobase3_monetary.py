@@ -1,9 +1,11 @@
-import itertools
+from typing import Optional
 
+import numpy as np
 from bw2data import Database, Method, config, databases, get_activity, methods
 from bw2data.backends.iotable import IOTableBackend
+from bw_processing import INDICES_DTYPE, UNCERTAINTY_DTYPE
 
-from ..extractors import Exiobase3MonetaryDataExtractor
+from ..extractors import Exiobase3MonetaryDataExtractor, MatrixCache
 from ..strategies.exiobase import (
     add_biosphere_ids,
     add_product_ids,
@@ -16,13 +18,69 @@ from ..strategies.exiobase import (
 from .base_lci import LCIImporter
 
 
+def _label_ids(labels, indices, mapping):
+    # Only labels which are used are looked up, like for the iterator input
+    ids = np.zeros(len(labels), dtype=np.int64)
+    for index in np.unique(indices).tolist():
+        ids[index] = mapping[labels[index]]
+    return ids
+
+
+def _processed_vector(rows, cols, amounts, flip):
+    """
+    Arrays for ``IOTableBackend.write_exchanges``.
+
+    The same as it builds from an iterator of ``{"row", "col", "amount", "flip",
+    "uncertainty_type": 0}`` dictionaries, except that ``amounts`` are kept as
+    64-bit floats.
+    """
+    order = np.lexsort((amounts, cols, rows))
+    indices = np.empty(len(order), dtype=INDICES_DTYPE)
+    indices["row"] = rows[order]
+    indices["col"] = cols[order]
+    distributions = np.zeros(len(order), dtype=UNCERTAINTY_DTYPE)
+    distributions["loc"] = amounts[order]
+    for field in ("scale", "shape", "minimum", "maximum"):
+        distributions[field] = np.nan
+    return {
+        "indices_array": indices,
+        "data_array": amounts[order],
+        "flip_array": flip[order],
+        "distributions_array": distributions,
+    }
+
+
 class Exiobase3MonetaryImporter(LCIImporter):
     format = "Exiobase 3"
 
-    def __init__(self, dirpath, db_name, ignore_small_balancing_corrections=True):
+    def __init__(
+        self,
+        dirpath,
+        db_name,
+        ignore_small_balancing_corrections=True,
+        cache: Optional[MatrixCache] = None,
+    ):
+        """
+        Initialize the importer.
+
+        Parameters
+        ----------
+        dirpath : str or Path
+            The EXIOBASE data directory, or its zip archive, which is read without
+            extracting it.
+        db_name : str
+            The name of the database to write.
+        ignore_small_balancing_corrections : bool, optional
+            Ignore values whose absolute value is below ``1e-15``. By default True.
+        cache : MatrixCache, optional
+            Cache of the parsed technosphere and biosphere matrices, so that importing
+            the same tables again, e.g. into another project, doesn't parse them again.
+        """
         self.strategies = []
         self.dirpath = dirpath
         self.db_name = db_name
+        self.ignore_small_balancing_corrections = ignore_small_balancing_corrections
+        self.cache = cache
         self.products = Exiobase3MonetaryDataExtractor.get_products(dirpath)
         self.techosphere_iterator = (
             Exiobase3MonetaryDataExtractor.get_technosphere_iterator(
@@ -137,31 +195,36 @@ class Exiobase3MonetaryImporter(LCIImporter):
             if "id" in o
         }
 
-        technosphere = itertools.chain(
-            (
-                {
-                    "row": product_mapping[x],
-                    "col": product_mapping[y],
-                    "amount": z,
-                    "flip": True,
-                    "uncertainty_type": 0,
-                }
-                for x, y, z in self.techosphere_iterator
+        inputs, outputs, matrix = (
+            Exiobase3MonetaryDataExtractor.get_technosphere_matrix(
+                self.dirpath, self.ignore_small_balancing_corrections, cache=self.cache
+            )
+        )
+        products = np.array(list(product_mapping.values()), dtype=np.int64)
+        technosphere = _processed_vector(
+            np.concatenate(
+                [_label_ids(inputs, matrix.row, product_mapping)[matrix.row], products]
+            ),
+            np.concatenate(
+                [_label_ids(outputs, matrix.col, product_mapping)[matrix.col], products]
             ),
-            (
-                {"row": x, "col": x, "amount": 1, "flip": False, "uncertainty_type": 0}
-                for x in product_mapping.values()
+            np.concatenate([matrix.data, np.ones(len(products))]),
+            np.concatenate(
+                [np.ones(matrix.nnz, dtype=bool), np.zeros(len(products), dtype=bool)]
             ),
         )
-        biosphere = (
-            {
-                "row": biosphere_mapping[x],
-                "col": product_mapping[y],
-                "amount": z * biosphere_scales[x],
-                "flip": False,
-                "uncertainty_type": 0,
-            }
-            for x, y, z in self.biosphere_iterator
+
+        flows, outputs, matrix = Exiobase3MonetaryDataExtractor.get_biosphere_matrix(
+            self.dirpath, self.ignore_small_balancing_corrections, cache=self.cache
+        )
+        scales = np.array(
+            [biosphere_scales.get(flow, 1) for flow in flows], dtype=np.float64
+        )
+        biosphere = _processed_vector(
+            _label_ids(flows, matrix.row, biosphere_mapping)[matrix.row],
+            _label_ids(outputs, matrix.col, product_mapping)[matrix.col],
+            matrix.data * scales[matrix.row],
+            np.zeros(matrix.nnz, dtype=bool),
         )
 
         dependents = [new_biosphere, main_biosphere]
@@ -0,0 +1,227 @@
+import hashlib
+import pickle
+from collections import defaultdict
+from time import perf_counter
+from typing import Iterable
+
+from bw2data.backends import sqlite3_lci_db
+from bw2data.configuration import labels
+from bw2data.utils import get_geocollection
+
+from ..errors import NonuniqueCode
+from .bulk_write import (
+    DELETE_ACTIVITY,
+    DELETE_EXCHANGES,
+    INSERT_ACTIVITY,
+    INSERT_EXCHANGE,
+    _dump,
+    _text,
+    activity_row,
+    exchange_row,
+    finish_write,
+    normalize,
+)
+
+UPDATE_ACTIVITY = (
+    'UPDATE "activitydataset" SET "data" = ?, "location" = ?, "name" = ?, '
+    '"product" = ?, "type" = ? WHERE "database" = ? AND "code" = ?'
+)
+DELETE_EXCHANGE = 'DELETE FROM "exchangedataset" WHERE "id" = ?'
+
+
+def content_hash(obj: dict) -> bytes:
+    """
+    Hash of the contents of a node or exchange dictionary which doesn't depend on the
+    order of its keys.
+
+    Nested dictionaries with a different key order hash differently, which only causes
+    unnecessary but harmless writes.
+
+    """
+    try:
+        items = sorted(obj.items())
+    except TypeError:
+        # Keys which can't be compared
+        items = sorted(obj.items(), key=lambda item: repr(item[0]))
+    return hashlib.blake2b(pickle.dumps(items, protocol=4), digest_size=16).digest()
+
+
+def stored_hashes(db_name: str):
+    """
+    Content hashes of the nodes and exchanges stored in database ``db_name``.
+
+    Returns ``({code: node hash}, {code: {exchange hash: [exchange ids]}})``. Rows are
+    read one at a time, so the database is never loaded into memory.
+
+    """
+    connection = sqlite3_lci_db.db.connection()
+    nodes = {
+        code: content_hash(pickle.loads(data))
+        for code, data in connection.execute(
+            'SELECT "code", "data" FROM "activitydataset" WHERE "database" = ?',
+            (db_name,),
+        )
+    }
+    exchanges = defaultdict(lambda: defaultdict(list))
+    for id_, code, data in connection.execute(
+        'SELECT "id", "output_code", "data" FROM "exchangedataset" '
+        'WHERE "output_database" = ?',
+        (db_name,),
+    ):
+        exchanges[code][content_hash(pickle.loads(data))].append(id_)
+    return nodes, exchanges
+
+
+def incremental_write(
+    db,
+    data: Iterable[dict],
+    dry_run: bool = False,
+    searchable: bool = True,
+    process: bool = True,
+    check_typos: bool = True,
+) -> dict:
+    """
+    Update the SQLite database ``db`` to contain ``data``, writing only what changed.
+
+    Nodes are matched by code, and compared with the stored nodes by a content hash of
+    the node (without exchanges) and of each of its exchanges. Only the added, removed
+    and changed nodes and exchanges are written, in one transaction. Changed nodes keep
+    their ids. Exchanges are compared as a multiset, so reordering exchanges is not a
+    change.
+
+    The result is the same as writing ``data`` with ``Database.write``, except for the
+    order of exchanges within changed nodes and the ids of unchanged nodes, which are
+    kept.
+
+    Parameters
+    ----------
+    db : SQLiteBackend
+        The database to update. Must be registered and use the ``sqlite`` backend.
+    data : iterable of dict
+        The complete new data, in the format of ``Database.write``.
+    dry_run : bool, optional
+        Only compute the change report, don't change the database. Default is False.
+    searchable : bool, optional
+        Rebuild the search index if anything changed. Default is True.
+    process : bool, optional
+        Process the database if anything changed. Default is True.
+    check_typos : bool, optional
+        Check node and exchange types and keys for likely typos. Default is True.
+
+    Returns
+    -------
+    dict
+        Change report with the codes of ``added``, ``removed`` and ``changed`` nodes
+        (nodes whose attributes or exchanges changed), the number of ``unchanged`` nodes,
+        the numbers of ``exchanges_added`` and ``exchanges_removed``, and ``seconds``
+        needed to compute and write the changes.
+
+    Raises
+    ------
+    ValueError
+        If ``db`` doesn't use the ``sqlite`` backend.
+    WrongDatabase
+        If a node is not in database ``db.name``.
+    NonuniqueCode
+        If two nodes have the same code.
+
+    """
+    if getattr(db, "backend", None) != "sqlite":
+        raise ValueError(
+            "Incremental writing requires the `sqlite` backend, not {}".format(
+                getattr(db, "backend", None)
+            )
+        )
+
+    start = perf_counter()
+    stored_nodes, stored_exchanges = stored_hashes(db.name)
+
+    added, changed, seen = [], [], set()
+    locations, geocollections = set(), set()
+    activities, updates, new_exchanges, deleted_exchanges = [], [], [], []
+
+    for ds in data:
+        node, exchanges = normalize(ds, db.name, check_typos)
+        code = node["code"]
+        if code in seen:
+            raise NonuniqueCode(
+                "The following activity has a non-unique code: {}".format(
+                    node.get("name")
+                )
+            )
+        seen.add(code)
+        if node.get("location"):
+            locations.add(node["location"])
+            if node.get("type") in labels.process_node_types:
+                geocollections.add(get_geocollection(node["location"]))
+
+        if code not in stored_nodes:
+            added.append(code)
+            activities.append(activity_row(node))
+            new_exchanges.extend(exchange_row(exc) for exc in exchanges)
+            continue
+
+        node_changed = content_hash(node) != stored_nodes[code]
+        if node_changed:
+            updates.append(
+                (
+                    _dump(node),
+                    _text(node.get("location")),
+                    _text(node.get("name")),
+                    _text(node.get("reference product")),
+                    _text(node.get("type", labels.process_node_default)),
+                    _text(node["database"]),
+                    _text(code),
+                )
+            )
+
+        existing = stored_exchanges.pop(code, {})
+        exchanges_changed = False
+        for exc in exchanges:
+            ids = existing.get(content_hash(exc))
+            if ids:
+                ids.pop()
+            else:
+                new_exchanges.append(exchange_row(exc))
+                exchanges_changed = True
+        for ids in existing.values():
+            if ids:
+                deleted_exchanges.extend((id_,) for id_ in ids)
+                exchanges_changed = True
+
+        if node_changed or exchanges_changed:
+            changed.append(code)
+
+    removed = [code for code in stored_nodes if code not in seen]
+    # Exchanges of removed nodes are deleted with the nodes
+    num_removed_exchanges = len(deleted_exchanges) + sum(
+        len(ids) for code in removed for ids in stored_exchanges.get(code, {}).values()
+    )
+
+    has_changes = added or changed or removed
+    if has_changes and not dry_run:
+        connection = sqlite3_lci_db.db.connection()
+        with sqlite3_lci_db.db.atomic():
+            keys = [(db.name, code) for code in removed]
+            connection.executemany(DELETE_EXCHANGES, keys)
+            connection.executemany(DELETE_ACTIVITY, keys)
+            connection.executemany(DELETE_EXCHANGE, deleted_exchanges)
+            connection.executemany(UPDATE_ACTIVITY, updates)
+            connection.executemany(INSERT_ACTIVITY, activities)
+            connection.executemany(INSERT_EXCHANGE, new_exchanges)
+        elapsed = perf_counter() - start
+        finish_write(
+            db, locations, geocollections, searchable=searchable, process=process
+        )
+    else:
+        elapsed = perf_counter() - start
+
+    return {
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+        "unchanged": len(seen) - len(added) - len(changed),
+        "exchanges_added": len(new_exchanges),
+        "exchanges_removed": num_removed_exchanges,
+        "seconds": elapsed,
+    }
@@ -1,6 +1,7 @@
-from bw2data import Database, databases
+from bw2data import databases
 
 from ..extractors.json_ld import JSONLDExtractor
+from ..lookup import database_nodes
 from ..strategies import (
     json_ld_lcia_add_method_metadata,
     json_ld_lcia_convert_to_list,
@@ -85,7 +86,7 @@ class JSONLDLCIAImporter(LCIAImporter):
         """
         assert database_name in databases
 
-        codes = {o["code"] for o in Database(database_name)}
+        codes = {o["code"] for o in database_nodes(database_name, ["code"])}
 
         for method in self.data:
             for cf in method["exchanges"]:
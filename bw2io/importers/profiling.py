@@ -0,0 +1,187 @@
+import cProfile
+import io
+import json
+import pstats
+import tracemalloc
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from ..columnar import ColumnarData
+from ..errors import StrategyError
+
+
+def count_nodes_and_exchanges(data) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Count nodes and exchanges in importer data.
+
+    Returns ``(None, None)`` if ``data`` can't be counted without consuming it, e.g.
+    for generators.
+
+    """
+    if isinstance(data, ColumnarData):
+        return len(data), len(data.exchanges)
+    if not isinstance(data, (list, tuple)):
+        return None, None
+    return len(data), sum(len(ds.get("exchanges", [])) for ds in data)
+
+
+class StrategyReport(list):
+    """
+    Timing and memory report for strategies applied by ``ImportBase.apply_strategies``.
+
+    A list of dictionaries, one per applied strategy, with the keys:
+
+    * ``strategy``: Name of the strategy function
+    * ``time``: Wall time in seconds
+    * ``memory``: Peak memory allocated during the strategy, in bytes, relative to the
+      memory in use when it started
+    * ``nodes_before``, ``nodes_after``: Number of nodes before and after the strategy
+    * ``exchanges_before``, ``exchanges_after``: Number of exchanges before and after
+      the strategy
+    * ``columnar``: Whether the vectorized version of the strategy was used
+    * ``error``: Error message if the strategy raised a ``StrategyError``, otherwise ``None``
+    * ``stats``: ``pstats.Stats`` for the strategy if profiled with ``cProfile``,
+      otherwise ``None``
+
+    Examples
+    --------
+    >>> importer.apply_strategies(profile=True)
+    >>> print(importer.strategy_report)
+    >>> importer.strategy_report.to_json("report.json")
+    >>> importer.strategy_report.to_dataframe().sort_values("time")
+
+    """
+
+    FIELDS = (
+        "strategy",
+        "time",
+        "memory",
+        "nodes_before",
+        "nodes_after",
+        "exchanges_before",
+        "exchanges_after",
+        "columnar",
+        "error",
+    )
+
+    @property
+    def total_time(self) -> float:
+        return sum(row["time"] for row in self)
+
+    def slowest(self, n: int = 5) -> List[dict]:
+        """Return the ``n`` slowest strategies."""
+        return sorted(self, key=lambda row: row["time"], reverse=True)[:n]
+
+    def to_dicts(self) -> List[dict]:
+        """Report as list of dictionaries without the ``cProfile`` statistics."""
+        return [{key: row[key] for key in self.FIELDS} for row in self]
+
+    def to_json(self, filepath: Optional[str] = None) -> str:
+        """Report as JSON string. Also written to ``filepath`` if given."""
+        text = json.dumps(self.to_dicts(), indent=2)
+        if filepath is not None:
+            with open(filepath, "w", encoding="utf-8") as f:
+                f.write(text)
+        return text
+
+    def to_dataframe(self):
+        """Report as ``pandas.DataFrame``. Requires ``pandas``."""
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError("`to_dataframe` requires `pandas` to be installed")
+        return pd.DataFrame(self.to_dicts(), columns=self.FIELDS)
+
+    def print_stats(self, strategy: str, limit: int = 20) -> str:
+        """Return the ``cProfile`` statistics of ``strategy``, sorted by cumulative time."""
+        for row in self:
+            if row["strategy"] == strategy and row["stats"] is not None:
+                stream = io.StringIO()
+                row["stats"].stream = stream
+                row["stats"].sort_stats("cumulative").print_stats(limit)
+                return stream.getvalue()
+        raise KeyError(f"No profiling statistics for strategy {strategy}")
+
+    def __str__(self) -> str:
+        def fmt(value):
+            return "?" if value is None else str(value)
+
+        lines = [
+            "{:<55} {:>9} {:>11} {:>15} {:>19}".format(
+                "Strategy", "Time (s)", "Memory (MB)", "Nodes", "Exchanges"
+            )
+        ]
+        for row in self:
+            lines.append(
+                "{:<55} {:>9.3f} {:>11.1f} {:>15} {:>19}".format(
+                    row["strategy"][:55],
+                    row["time"],
+                    row["memory"] / 1e6,
+                    "{} -> {}".format(
+                        fmt(row["nodes_before"]), fmt(row["nodes_after"])
+                    ),
+                    "{} -> {}".format(
+                        fmt(row["exchanges_before"]), fmt(row["exchanges_after"])
+                    ),
+                )
+            )
+        lines.append("{:<55} {:>9.3f}".format("Total", self.total_time))
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile_strategy(
+    name: str, get_data: Callable, use_cprofile: bool = False
+) -> Iterator[dict]:
+    """
+    Context manager measuring wall time, peak memory and node and exchange counts of
+    the strategy applied inside it.
+
+    ``get_data`` is called before and after the strategy to get the importer data. Memory
+    is traced with ``tracemalloc``, which slows down execution noticeably.
+
+    Yields the report row (see ``StrategyReport``), which is filled in on exit. If a
+    ``StrategyError`` is raised, its message is stored in ``error``.
+
+    """
+    nodes_before, exchanges_before = count_nodes_and_exchanges(get_data())
+    row = {
+        "strategy": name,
+        "time": 0.0,
+        "memory": 0,
+        "nodes_before": nodes_before,
+        "nodes_after": nodes_before,
+        "exchanges_before": exchanges_before,
+        "exchanges_after": exchanges_before,
+        "columnar": False,
+        "error": None,
+        "stats": None,
+    }
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    else:
+        tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    profiler = cProfile.Profile() if use_cprofile else None
+
+    start = perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield row
+    except StrategyError as err:
+        row["error"] = str(err)
+        raise
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            row["stats"] = pstats.Stats(profiler)
+        row["time"] = perf_counter() - start
+        row["memory"] = max(tracemalloc.get_traced_memory()[1] - baseline, 0)
+        if started_tracing:
+            tracemalloc.stop()
+        data = get_data()
+        row["nodes_after"], row["exchanges_after"] = count_nodes_and_exchanges(data)
+        row["columnar"] = isinstance(data, ColumnarData)
@@ -0,0 +1,133 @@
+from collections import OrderedDict
+from typing import Iterable, Iterator, List, Optional
+
+from bw2data import databases, projects
+from bw2data.backends import ActivityDataset, sqlite3_lci_db
+
+# Node attributes which are also columns of the node table
+COLUMNS = {
+    "id": ActivityDataset.id,
+    "code": ActivityDataset.code,
+    "database": ActivityDataset.database,
+    "name": ActivityDataset.name,
+    "location": ActivityDataset.location,
+    "reference product": ActivityDataset.product,
+    "type": ActivityDataset.type,
+}
+
+# Maximum number of cached ``database_nodes`` results; least recently used are dropped
+CACHE_SIZE = 16
+
+_cache = OrderedDict()
+
+
+def clear_cache() -> None:
+    """Empty the cache of ``database_nodes``."""
+    _cache.clear()
+
+
+def _database_state(database_name: str) -> tuple:
+    """``modified`` timestamp, number of nodes and largest node id of a database"""
+    count, max_id = (
+        sqlite3_lci_db.db.connection()
+        .execute(
+            'SELECT COUNT(*), MAX("id") FROM "activitydataset" WHERE "database" = ?',
+            (database_name,),
+        )
+        .fetchone()
+    )
+    return databases[database_name].get("modified"), count, max_id
+
+
+def database_nodes(database_name: str, fields: Iterable[str] = ("code",)) -> List[dict]:
+    """
+    Get the given ``fields`` of all nodes in a database, as a list of dictionaries.
+
+    Reads only the needed columns of the node table in one query, instead of
+    creating an ``Activity`` proxy for each node like iterating over
+    ``Database(database_name)`` does. The serialized node data is only loaded if
+    some ``fields`` aren't node table columns (``id``, ``code``, ``database``,
+    ``name``, ``location``, ``reference product``, ``type``). ``key`` gives the
+    ``(database, code)`` tuple.
+
+    Results are cached until the ``modified`` timestamp, the number of nodes or the
+    largest node id of the database change, i.e. on every write, change or deletion
+    of nodes. Only the ``CACHE_SIZE`` most recently used results are kept; use
+    ``clear_cache`` to empty the cache. The returned dictionaries are shared between
+    callers and must not be modified.
+
+    Parameters
+    ----------
+    database_name : str
+        The name of the database. Returns an empty list if it doesn't exist.
+    fields : iterable of str, optional
+        The node attributes to get. Attributes which a node doesn't have (or which
+        are ``None``) are left out of its dictionary. Default is ``("code",)``.
+
+    Returns
+    -------
+    list[dict]
+        One dictionary per node, ordered by node id.
+
+    Examples
+    --------
+    >>> database_nodes("biosphere3", ["name", "categories", "key"])[0]
+    {'name': 'Carbon dioxide, fossil', 'categories': ('air',), 'key': ('biosphere3', '...')}
+    """
+    fields = tuple(fields)
+    if database_name not in databases:
+        return []
+    state = _database_state(database_name)
+    cache_key = (str(projects.dir), database_name, fields)
+    if state[0] is not None and _cache.get(cache_key, (None,))[0] == state:
+        _cache.move_to_end(cache_key)
+        return _cache[cache_key][1]
+
+    columns = ["database", "code"] + [
+        field
+        for field in fields
+        if field in COLUMNS and field not in ("database", "code")
+    ]
+    data_fields = [field for field in fields if field not in COLUMNS and field != "key"]
+    query = ActivityDataset.select(
+        *[COLUMNS[column] for column in columns],
+        *([ActivityDataset.data] if data_fields else []),
+    ).where(ActivityDataset.database == database_name)
+
+    nodes = []
+    for row in query.order_by(ActivityDataset.id).tuples():
+        values = dict(zip(columns, row))
+        values["key"] = (values["database"], values["code"])
+        if data_fields:
+            data = row[-1]
+            values.update(
+                {field: data[field] for field in data_fields if field in data}
+            )
+        nodes.append(
+            {field: values[field] for field in fields if values.get(field) is not None}
+        )
+
+    _cache[cache_key] = (state, nodes)
+    _cache.move_to_end(cache_key)
+    while len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return nodes
+
+
+def iter_database_nodes(
+    database_name: str,
+    fields: Iterable[str] = ("code",),
+    kinds: Optional[Iterable[str]] = None,
+) -> Iterator[dict]:
+    """
+    Iterate over ``database_nodes``, optionally only nodes whose ``type`` is in ``kinds``.
+
+    The database is only read when iteration starts, so this can be passed to
+    strategies which are defined before the database is written.
+    """
+    fields = tuple(fields)
+    if kinds is not None and "type" not in fields:
+        fields += ("type",)
+    for node in database_nodes(database_name, fields):
+        if kinds is None or node.get("type") in kinds:
+            yield node
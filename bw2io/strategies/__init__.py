@@ -27,10 +27,12 @@ __all__ = [
     "ensure_categories_are_tuples",
     "es1_allocate_multioutput",
     "es2_assign_only_product_with_amount_as_reference_product",
+    "evaluate_parameters",
     "fix_ecoinvent_flows_pre35",
     "fix_localized_water_flows",
     "fix_unreasonably_high_lognormal_uncertainties",
     "fix_zero_allocation_products",
+    "get_migration_index",
     "json_ld_add_activity_unit",
     "json_ld_add_products_as_activities",
     "json_ld_allocate_datasets",
@@ -53,6 +55,7 @@ __all__ = [
     "link_iterable_by_fields",
     "link_technosphere_based_on_name_unit_location",
     "link_technosphere_by_activity_hash",
+    "LinkIndex",
     "match_against_only_available_in_given_context_tree",
     "match_against_top_level_context",
     "match_internal_simapro_simapro_with_unit_conversion",
@@ -66,6 +69,7 @@ __all__ = [
     "normalize_simapro_labels_to_brightway_standard",
     "normalize_units",
     "override_process_name_using_single_functional_exchange",
+    "per_dataset",
     "remove_biosphere_location_prefix_if_flow_in_same_location",
     "remove_random_exchanges",
     "remove_uncertainty_from_negative_loss_exchanges",
@@ -134,6 +138,7 @@ from .ecospold2 import (
     update_social_flows_in_older_consequential,
 )
 from .generic import (
+    LinkIndex,
     add_database_name,
     assign_only_product_as_production,
     convert_activity_parameters_to_list,
@@ -178,7 +183,9 @@ from .lcia import (
     set_biosphere_type,
 )
 from .locations import update_ecoinvent_locations
-from .migrations import migrate_datasets, migrate_exchanges
+from .migrations import get_migration_index, migrate_datasets, migrate_exchanges
+from .parallel import per_dataset
+from .parameterization import evaluate_parameters
 from .products import create_products_as_new_nodes, separate_processes_from_products
 from .sentier import match_internal_simapro_simapro_with_unit_conversion
 from .simapro import (
@@ -1,6 +1,8 @@
 from .migrations import migrate_datasets, migrate_exchanges
+from .parallel import per_dataset
 
 
+@per_dataset
 def drop_unspecified_subcategories(db):
     """Drop subcategories if they are in the following:
     * ``unspecified``
@@ -98,6 +100,7 @@ def normalize_biosphere_categories(db, lcia=False):
     return db
 
 
+@per_dataset
 def strip_biosphere_exc_locations(db):
     """
     Remove locations from biosphere exchanges in the given database, as biosphere exchanges are not geographically specific.
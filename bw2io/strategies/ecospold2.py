@@ -1,12 +1,14 @@
 import math
 import warnings
 
-from bw2data import Database
 from bw2data.logs import close_log, get_io_logger
 from stats_arrays import LognormalUncertainty, UndefinedUncertainty
 
+from ..lookup import database_nodes
 from ..utils import es2_activity_hash, format_for_logging
+from .generic import drop_exchanges
 from .migrations import migrate_exchanges, migrations
+from .parallel import per_dataset
 
 
 def link_biosphere_by_flow_uuid(db: list[dict], biosphere: str = "biosphere3"):
@@ -64,7 +66,7 @@ def link_biosphere_by_flow_uuid(db: list[dict], biosphere: str = "biosphere3"):
       'id': '6f10b95c02be63e925a6f2ef6b937a6d',
       'type': 'process'}]
     """
-    biosphere_codes = {x["code"] for x in Database(biosphere)}
+    biosphere_codes = {x["code"] for x in database_nodes(biosphere, ["code"])}
 
     for ds in db:
         for exc in ds.get("exchanges", []):
@@ -77,6 +79,7 @@ def link_biosphere_by_flow_uuid(db: list[dict], biosphere: str = "biosphere3"):
     return db
 
 
+@per_dataset
 def remove_zero_amount_coproducts(db):
     """
     Iterate through datasets in the given database. Filter out coproducts with
@@ -128,14 +131,13 @@ def remove_zero_amount_coproducts(db):
     ]
     """
     for ds in db:
-        ds["exchanges"] = [
-            exc
-            for exc in ds["exchanges"]
-            if (exc["type"] != "production" or exc["amount"])
-        ]
+        drop_exchanges(
+            ds, lambda exc: exc["type"] == "production" and not exc["amount"]
+        )
     return db
 
 
+@per_dataset
 def remove_zero_amount_inputs_with_no_activity(db):
     """
     Filter out technosphere exchanges with zero amounts and no uncertainty from
@@ -188,18 +190,16 @@ def remove_zero_amount_inputs_with_no_activity(db):
     ]
     """
     for ds in db:
-        ds["exchanges"] = [
-            exc
-            for exc in ds["exchanges"]
-            if not (
-                exc["uncertainty type"] == UndefinedUncertainty.id
-                and exc["amount"] == 0
-                and exc["type"] == "technosphere"
-            )
-        ]
+        drop_exchanges(
+            ds,
+            lambda exc: exc["uncertainty type"] == UndefinedUncertainty.id
+            and exc["amount"] == 0
+            and exc["type"] == "technosphere",
+        )
     return db
 
 
+@per_dataset
 def remove_unnamed_parameters(db):
     """
     Iterate through datasets in the given database and remove unnamed parameters
@@ -255,6 +255,7 @@ def remove_unnamed_parameters(db):
     return db
 
 
+@per_dataset
 def es2_assign_only_product_with_amount_as_reference_product(db):
     """
     If a multioutput process has one product with a non-zero amount, this
@@ -329,6 +330,7 @@ def es2_assign_only_product_with_amount_as_reference_product(db):
     return db
 
 
+@per_dataset
 def assign_single_product_as_activity(db):
     """
     Assign the activity of a dataset to the 'activity' field of the production
@@ -387,6 +389,7 @@ def assign_single_product_as_activity(db):
     return db
 
 
+@per_dataset
 def create_composite_code(db):
     """
     Generate a composite code for each dataset in the given database using the
@@ -571,26 +574,18 @@ def delete_exchanges_missing_activity(db):
     log, logfile = get_io_logger("Ecospold2-import-error")
     count = 0
     for ds in db:
-        exchanges = ds.get("exchanges", [])
-        if not exchanges:
-            continue
-        skip = []
-        for exc in exchanges:
-            if exc.get("input"):
-                continue
-            if not exc.get("activity") and exc["type"] in {
-                "technosphere",
-                "production",
-                "substitution",
-            }:
-                log.critical(
-                    "Purging unlinked exchange:\nFilename: {}\n{}".format(
-                        ds["filename"], format_for_logging(exc)
-                    )
+        for exc in drop_exchanges(
+            ds,
+            lambda exc: not exc.get("input")
+            and not exc.get("activity")
+            and exc["type"] in {"technosphere", "production", "substitution"},
+        ):
+            log.critical(
+                "Purging unlinked exchange:\nFilename: {}\n{}".format(
+                    ds["filename"], format_for_logging(exc)
                 )
-                count += 1
-                skip.append(exc)
-        ds["exchanges"] = [exc for exc in exchanges if exc not in skip]
+            )
+            count += 1
     close_log(log)
     if count:
         print(
@@ -665,21 +660,16 @@ def delete_ghost_exchanges(db):
     log, logfile = get_io_logger("Ecospold2-import-error")
     count = 0
     for ds in db:
-        exchanges = ds.get("exchanges", [])
-        if not exchanges:
-            continue
-        skip = []
-        for exc in exchanges:
-            if exc.get("input") or exc.get("type") != "technosphere":
-                continue
+        for exc in drop_exchanges(
+            ds,
+            lambda exc: not exc.get("input") and exc.get("type") == "technosphere",
+        ):
             log.critical(
                 "Purging unlinked exchange:\nFilename: {}\n{}".format(
                     ds["filename"], format_for_logging(exc)
                 )
             )
             count += 1
-            skip.append(exc)
-        ds["exchanges"] = [exc for exc in exchanges if exc not in skip]
     close_log(log)
     if count:
         print(
@@ -691,6 +681,7 @@ def delete_ghost_exchanges(db):
     return db
 
 
+@per_dataset
 def remove_uncertainty_from_negative_loss_exchanges(db):
     """
     Address cases where basic uncertainty and pedigree matrix are applied blindly,
@@ -786,6 +777,7 @@ def remove_uncertainty_from_negative_loss_exchanges(db):
     return db
 
 
+@per_dataset
 def set_lognormal_loc_value(db):
     """
     Ensure loc value is correct for lognormal uncertainty distributions.
@@ -857,6 +849,7 @@ def set_lognormal_loc_value(db):
     return db
 
 
+@per_dataset
 def reparametrize_lognormal_to_agree_with_static_amount(db):
     """
     For lognormal distributions, choose the mean of the underlying normal distribution
@@ -930,6 +923,7 @@ def reparametrize_lognormal_to_agree_with_static_amount(db):
     return db
 
 
+@per_dataset
 def fix_unreasonably_high_lognormal_uncertainties(db, cutoff=2.5, replacement=0.25):
     """
     Replace unreasonably high lognormal uncertainties in the given database
@@ -1072,6 +1066,7 @@ def fix_ecoinvent_flows_pre35(db):
         return db
 
 
+@per_dataset
 def drop_temporary_outdated_biosphere_flows(db):
     """
     Removes exchanges with specific temporary biosphere flow names from the
@@ -1146,14 +1141,13 @@ def drop_temporary_outdated_biosphere_flows(db):
         "Indeno(1,2,3-c,d)pyrene_temp",
     }
     for ds in db:
-        ds["exchanges"] = [
-            obj
-            for obj in ds["exchanges"]
-            if not (obj.get("name") in names and obj.get("type") == "biosphere")
-        ]
+        drop_exchanges(
+            ds, lambda obj: obj.get("name") in names and obj.get("type") == "biosphere"
+        )
     return db
 
 
+@per_dataset
 def add_cpc_classification_from_single_reference_product(db):
     """
     Add CPC classification to a dataset's classifications if it has only one
@@ -1231,6 +1225,7 @@ def add_cpc_classification_from_single_reference_product(db):
     return db
 
 
+@per_dataset
 def delete_none_synonyms(db):
     """
     Remove `None` values from the 'synonyms' list of each dataset.
@@ -1339,9 +1334,16 @@ def update_social_flows_in_older_consequential(db, biosphere_db):
     cache = {}
 
     def get_cache(cache, biosphere_db):
-        for flow in biosphere_db:
-            if flow["name"] in FLOWS:
-                cache[flow["name"]] = flow.key
+        if isinstance(biosphere_db, str):
+            flows = (
+                (flow["name"], flow["key"])
+                for flow in database_nodes(biosphere_db, ["name", "key"])
+            )
+        else:
+            flows = ((flow["name"], flow.key) for flow in biosphere_db)
+        for name, key in flows:
+            if name in FLOWS:
+                cache[name] = key
 
     for ds in db:
         for exc in ds["exchanges"]:
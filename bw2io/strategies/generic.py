@@ -3,14 +3,16 @@ import pprint
 import warnings
 from collections import defaultdict
 from copy import deepcopy
-from typing import Iterable, List, Optional, Union
+from typing import Callable, Iterable, List, Optional, Union
 
 import numpy as np
-from bw2data import Database, databases, labels
+from bw2data import databases, labels
 
 from ..errors import StrategyError
+from ..lookup import database_nodes
 from ..units import normalize_units as normalize_units_function
 from ..utils import DEFAULT_FIELDS, activity_hash
+from .parallel import per_dataset
 
 
 def format_nonunique_key_error(obj: dict, fields: List[str], others: List[dict]) -> str:
@@ -71,6 +73,123 @@ def format_nonunique_key_error(obj: dict, fields: List[str], others: List[dict])
     )
 
 
+class LinkIndex:
+    """
+    Reusable lookup of target nodes by a tuple of normalized field values.
+
+    Matches objects in the same way as comparing ``activity_hash`` values, but
+    without building and hashing a string for each object (and without false
+    matches from field values running together). Normalized keys are memoized
+    by their raw field values, so objects with the same values (and repeated
+    lookups of the same objects) are only normalized once.
+
+    An index can be built once and passed to several linking or migration
+    strategies using the ``index`` argument.
+
+    Parameters
+    ----------
+    fields : list[str], optional
+        Fields used for matching. Defaults to ``DEFAULT_FIELDS``.
+    case_insensitive : bool, optional
+        Compare field values case-insensitively. Default is ``True``.
+
+    Examples
+    --------
+    >>> index = LinkIndex.from_nodes(Database("ecoinvent"), fields=["name", "location"])
+    >>> link_iterable_by_fields(db, index=index, edge_kinds=["technosphere"])
+
+    """
+
+    def __init__(
+        self, fields: Optional[List[str]] = None, case_insensitive: bool = True
+    ):
+        self.fields = tuple(fields or DEFAULT_FIELDS)
+        self.case_insensitive = case_insensitive
+        self.candidates = {}
+        self.duplicates = {}
+        self._keys = {}
+
+    @classmethod
+    def from_nodes(
+        cls,
+        nodes: Iterable[dict],
+        fields: Optional[List[str]] = None,
+        case_insensitive: bool = True,
+    ) -> "LinkIndex":
+        """Index ``nodes`` by ``fields``, with their ``(database, code)`` as values.
+
+        Raises ``StrategyError`` if a node is missing ``database`` or ``code``."""
+        index = cls(fields, case_insensitive)
+        try:
+            # Nodes can be a generator, so a bit convoluted
+            for ds in nodes:
+                index.add(ds, (ds["database"], ds["code"]))
+        except KeyError:
+            raise StrategyError(
+                "Not all datasets in database to be linked have "
+                "``database`` or ``code`` attributes"
+            )
+        return index
+
+    @classmethod
+    def from_migration(cls, migration_data: dict) -> "LinkIndex":
+        """Index the changes of a loaded migration by their lookup fields.
+
+        Later entries replace earlier entries with the same lookup values."""
+        index = cls(migration_data["fields"])
+        for lookup, changes in migration_data["data"]:
+            index.candidates[index.key(dict(zip(index.fields, lookup)))] = changes
+        return index
+
+    def _normalize(self, values: tuple) -> tuple:
+        lower = str.lower if self.case_insensitive else lambda x: x
+        return tuple(
+            (
+                lower("".join(value or []))
+                if isinstance(value, (list, tuple))
+                else lower(value or "")
+            )
+            for value in values
+        )
+
+    def key(self, obj: dict) -> tuple:
+        """Normalized field values of ``obj``."""
+        values = tuple([obj.get(field) for field in self.fields])
+        try:
+            return self._keys[values]
+        except KeyError:
+            key = self._keys[values] = self._normalize(values)
+            return key
+        except TypeError:
+            # Unhashable values, e.g. categories as a list
+            return self._normalize(values)
+
+    def add(self, obj: dict, value) -> None:
+        """Add ``obj`` with lookup result ``value``.
+
+        If a different object with the same key was already added, the key is
+        marked as a duplicate."""
+        key = self.key(obj)
+        if key in self.candidates:
+            self.duplicates.setdefault(key, []).append(obj)
+        else:
+            self.candidates[key] = value
+
+    def get(self, obj: dict, default=None):
+        """Look up ``obj``; returns ``default`` if there is no match.
+
+        Raises ``StrategyError`` if ``obj`` matches more than one indexed object."""
+        key = self.key(obj)
+        if key in self.duplicates:
+            raise StrategyError(
+                format_nonunique_key_error(obj, self.fields, self.duplicates[key])
+            )
+        return self.candidates.get(key, default)
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+
 def link_iterable_by_fields(
     unlinked: Iterable[dict],
     other: Optional[Iterable[dict]] = None,
@@ -81,6 +200,7 @@ def link_iterable_by_fields(
     other_node_kinds: Optional[List[str]] = None,
     internal: bool = False,
     relink: bool = False,
+    index: Optional[LinkIndex] = None,
 ) -> List[dict]:
     """
     Link objects in ``unlinked`` to objects in ``other`` using fields ``fields``.
@@ -110,6 +230,9 @@ def link_iterable_by_fields(
     relink : bool, optional
         If `True`, link to objects that already have an `input`. Otherwise, skip objects that have
         already been linked.
+    index : LinkIndex, optional
+        Prebuilt index of the objects to link to. If given, ``other``, ``internal``, and
+        ``other_node_kinds`` are ignored, and ``fields`` defaults to ``index.fields``.
 
     Returns
     -------
@@ -124,7 +247,7 @@ def link_iterable_by_fields(
 
     See Also
     --------
-    activity_hash : Generate a unique hash key for a dataset.
+    LinkIndex : Lookup of objects to link to by normalized field values.
     format_nonunique_key_error : Generate an error message for datasets that can't be uniquely
     linked to the target database.
 
@@ -191,36 +314,24 @@ def link_iterable_by_fields(
     else:
         other_filter_func = lambda x: True
 
-    if internal:
-        other = unlinked
-
-    duplicates, candidates = {}, {}
-    try:
-        # Other can be a generator, so a bit convoluted
-        for ds in filter(other_filter_func, other):
-            key = activity_hash(ds, fields)
-            if key in candidates:
-                duplicates.setdefault(key, []).append(ds)
-            else:
-                candidates[key] = (ds["database"], ds["code"])
-    except KeyError:
-        raise StrategyError(
-            "Not all datasets in database to be linked have "
-            "``database`` or ``code`` attributes"
+    if index is None:
+        if internal:
+            other = unlinked
+        index = LinkIndex.from_nodes(filter(other_filter_func, other), fields)
+    elif fields and tuple(fields) != index.fields:
+        raise ValueError(
+            f"Given `fields` {fields} don't match `index` fields {index.fields}"
         )
 
     for container in filter(this_filter_func, unlinked):
         for obj in filter(edge_filter_func, container.get("exchanges", [])):
-            key = activity_hash(obj, fields)
-            if key in duplicates:
-                raise StrategyError(
-                    format_nonunique_key_error(obj, fields, duplicates[key])
-                )
-            elif key in candidates:
-                obj["input"] = candidates[key]
+            link = index.get(obj)
+            if link is not None:
+                obj["input"] = link
     return unlinked
 
 
+@per_dataset
 def assign_only_product_as_production(db: Iterable[dict]) -> List[dict]:
     """
     Assign only product as reference product.
@@ -278,7 +389,10 @@ def assign_only_product_as_production(db: Iterable[dict]) -> List[dict]:
 
 
 def link_technosphere_by_activity_hash(
-    db, external_db_name: Optional[str] = None, fields: Optional[List[str]] = None
+    db,
+    external_db_name: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    index: Optional[LinkIndex] = None,
 ):
     """
     Link technosphere exchanges using the `activity_hash` function.
@@ -294,6 +408,9 @@ def link_technosphere_by_activity_hash(
         The name of an external database to link against. Default is None.
     fields : list of str, optional
         The fields to use for linking exchanges. If None, all fields will be used.
+    index : LinkIndex, optional
+        Prebuilt index of the processes to link to. If given, ``external_db_name`` is
+        not used.
 
     Returns
     -------
@@ -321,6 +438,10 @@ def link_technosphere_by_activity_hash(
     ... )
     """
     TECHNOSPHERE_TYPES = {"technosphere", "substitution", "production"}
+    if index is not None:
+        return link_iterable_by_fields(
+            db, index=index, edge_kinds=TECHNOSPHERE_TYPES, fields=fields
+        )
     if external_db_name is not None:
         if external_db_name not in databases:
             raise StrategyError(
@@ -328,7 +449,10 @@ def link_technosphere_by_activity_hash(
             )
         other = (
             obj
-            for obj in Database(external_db_name)
+            for obj in database_nodes(
+                external_db_name,
+                list(fields or DEFAULT_FIELDS) + ["database", "code", "type"],
+            )
             if obj.get("type", "process") == "process"
         )
         internal = False
@@ -371,6 +495,7 @@ def set_code_by_activity_hash(db: List[dict], overwrite: bool = False) -> List[d
     return db
 
 
+@per_dataset
 def tupleize_categories(db: List[dict]) -> List[dict]:
     """
     Convert the "categories" fields in a given database and its exchanges to tuples.
@@ -400,6 +525,42 @@ def tupleize_categories(db: List[dict]) -> List[dict]:
     return db
 
 
+def drop_exchanges(ds: dict, predicate: Callable[[dict], bool]) -> List[dict]:
+    """
+    Remove the exchanges of a dataset for which ``predicate`` is true.
+
+    Each exchange is tested once, and the remaining exchanges are kept in a single
+    pass. Exchanges are never compared with each other, so this is linear in the
+    number of exchanges, unlike ``[exc for exc in exchanges if exc not in skip]``.
+
+    Parameters
+    ----------
+    ds : dict
+        The dataset. Nothing is changed if it has no ``exchanges``.
+    predicate : callable
+        Function called with each exchange, returning ``True`` if it should be removed.
+
+    Returns
+    -------
+    list[dict]
+        The removed exchanges, in their original order.
+
+    Examples
+    --------
+    >>> ds = {"exchanges": [{"amount": 0}, {"amount": 1}]}
+    >>> drop_exchanges(ds, lambda exc: not exc["amount"])
+    [{'amount': 0}]
+    >>> ds
+    {'exchanges': [{'amount': 1}]}
+    """
+    kept, dropped = [], []
+    for exc in ds.get("exchanges", []):
+        (dropped if predicate(exc) else kept).append(exc)
+    if dropped:
+        ds["exchanges"] = kept
+    return dropped
+
+
 def drop_unlinked(db: List[dict]) -> List[dict]:
     """
     Remove all exchanges in a given database that don't have inputs.
@@ -443,6 +604,7 @@ def drop_unlinked(db: List[dict]) -> List[dict]:
     return db
 
 
+@per_dataset
 def normalize_units(db: List[dict]) -> List[dict]:
     """
     Normalize units in datasets and their exchanges.
@@ -528,6 +690,7 @@ def add_database_name(db: List[dict], name: str) -> List[dict]:
     return db
 
 
+@per_dataset
 def convert_uncertainty_types_to_integers(db: List[dict]) -> List[dict]:
     """
     Convert uncertainty types in a list of datasets to integers.
@@ -562,6 +725,7 @@ def convert_uncertainty_types_to_integers(db: List[dict]) -> List[dict]:
     return db
 
 
+@per_dataset
 def drop_falsey_uncertainty_fields_but_keep_zeros(db: List[dict]) -> List[dict]:
     """
     Drop uncertainty fields that are falsey (e.g. '', None, False) but keep zero and NaN.
@@ -612,6 +776,7 @@ def drop_falsey_uncertainty_fields_but_keep_zeros(db: List[dict]) -> List[dict]:
     return db
 
 
+@per_dataset
 def convert_activity_parameters_to_list(data: List[dict]) -> List[dict]:
     """ "
     Convert activity parameters from a dictionary to a list of dictionaries.
@@ -703,22 +868,20 @@ def split_exchanges(
         )
 
     for ds in data:
-        to_delete, to_add = [], []
-        for index, exchange in enumerate(ds.get("exchanges", [])):
-            if exchange.get("input"):
-                continue
-            if all(exchange.get(key) == value for key, value in filter_params.items()):
-                to_delete.append(index)
-                for factor, obj in zip(allocation_factors, changed_attributes):
-                    exc = deepcopy(exchange)
-                    exc["amount"] = exc["amount"] * factor / total
-                    exc["uncertainty_type"] = 0
-                    for key, value in obj.items():
-                        exc[key] = value
-                    to_add.append(exc)
-        if to_delete:
-            for index in to_delete[::-1]:
-                del ds["exchanges"][index]
+        to_add = []
+        for exchange in drop_exchanges(
+            ds,
+            lambda exc: not exc.get("input")
+            and all(exc.get(key) == value for key, value in filter_params.items()),
+        ):
+            for factor, obj in zip(allocation_factors, changed_attributes):
+                exc = deepcopy(exchange)
+                exc["amount"] = exc["amount"] * factor / total
+                exc["uncertainty_type"] = 0
+                for key, value in obj.items():
+                    exc[key] = value
+                to_add.append(exc)
+        if to_add:
             ds["exchanges"].extend(to_add)
     return data
 
@@ -756,8 +919,8 @@ def match_against_top_level_context(
     mapping = {
         tuple(
             [obj.get(field) for field in ffields] + [tuple(obj.get("categories", []))]
-        ): obj.key
-        for obj in Database(other_db_name)
+        ): obj["key"]
+        for obj in database_nodes(other_db_name, ffields + ["categories", "key"])
     }
 
     for ds in data:
@@ -813,12 +976,12 @@ def match_against_only_available_in_given_context_tree(
     ffields = [field for field in fields if field != "categories"]
 
     mapping_draft = defaultdict(list)
-    for obj in Database(other_db_name):
+    for obj in database_nodes(other_db_name, ffields + ["categories", "key"]):
         if not obj.get("categories"):
             continue
         mapping_draft[
             tuple([obj.get(field) for field in ffields] + [obj["categories"][0]])
-        ].append(obj.key)
+        ].append(obj["key"])
 
     mapping = {key: value[0] for key, value in mapping_draft.items() if len(value) == 1}
 
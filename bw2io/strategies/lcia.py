@@ -1,8 +1,7 @@
 import collections
 import copy
 
-from bw2data import Database
-
+from ..lookup import database_nodes
 from ..utils import activity_hash
 
 
@@ -288,7 +287,9 @@ def match_subcategories(data, biosphere_db_name, remove=True):
         return [add_amount(copy.deepcopy(elem), obj["amount"]) for elem in new_objs]
 
     mapping = collections.defaultdict(list)
-    for flow in Database(biosphere_db_name):
+    for flow in database_nodes(
+        biosphere_db_name, ["type", "categories", "name", "unit", "database", "key"]
+    ):
         # Try to filter our industrial activities and their flows
         if not flow.get("type") in ("emission", "natural resource"):
             continue
@@ -297,7 +298,7 @@ def match_subcategories(data, biosphere_db_name, remove=True):
                 {
                     "categories": flow["categories"],
                     "database": flow["database"],
-                    "input": flow.key,
+                    "input": flow["key"],
                     "name": flow["name"],
                     "unit": flow["unit"],
                 }
@@ -1,3 +1,5 @@
+from .parallel import per_dataset
+
 GEO_UPDATE = {
     "Al producing Area 2, North America": "IAI Area, North America",
     "IAI Area 2, North America": "IAI Area, North America",
@@ -28,6 +30,7 @@ GEO_UPDATE = {
 }
 
 
+@per_dataset
 def update_ecoinvent_locations(db):
     """
     Update location names in ecoinvent database to fix inconsistencies and standardize naming.
@@ -1,28 +1,34 @@
 from ..errors import MissingMigration
 from ..migrations import Migration, migrations
-from ..utils import activity_hash, rescale_exchange
+from ..utils import rescale_exchange
+from .generic import LinkIndex
 
 
-def migrate_datasets(db, migration):
+def get_migration_index(migration):
+    """Load migration ``migration`` as a ``LinkIndex`` for ``migrate_datasets`` and
+    ``migrate_exchanges``."""
     if migration not in migrations:
         raise MissingMigration(
             "Migration `{}` is missing; did you run `bw2setup()` in this project? You can also (re-)install core migrations  with `create_core_migrations()`".format(
                 migration
             )
         )
-    migration_data = Migration(migration).load()
+    # There shouldn't be duplicates for the lookup fields, as they will be
+    # overwritten during index creation.
+    return LinkIndex.from_migration(Migration(migration).load())
 
-    to_dict = lambda x: dict(zip(migration_data["fields"], x))
 
-    mapping = {
-        activity_hash(to_dict(obj[0]), fields=migration_data["fields"]): obj[1]
-        for obj in migration_data["data"]
-    }
+def migrate_datasets(db, migration, index=None):
+    """Apply migration ``migration`` to datasets in ``db``.
+
+    ``index`` can be a ``LinkIndex`` from ``get_migration_index``, to avoid loading
+    the migration data again."""
+    if index is None:
+        index = get_migration_index(migration)
 
     for ds in db:
-        try:
-            new_data = mapping[activity_hash(ds, fields=migration_data["fields"])]
-        except KeyError:
+        new_data = index.get(ds)
+        if new_data is None:
             # This dataset is not in the list to be migrated
             continue
         for field, value in new_data.items():
@@ -34,30 +40,18 @@ def migrate_datasets(db, migration):
     return db
 
 
-def migrate_exchanges(db, migration):
-    if migration not in migrations:
-        raise MissingMigration(
-            "Migration `{}` is missing; did you run `bw2setup()` in this project? You can also (re-)install core migrations  with `create_core_migrations()`".format(
-                migration
-            )
-        )
-    migration_data = Migration(migration).load()
-
-    to_dict = lambda x: dict(zip(migration_data["fields"], x))
+def migrate_exchanges(db, migration, index=None):
+    """Apply migration ``migration`` to exchanges in ``db``.
 
-    # Create dict of lookup fields to new data. There shouldn't be
-    # duplicates for the lookup fields, as they will be overwritten
-    # during mapping creation.
-    mapping = {
-        activity_hash(to_dict(obj[0]), fields=migration_data["fields"]): obj[1]
-        for obj in migration_data["data"]
-    }
+    ``index`` can be a ``LinkIndex`` from ``get_migration_index``, to avoid loading
+    the migration data again."""
+    if index is None:
+        index = get_migration_index(migration)
 
     for ds in db:
         for exc in ds.get("exchanges", []):
-            try:
-                new_data = mapping[activity_hash(exc, fields=migration_data["fields"])]
-            except KeyError:
+            new_data = index.get(exc)
+            if new_data is None:
                 # This exchange is not in the list to be migrated
                 continue
             for field, value in new_data.items():
@@ -0,0 +1,107 @@
+import functools
+import multiprocessing
+from typing import Callable, List, Optional
+
+
+def per_dataset(func: Callable) -> Callable:
+    """
+    Mark a strategy as handling each dataset independently.
+
+    A per-dataset strategy only reads and changes the dataset (and its exchanges) it is
+    currently processing, and keeps no state between datasets, so applying it to a
+    partition of the data gives the same result as applying it to all the data.
+    ``ImportBase.apply_strategies(parallel=True)`` fuses consecutive per-dataset
+    strategies into a single pass over partitions of the data in a worker pool.
+
+    Strategies which link, count, log, or otherwise look across datasets must not be
+    marked.
+
+    """
+    func.per_dataset = True
+    return func
+
+
+def is_per_dataset(strategy: Callable) -> bool:
+    """Check if ``strategy``, or the function of a ``functools.partial``, is marked with
+    ``per_dataset``."""
+    while isinstance(strategy, functools.partial):
+        strategy = strategy.func
+    return getattr(strategy, "per_dataset", False)
+
+
+def group_strategies(strategies: List[Callable]) -> List[List[Callable]]:
+    """
+    Split ``strategies`` into groups which can be applied in one pass.
+
+    Consecutive per-dataset strategies are grouped together; every other strategy forms a
+    group of its own, and acts as a barrier.
+
+    >>> group_strategies([a, b, link, c])
+    [[a, b], [link], [c]]
+
+    """
+    groups = []
+    for strategy in strategies:
+        if groups and is_per_dataset(strategy) and is_per_dataset(groups[-1][-1]):
+            groups[-1].append(strategy)
+        else:
+            groups.append([strategy])
+    return groups
+
+
+def _apply_to_partition(
+    strategies: List[Callable], partition: List[dict]
+) -> List[dict]:
+    for strategy in strategies:
+        partition = strategy(partition)
+    return partition
+
+
+def apply_per_dataset_strategies(
+    data: List[dict],
+    strategies: List[Callable],
+    processes: Optional[int] = None,
+    chunksize: Optional[int] = None,
+) -> List[dict]:
+    """
+    Apply per-dataset ``strategies`` in order to partitions of ``data`` in a worker pool.
+
+    Each worker applies all ``strategies`` to its partition, so the data is only sent
+    once to and from the workers. Strategies (and the arguments of partial functions)
+    must be picklable.
+
+    The result is a new list with copies of the datasets, in the original order, and
+    ``data`` is left unchanged. Datasets shouldn't share mutable objects, as sharing is
+    only kept within a partition. With ``processes=1``, the strategies are applied to
+    ``data`` directly instead.
+
+    Parameters
+    ----------
+    data : list of dict
+        Datasets to process.
+    strategies : list of callable
+        Strategies marked with ``per_dataset``.
+    processes : int, optional
+        Number of worker processes. Defaults to ``multiprocessing.cpu_count()``.
+    chunksize : int, optional
+        Number of datasets per partition. Defaults to splitting ``data`` in four
+        partitions per worker, with at most 500 datasets each.
+
+    Returns
+    -------
+    list of dict
+        The processed datasets.
+
+    """
+    processes = processes or multiprocessing.cpu_count()
+    if chunksize is None:
+        chunksize = max(1, min(500, len(data) // (processes * 4)))
+    partitions = [data[i : i + chunksize] for i in range(0, len(data), chunksize)]
+    if processes == 1:
+        return _apply_to_partition(strategies, data)
+
+    with multiprocessing.Pool(processes=processes) as pool:
+        results = pool.map(
+            functools.partial(_apply_to_partition, strategies), partitions
+        )
+    return [ds for partition in results for ds in partition]
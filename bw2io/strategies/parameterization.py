@@ -1,6 +1,19 @@
+import ast
+import functools
 import re
+from collections import defaultdict
+from pprint import pformat
 
 import asteval
+import numpy as np
+from bw2parameters import Interpreter
+from bw2parameters.errors import (
+    DuplicateName,
+    MissingName,
+    ParameterError,
+    SelfReference,
+)
+from bw2parameters.utils import isidentifier
 
 RESERVED = {
     "and",
@@ -39,6 +52,12 @@ RESERVED = {
 }
 
 
+IDENTIFIER = re.compile(
+    r"(?<![A-Za-z_])"  # Not preceded by a letter or underscore
+    r"[A-Za-z_][A-Za-z0-9_]*"  # A variable or function name
+)
+
+
 class ReservedVariableNameSubstitutor:
     """
     A class to substitute reserved variable names in formulas with their uppercase versions.
@@ -50,9 +69,12 @@ class ReservedVariableNameSubstitutor:
     ----------
     symbols : set
         A set of reserved Python keywords and built-in function names.
-    matches : list
-        A list of tuples, where each tuple contains a compiled regular expression pattern
-        and a substitution string for each reserved symbol.
+
+    Parameters
+    ----------
+    cache_size : int, optional
+        Number of fixed formulas to remember, as the same formulas are often used in
+        many datasets. Default is 2 ** 16.
 
     Examples
     --------
@@ -66,23 +88,23 @@ class ReservedVariableNameSubstitutor:
     'SUM'
     """
 
-    def __init__(self):
-        reserved_pattern_template = "(^|[^A-Za-z_]){}([^A-Za-z_]|$)"
-        reserved_substitution_template = r"\1{}\2"
-
+    def __init__(self, cache_size=2**16):
         self.symbols = set(asteval.make_symbol_table()).union(RESERVED)
-        self.matches = [
-            (
-                re.compile(reserved_pattern_template.format(symbol)),
-                reserved_substitution_template.format(symbol.upper()),
-            )
-            for symbol in self.symbols
-        ]
+        self._fix_formula = functools.lru_cache(maxsize=cache_size)(
+            functools.partial(IDENTIFIER.sub, self._substitute)
+        )
+
+    def _substitute(self, match):
+        name = match.group()
+        return name.upper() if name in self.symbols else name
 
     def fix_formula(self, string):
         """
         Substitute reserved variable names in a formula with their uppercase versions.
 
+        Each name in the formula is looked up once in ``symbols``, and results are
+        cached.
+
         Parameters
         ----------
         string : str
@@ -93,9 +115,7 @@ class ReservedVariableNameSubstitutor:
         str
             The updated formula with reserved variable names replaced with their uppercase versions.
         """
-        for pattern, substitution in self.matches:
-            string = pattern.sub(substitution, string)
-        return string
+        return self._fix_formula(string)
 
     def fix_variable_name(self, string):
         """
@@ -119,3 +139,307 @@ class ReservedVariableNameSubstitutor:
 
 
 variable_subtitutor = ReservedVariableNameSubstitutor()
+
+
+# Syntax which evaluates element-wise on arrays of floats in the same way as on
+# single numbers. Anything else is evaluated one dataset at a time.
+VECTORIZED_NODES = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Constant,
+    ast.Name,
+    ast.Load,
+    ast.Call,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.FloorDiv,
+    ast.Mod,
+    ast.Pow,
+    ast.UAdd,
+    ast.USub,
+)
+
+
+# Parameter names repeat across datasets
+_isidentifier = functools.lru_cache(maxsize=2**16)(isidentifier)
+
+
+def _reduce(ufunc):
+    def func(*args):
+        if len(args) < 2:
+            raise TypeError("Need at least two arguments")
+        return functools.reduce(ufunc, args)
+
+    return func
+
+
+@functools.lru_cache(maxsize=1)
+def _vectorized_namespace():
+    """Functions and constants of the formula interpreter which work on arrays"""
+    namespace = {
+        key: value
+        for key, value in Interpreter().symtable.items()
+        if isinstance(value, (np.ufunc, float))
+    }
+    namespace.update({"min": _reduce(np.minimum), "max": _reduce(np.maximum)})
+    namespace["__builtins__"] = {}
+    return namespace
+
+
+@functools.lru_cache(maxsize=2**16)
+def compile_formula(formula):
+    """
+    Parse a formula once for batch evaluation.
+
+    Parameters
+    ----------
+    formula : str
+        The formula, using the syntax of ``bw2parameters``.
+
+    Returns
+    -------
+    tuple
+        The set of names used in the formula, and a code object which can be
+        evaluated on NumPy arrays, or ``None`` if the formula can only be
+        evaluated by the ``bw2parameters`` interpreter.
+
+    Raises
+    ------
+    MissingName
+        If the formula can't be parsed.
+    """
+    try:
+        tree = ast.parse(formula.strip(), mode="eval")
+        vectorized = True
+    except SyntaxError:
+        # Statements can still be evaluated by the interpreter
+        try:
+            tree = ast.parse(formula.strip())
+        except SyntaxError:
+            raise MissingName(formula)
+        vectorized = False
+    nodes = list(ast.walk(tree))
+    names = frozenset(node.id for node in nodes if isinstance(node, ast.Name))
+    if vectorized and all(map(_is_vectorized, nodes)):
+        return names, compile(tree, "<formula>", "eval")
+    return names, None
+
+
+def _is_vectorized(node):
+    if not isinstance(node, VECTORIZED_NODES):
+        return False
+    elif isinstance(node, ast.Constant):
+        return isinstance(node.value, (int, float)) and not isinstance(node.value, bool)
+    elif isinstance(node, ast.Call):
+        return (
+            isinstance(node.func, ast.Name)
+            and callable(_vectorized_namespace().get(node.func.id))
+            and not node.keywords
+            and not any(isinstance(arg, ast.Starred) for arg in node.args)
+        )
+    return True
+
+
+def _as_floats(value):
+    """Array of floats, or ``None`` if ``value`` isn't made of numbers"""
+    array = np.asarray(value)
+    return array.astype(float) if array.dtype.kind in "iuf" else None
+
+
+def _as_python(value):
+    """Python number for NumPy scalars, e.g. so that ``1 / 0`` raises an error
+    instead of returning ``inf``"""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _dependency_levels(dependencies):
+    """Level of each parameter, so that parameters only reference lower levels"""
+    levels, remaining = {}, dict(dependencies)
+    while remaining:
+        resolved = {
+            name: max((levels[ref] + 1 for ref in refs), default=0)
+            for name, refs in remaining.items()
+            if refs.issubset(levels)
+        }
+        if not resolved:
+            raise ParameterError(
+                (
+                    "Undefined or circular references for the following:"
+                    "\n{}\nExisting references:\n{}"
+                ).format(
+                    pformat(remaining, indent=2), pformat(sorted(levels), indent=2)
+                )
+            )
+        levels.update(resolved)
+        for name in resolved:
+            del remaining[name]
+    return levels
+
+
+def _evaluate_group(formula, rows, global_parameters, interpreter):
+    """Evaluate ``formula`` for all ``rows``, vectorized if possible.
+
+    Each row is a tuple of the already evaluated values of the dataset, the
+    object whose ``amount`` is set, and the parameter name (or ``None``)."""
+    names, code = compile_formula(formula)
+    results = None
+    if code is not None:
+        try:
+            variables = {
+                name: _as_floats(
+                    global_parameters[name]
+                    if name in global_parameters
+                    else [values[name] for values, _, _ in rows]
+                )
+                for name in names
+                if name in global_parameters or name in rows[0][0]
+            }
+            if all(value is not None for value in variables.values()):
+                with np.errstate(all="raise"):
+                    results = np.broadcast_to(
+                        eval(code, _vectorized_namespace(), variables),
+                        (len(rows),),
+                    )
+                # Integer inputs never give negative zeros in the interpreter
+                if (
+                    results.dtype.kind != "f"
+                    or not np.isfinite(results).all()
+                    or np.signbit(results[results == 0]).any()
+                ):
+                    results = None
+        except (ArithmeticError, LookupError, NameError, TypeError, ValueError):
+            results = None
+
+    if results is not None:
+        # Python floats, so later formulas fail like in ``ParameterSet``
+        results = results.tolist()
+    else:
+        # Same as ``ParameterSet``, including errors and non-finite results
+        results = []
+        for values, _, _ in rows:
+            symbols = {
+                name: _as_python(
+                    global_parameters[name]
+                    if name in global_parameters
+                    else values[name]
+                )
+                for name in names
+                if name in global_parameters or name in values
+            }
+            previous = {
+                name: interpreter.symtable.pop(name)
+                for name in symbols
+                if name in interpreter.symtable
+            }
+            interpreter.symtable.update(symbols)
+            try:
+                results.append(interpreter(formula))
+            finally:
+                for name in symbols:
+                    del interpreter.symtable[name]
+                interpreter.symtable.update(previous)
+
+    for (values, obj, name), result in zip(rows, results):
+        obj["amount"] = result
+        if name is not None:
+            values[name] = result
+
+
+def evaluate_parameters(db, global_parameters=None):
+    """
+    Evaluate the parameters and exchange formulas of all datasets in one batch.
+
+    Gives the same results as calling ``bw2parameters.ParameterSet`` on each
+    dataset, but each unique formula is parsed only once, and formulas are
+    evaluated for all datasets which use them at the same time as NumPy
+    expressions, in the order of their dependencies. Formulas which can't be
+    vectorized are evaluated one dataset at a time.
+
+    Parameters
+    ----------
+    db : list
+        List of datasets. Each dataset can have ``parameters``, a dictionary of
+        parameter names and dictionaries with a ``formula`` or an ``amount``, and
+        ``exchanges`` with a ``formula``.
+    global_parameters : dict, optional
+        Parameter names and values which can be used in all datasets. Take
+        precedence over parameters with the same name in a dataset.
+
+    Returns
+    -------
+    list
+        The datasets, with the ``amount`` of all parameters set, and the ``amount``
+        of exchanges with a ``formula`` set if it was missing.
+
+    Raises
+    ------
+    SelfReference
+        If a parameter formula references itself.
+    ParameterError
+        If parameter formulas have undefined or circular references.
+
+    Examples
+    --------
+    >>> db = [{
+    ...     "parameters": {"a": {"amount": 2}, "b": {"formula": "a * scale"}},
+    ...     "exchanges": [{"formula": "b + 1"}],
+    ... }]
+    >>> evaluate_parameters(db, {"scale": 3})
+    [{
+        "parameters": {"a": {"amount": 2}, "b": {"formula": "a * scale", "amount": 6.0}},
+        "exchanges": [{"formula": "b + 1", "amount": 7.0}],
+    }]
+    """
+    global_parameters = global_parameters or {}
+    interpreter = Interpreter()
+    builtins = interpreter.BUILTIN_SYMBOLS
+    groups = defaultdict(list)
+
+    for ds in db:
+        parameters = ds.get("parameters") or {}
+        values, dependencies = {}, {}
+        for name, parameter in parameters.items():
+            if not _isidentifier(name):
+                raise ValueError(
+                    "Parameter label {} not a valid Python name".format(name)
+                )
+            elif name in builtins:
+                raise DuplicateName(
+                    "Parameter name {} is a built-in symbol".format(name)
+                )
+            elif name in global_parameters:
+                parameter["amount"] = values[name] = global_parameters[name]
+            elif parameter.get("formula"):
+                names, _ = compile_formula(parameter["formula"])
+                if name in names:
+                    raise SelfReference(
+                        "Formula for parameter {} references itself".format(name)
+                    )
+                dependencies[name] = set(names.difference(builtins, global_parameters))
+            elif Interpreter.is_numeric(parameter.get("amount")):
+                values[name] = parameter["amount"]
+            else:
+                raise ValueError(
+                    (
+                        "Parameter {} must have either ``amount`` "
+                        "or ``formula`` field"
+                    ).format(name)
+                )
+        for refs in dependencies.values():
+            refs.difference_update(values)
+        for name, level in _dependency_levels(dependencies).items():
+            groups[(level, parameters[name]["formula"])].append(
+                (values, parameters[name], name)
+            )
+        for exc in ds.get("exchanges", []):
+            if "formula" in exc and "amount" not in exc:
+                groups[(float("inf"), exc["formula"])].append((values, exc, None))
+
+    for level, formula in sorted(groups, key=lambda key: key[0]):
+        _evaluate_group(
+            formula, groups[(level, formula)], global_parameters, interpreter
+        )
+    return db
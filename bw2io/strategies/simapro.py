@@ -5,11 +5,11 @@ from typing import List
 
 import bw2parameters
 import numpy as np
-from bw2data import Database
 from stats_arrays import LognormalUncertainty
 
 from ..compatibility import SIMAPRO_BIO_SUBCATEGORIES, SIMAPRO_BIOSPHERE
 from ..data import get_valid_geonames
+from ..lookup import database_nodes
 from ..utils import load_json_data_file, rescale_exchange
 from .generic import link_technosphere_by_activity_hash
 from .locations import GEO_UPDATE
@@ -907,7 +907,9 @@ def flip_sign_on_waste(db, other):
     [{'exchanges': [{'amount': 10, 'input': ('key',), 'uncertainty type': 0, 'loc': 10}]}]
     """
     flip_needed = {
-        ds.key for ds in Database(other) if ds.get("production amount", 0) < 0
+        ds["key"]
+        for ds in database_nodes(other, ["key", "production amount"])
+        if ds.get("production amount", 0) < 0
     }
     for ds in db:
         for exc in ds.get("exchanges", []):
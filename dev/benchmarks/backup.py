@@ -0,0 +1,66 @@
+"""Compare project backups and restores with a single `tar.gz` stream and with
+`parallel=True`.
+
+Usage:
+
+    python dev/benchmarks/backup.py [MB of processed arrays] [MB of other data] [threads]
+
+Runs in a temporary project directory. Processed datapackages are random bytes in
+`.zip` files, like compressed arrays; the other data is compressible text.
+"""
+
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+os.environ["BRIGHTWAY2_DIR"] = tempfile.mkdtemp()
+
+import bw2data as bd  # noqa: E402
+
+from bw2io.backup import (  # noqa: E402
+    backup_project_directory,
+    restore_project_directory,
+)
+
+
+def write_project(processed_mb, other_mb):
+    bd.projects.set_current("backup benchmark")
+    rnd = random.Random(42)
+    processed = bd.projects.dir / "processed"
+    for i in range(processed_mb):
+        (processed / f"db-{i}.zip").write_bytes(rnd.randbytes(2**20))
+    lines = [f"{i}\tflow {i % 997}\t{rnd.random()}\n" for i in range(2**14)]
+    text = "".join(lines).encode()
+    with open(bd.projects.dir / "inventory.tsv", "wb") as f:
+        for _ in range(other_mb * 2**20 // len(text) + 1):
+            f.write(text)
+
+
+if __name__ == "__main__":
+    processed_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    other_mb = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    threads = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    write_project(processed_mb, other_mb)
+
+    for parallel in (False, True):
+        dirpath = Path(tempfile.mkdtemp())
+        start = perf_counter()
+        fp = backup_project_directory(
+            "backup benchmark",
+            timestamp=False,
+            dir_backup=dirpath,
+            parallel=parallel,
+            threads=threads,
+        )
+        backup = perf_counter() - start
+        start = perf_counter()
+        restore_project_directory(fp, project_name=f"restored {parallel}")
+        restore = perf_counter() - start
+        print(
+            "parallel={}: backup {:.2f} s, restore {:.2f} s, archive {:.0f} MB".format(
+                parallel, backup, restore, fp.stat().st_size / 1e6
+            )
+        )
@@ -0,0 +1,88 @@
+"""Compare `LCIImporter.write_database` with and without `bulk=True`, and with
+`incremental=True` after changing 1% of the datasets.
+
+Usage:
+
+    python dev/benchmarks/bulk_write.py [number of datasets]
+
+Writes synthetic datasets with 50 exchanges each into a temporary project
+directory, replacing and then upserting (`delete_existing=False`) the database.
+Times include processing the database, which is the same for all variants.
+"""
+
+import os
+import random
+import sys
+import tempfile
+from copy import deepcopy
+from time import perf_counter
+
+os.environ["BRIGHTWAY2_DIR"] = tempfile.mkdtemp()
+
+import bw2data as bd  # noqa: E402
+
+from bw2io.importers.base_lci import LCIImporter  # noqa: E402
+
+
+def make_data(num_datasets, exchanges_per_dataset=50):
+    rng = random.Random(42)
+    codes = [f"{i:032d}" for i in range(num_datasets)]
+    return [
+        {
+            "database": "bench",
+            "code": code,
+            "name": f"process {i}",
+            "reference product": f"product {i}",
+            "unit": "kilogram",
+            "location": "GLO",
+            "type": "process",
+            "exchanges": [
+                {
+                    "input": ("bench", code if j == 0 else rng.choice(codes)),
+                    "amount": rng.random(),
+                    "type": "production" if j == 0 else "technosphere",
+                    "unit": "kilogram",
+                }
+                for j in range(exchanges_per_dataset)
+            ],
+        }
+        for i, code in enumerate(codes)
+    ]
+
+
+def run(data, **kwargs):
+    importer = LCIImporter("bench")
+    importer.data = deepcopy(data)
+    start = perf_counter()
+    importer.write_database(searchable=False, **kwargs)
+    return perf_counter() - start, getattr(importer, "write_report", None)
+
+
+if __name__ == "__main__":
+    num_datasets = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    bd.projects.set_current("bulk-write-benchmark")
+    data = make_data(num_datasets)
+    print(f"{num_datasets} datasets, {num_datasets * 50} exchanges")
+    for label, kwargs in [
+        ("write", {}),
+        ("bulk write", {"bulk": True}),
+        ("update", {"delete_existing": False}),
+        ("bulk upsert", {"bulk": True, "delete_existing": False}),
+    ]:
+        elapsed, report = run(data, **kwargs)
+        line = "{:>15}: {:8.2f} s".format(label, elapsed)
+        if report:
+            line += " (insert {seconds:.2f} s, {rows_per_second:.0f} rows/s)".format(
+                **report
+            )
+        print(line)
+
+    changed = deepcopy(data)
+    for ds in changed[::100]:
+        ds["exchanges"][1]["amount"] *= 2
+    elapsed, report = run(changed, incremental=True)
+    print(
+        "{:>15}: {:8.2f} s (diff and write {:.2f} s, {} changed)".format(
+            "incremental", elapsed, report["seconds"], len(report["changed"])
+        )
+    )
@@ -0,0 +1,138 @@
+"""Compare list-of-dicts and `ColumnarData` importer data.
+
+Usage:
+
+    python dev/benchmarks/columnar.py [number of datasets]
+    python dev/benchmarks/columnar.py --ecospold2 <path to datasets directory>
+
+The first form uses synthetic ecospold2-like data with 50 exchanges per dataset,
+and reports memory use of both representations and the time needed for the
+strategies with vectorized versions. The second form runs the full
+`SingleOutputEcospold2Importer` strategy list with and without `columnar=True`
+(needs a project with a biosphere database).
+"""
+
+import math
+import random
+import sys
+import tracemalloc
+from copy import deepcopy
+from time import perf_counter
+
+from bw2io.columnar import COLUMNAR_STRATEGIES, ColumnarData
+
+
+def make_data(num_datasets, exchanges_per_dataset=50):
+    rng = random.Random(42)
+    units = ["kg", "kilowatt hour", "MJ", "m3", "unit", "tkm"]
+    data = []
+    for i in range(num_datasets):
+        exchanges = []
+        for j in range(exchanges_per_dataset):
+            amount = rng.choice([0.0, rng.uniform(-1, 10)])
+            exchanges.append(
+                {
+                    "type": (
+                        "production"
+                        if j == 0
+                        else rng.choice(["technosphere", "biosphere"])
+                    ),
+                    "name": f"flow {rng.randrange(5000)}",
+                    "unit": rng.choice(units),
+                    "amount": amount,
+                    "uncertainty type": rng.choice([0, 2]) if amount else 0,
+                    "loc": amount,
+                    "scale": rng.uniform(0, 4),
+                    "flow": f"{rng.randrange(10000):032d}",
+                    "activity": f"{rng.randrange(20000):032d}",
+                    "properties": {},
+                    "classifications": {},
+                    "production volume": 0.0,
+                }
+            )
+        data.append(
+            {
+                "name": f"process {i}",
+                "unit": rng.choice(units),
+                "location": "GLO",
+                "database": "bench",
+                "exchanges": exchanges,
+            }
+        )
+    return data
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    start = perf_counter()
+    result = func(*args)
+    elapsed = perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, current, peak
+
+
+def apply_legacy(data):
+    for strategy in COLUMNAR_STRATEGIES:
+        data = strategy(data)
+    return data
+
+
+def apply_columnar(data):
+    columnar = ColumnarData.from_data(data)
+    for vectorized in COLUMNAR_STRATEGIES.values():
+        columnar = vectorized(columnar)
+    return columnar
+
+
+def synthetic(num_datasets):
+    data, _, size, _ = measure(make_data, num_datasets)
+    print(f"{num_datasets} datasets, {num_datasets * 50} exchanges")
+    print("{:>30}: {:8.1f} MB".format("list of dicts", size / 1e6))
+    columnar, elapsed, size, _ = measure(ColumnarData.from_data, data)
+    print(
+        "{:>30}: {:8.1f} MB (built in {:.2f} s)".format(
+            "ColumnarData", size / 1e6, elapsed
+        )
+    )
+
+    expected, elapsed, *_ = measure(apply_legacy, deepcopy(data))
+    print("{:>30}: {:8.2f} s".format("legacy strategies", elapsed))
+    result, elapsed, *_ = measure(apply_columnar, deepcopy(data))
+    print("{:>30}: {:8.2f} s".format("vectorized (incl. building)", elapsed))
+    columnar = ColumnarData.from_data(deepcopy(data))
+    start = perf_counter()
+    for vectorized in COLUMNAR_STRATEGIES.values():
+        columnar = vectorized(columnar)
+    print("{:>30}: {:8.2f} s".format("vectorized only", perf_counter() - start))
+    # `numpy.log` can differ from `math.log` in the last bit
+    for got, ds in zip(result.to_data(), expected):
+        assert len(got["exchanges"]) == len(ds["exchanges"])
+        for a, b in zip(got["exchanges"], ds["exchanges"]):
+            assert a.keys() == b.keys()
+            assert all(
+                math.isclose(a[k], v) if isinstance(v, float) else a[k] == v
+                for k, v in b.items()
+            )
+
+
+def ecospold2(dirpath):
+    from bw2io import SingleOutputEcospold2Importer
+
+    for columnar in (False, True):
+        imp = SingleOutputEcospold2Importer(dirpath, "bench")
+        _, elapsed, _, peak = measure(
+            lambda: imp.apply_strategies(verbose=False, columnar=columnar)
+        )
+        print(
+            "columnar={}: {:.2f} s, {:.1f} MB peak".format(
+                columnar, elapsed, peak / 1e6
+            )
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--ecospold2":
+        ecospold2(sys.argv[2])
+    else:
+        synthetic(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
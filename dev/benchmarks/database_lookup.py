@@ -0,0 +1,82 @@
+"""Compare building a lookup of biosphere flows by iterating over a `Database`
+and with `database_nodes`.
+
+Usage:
+
+    python dev/benchmarks/database_lookup.py [number of flows]
+
+Runs in a temporary project directory with a synthetic biosphere database.
+Times the code set used by `link_biosphere_by_flow_uuid`, and the
+`(name, unit, categories)` mapping used by `match_against_top_level_context`,
+each built twice, as the second `database_nodes` call is served from the cache.
+"""
+
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+os.environ["BRIGHTWAY2_DIR"] = tempfile.mkdtemp()
+
+import bw2data as bd  # noqa: E402
+
+from bw2io.lookup import database_nodes  # noqa: E402
+
+
+def write_biosphere(num_flows):
+    bd.projects.set_current("lookup benchmark")
+    bd.Database("biosphere").write(
+        {
+            ("biosphere", f"{i:08}"): {
+                "name": f"flow {i // 10}",
+                "categories": ("air", f"sub {i % 10}"),
+                "unit": "kilogram",
+                "type": "emission",
+                "CAS number": "000124-38-9",
+                "synonyms": ["carbon dioxide", "CO2"],
+            }
+            for i in range(num_flows)
+        }
+    )
+
+
+def run(label, func):
+    times = []
+    for _ in range(2):
+        start = perf_counter()
+        result = func()
+        times.append(perf_counter() - start)
+    print("{:>28}: {:8.3f} s, then {:8.3f} s".format(label, *times))
+    return result
+
+
+if __name__ == "__main__":
+    num_flows = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    write_biosphere(num_flows)
+    print(f"{num_flows} flows")
+    fields = ["name", "unit"]
+
+    old = run("codes, Database", lambda: {x["code"] for x in bd.Database("biosphere")})
+    new = run(
+        "codes, database_nodes",
+        lambda: {x["code"] for x in database_nodes("biosphere", ["code"])},
+    )
+    assert old == new
+
+    old = run(
+        "mapping, Database",
+        lambda: {
+            tuple([x.get(f) for f in fields] + [tuple(x.get("categories", []))]): x.key
+            for x in bd.Database("biosphere")
+        },
+    )
+    new = run(
+        "mapping, database_nodes",
+        lambda: {
+            tuple([x.get(f) for f in fields] + [tuple(x.get("categories", []))]): x[
+                "key"
+            ]
+            for x in database_nodes("biosphere", fields + ["categories", "key"])
+        },
+    )
+    assert old == new
@@ -0,0 +1,169 @@
+"""Compare the setup of an ecoinvent LCIA import (everything before
+`Method.write`) with the previous implementation, which read the whole workbook
+and created a dictionary per row, and with `header_columns` and
+`group_characterization_factors`.
+
+Usage:
+
+    python dev/benchmarks/ecoinvent_lcia.py [number of impact categories] [number of flows]
+
+Runs in a temporary project directory with a synthetic biosphere database and
+LCIA workbook; ecoinvent 3.10 has about 4700 biosphere flows, 800 impact
+categories and 300,000 characterization factors. A few flow names are
+misspelled, like in some ecoinvent releases.
+"""
+
+import os
+import random
+import sys
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+from time import perf_counter
+
+os.environ["BRIGHTWAY2_DIR"] = tempfile.mkdtemp()
+
+import bw2data as bd  # noqa: E402
+import xlsxwriter  # noqa: E402
+from ecoinvent_interface.string_distance import damerau_levenshtein  # noqa: E402
+
+from bw2io.ecoinvent import (  # noqa: E402
+    CF_LABELS,
+    biosphere_flow_mapping,
+    drop_unspecified,
+    group_characterization_factors,
+    header_columns,
+    header_dict,
+)
+from bw2io.extractors import ExcelExtractor  # noqa: E402
+from bw2io.extractors.excel import CalamineWorkbook  # noqa: E402
+
+CONTEXTS = [("air", "urban"), ("air", "unspecified"), ("water", "ground-")]
+
+
+def previous_setup(lcia_file, biosphere_name):
+    """Previous implementation of the LCIA setup in ``import_ecoinvent_release``"""
+    data = dict(ExcelExtractor.extract(lcia_file, backend="openpyxl"))
+    units = header_dict(data["Indicators"])
+    cfs = header_dict(data["CFs"])
+    units_mapping = {
+        (row["method"], row["category"], row["indicator"]): row["indicator unit"]
+        for row in units
+    }
+    biosphere_mapping = {}
+    for flow in bd.Database(biosphere_name):
+        biosphere_mapping[(flow["name"],) + tuple(flow["categories"])] = flow.id
+    lcia_data_as_dict = defaultdict(list)
+    for row in cfs:
+        impact_category = (row["method"], row["category"], row["indicator"])
+        if row["cf"] is None:
+            continue
+        try:
+            lcia_data_as_dict[impact_category].append(
+                (
+                    biosphere_mapping[
+                        drop_unspecified(
+                            row["name"], row["compartment"], row["subcompartment"]
+                        )
+                    ],
+                    float(row["cf"]),
+                )
+            )
+        except KeyError:
+            category = (
+                (row["compartment"], row["subcompartment"])
+                if row["subcompartment"].lower() != "unspecified"
+                else (row["compartment"],)
+            )
+            same_context = {
+                k[0]: v for k, v in biosphere_mapping.items() if k[1:] == category
+            }
+            candidates = sorted(
+                [
+                    (damerau_levenshtein(name, row["name"]), name)
+                    for name in same_context
+                ]
+            )
+            if (
+                candidates[0][0] < 3
+                and candidates[0][0] != candidates[1][0]
+                and candidates[0][1][0].lower() == row["name"][0].lower()
+            ):
+                lcia_data_as_dict[impact_category].append(
+                    (same_context[candidates[0][1]], float(row["cf"]))
+                )
+    return units_mapping, dict(lcia_data_as_dict)
+
+
+def new_setup(lcia_file, biosphere_name, backend=None):
+    units = header_dict(
+        ExcelExtractor.extract(lcia_file, sheets=["Indicators"], backend=backend)[0][1]
+    )
+    units_mapping = {
+        (row["method"], row["category"], row["indicator"]): row["indicator unit"]
+        for row in units
+    }
+    cfs = header_columns(
+        ExcelExtractor.iter_rows(lcia_file, "CFs", backend=backend),
+        CF_LABELS + ("cf",),
+    )
+    return units_mapping, group_characterization_factors(
+        cfs, "cf", biosphere_flow_mapping(biosphere_name)
+    )
+
+
+def write_data(dirpath, num_categories, num_flows):
+    rnd = random.Random(42)
+    flows = [(f"flow {i}",) + CONTEXTS[i % 3] for i in range(num_flows)]
+    bd.Database("biosphere").write(
+        {
+            ("biosphere", str(i)): {
+                "name": name,
+                "categories": drop_unspecified(name, *context)[1:],
+                "type": "emission",
+            }
+            for i, (name, *context) in enumerate(flows)
+        }
+    )
+    flows[:5] = [(f"Flow {i}",) + CONTEXTS[i % 3] for i in range(5)]
+
+    filepath = dirpath / "LCIA.xlsx"
+    workbook = xlsxwriter.Workbook(filepath, {"constant_memory": True})
+    sheet = workbook.add_worksheet("Indicators")
+    sheet.write_row(0, 0, ["Method", "Category", "Indicator", "Indicator Unit"])
+    for i in range(num_categories):
+        sheet.write_row(i + 1, 0, [f"method {i // 10}", f"category {i}", "ind", "kg"])
+    sheet = workbook.add_worksheet("CFs")
+    sheet.write_row(0, 0, [label.title() for label in CF_LABELS] + ["CF"])
+    index = 1
+    for i in range(num_categories):
+        for flow in rnd.sample(flows, num_flows // 12):
+            sheet.write_row(
+                index,
+                0,
+                [f"method {i // 10}", f"category {i}", "ind", *flow, rnd.random()],
+            )
+            index += 1
+    sheet = workbook.add_worksheet("compartments")
+    for i, context in enumerate(CONTEXTS * 1000):
+        sheet.write_row(i, 0, context)
+    workbook.close()
+    return filepath, index - 1
+
+
+if __name__ == "__main__":
+    num_categories = int(sys.argv[1]) if len(sys.argv) > 1 else 800
+    num_flows = int(sys.argv[2]) if len(sys.argv) > 2 else 4700
+    bd.projects.set_current("ecoinvent lcia benchmark")
+    filepath, num_cfs = write_data(Path(tempfile.mkdtemp()), num_categories, num_flows)
+    print(f"{num_categories} impact categories, {num_cfs} characterization factors")
+
+    start = perf_counter()
+    old = previous_setup(filepath, "biosphere")
+    print(f"Previous: {perf_counter() - start:.2f} s")
+
+    for backend in ["openpyxl"] + (["calamine"] if CalamineWorkbook else []):
+        start = perf_counter()
+        new = new_setup(filepath, "biosphere", backend)
+        print(f"Columns, {backend}: {perf_counter() - start:.2f} s")
+        assert new == old
@@ -0,0 +1,71 @@
+"""Compare extracting one large multi-dataset ecospold1 file as a whole and split
+into batches of datasets processed by a worker pool.
+
+Usage:
+
+    python dev/benchmarks/ecospold1_split.py [number of datasets] [processes]
+
+The file is made of copies of the ABS test fixture (~57 exchanges per dataset),
+like a SimaPro ecospold1 export.
+"""
+
+import sys
+import tempfile
+from copy import deepcopy
+from pathlib import Path
+from time import perf_counter
+
+from lxml import etree
+
+from bw2io.extractors.ecospold1 import Ecospold1DataExtractor
+
+FIXTURE = (
+    Path(__file__).parents[2]
+    / "tests"
+    / "fixtures"
+    / "ecospold1"
+    / "Acrylonitrile-butadiene-styrene copolymer (ABS), resin, at plant CTR.xml"
+)
+
+
+def make_file(dirpath, num_datasets):
+    tree = etree.parse(str(FIXTURE))
+    root = tree.getroot()
+    (dataset,) = root.findall("{%s}dataset" % Ecospold1DataExtractor.NAMESPACE)
+    for number in range(2, num_datasets + 1):
+        copy = deepcopy(dataset)
+        copy.set("number", str(number))
+        root.append(copy)
+    filepath = Path(dirpath) / "export.xml"
+    tree.write(str(filepath), xml_declaration=True, encoding="utf-8")
+    return filepath
+
+
+def run(label, func):
+    start = perf_counter()
+    result = func()
+    print("{:>20}: {:8.2f} s".format(label, perf_counter() - start))
+    return result
+
+
+if __name__ == "__main__":
+    num_datasets = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    with tempfile.TemporaryDirectory() as dirpath:
+        filepath = make_file(dirpath, num_datasets)
+        print(f"{num_datasets} datasets, {filepath.stat().st_size / 1e6:.0f} MB")
+        expected = run(
+            "whole file",
+            lambda: Ecospold1DataExtractor.extract(filepath, "bench", use_mp=True),
+        )
+        for label, kwargs in [
+            ("split, serial", {"use_mp": False}),
+            ("split, pool", {"use_mp": True, "processes": processes}),
+        ]:
+            result = run(
+                label,
+                lambda: Ecospold1DataExtractor.extract(
+                    filepath, "bench", split_datasets=True, **kwargs
+                ),
+            )
+            assert result == expected
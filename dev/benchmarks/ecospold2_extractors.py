@@ -0,0 +1,71 @@
+"""Compare the objectify and iterparse ecospold2 extractors.
+
+Usage:
+
+    python dev/benchmarks/ecospold2_extractors.py [directory with .spold files] [repeat]
+
+Defaults to the test fixtures. Checks that both backends give identical output,
+and reports wall time and peak resident memory for each. Each backend runs in a
+new process, so that the peak resident set size (from `resource.getrusage`)
+includes the memory allocated by lxml, and isn't raised by the other backend.
+"""
+
+import multiprocessing
+import resource
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from time import perf_counter
+
+from bw2io.extractors.ecospold2 import (
+    Ecospold2DataExtractor,
+    Ecospold2IterparseDataExtractor,
+)
+
+FIXTURES = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "ecospold2"
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run(extractor, dirpath, repeat):
+    baseline = peak_rss()
+    start = perf_counter()
+    for _ in range(repeat):
+        data = extractor.extract(dirpath, "bench", use_mp=False)
+    elapsed = (perf_counter() - start) / repeat
+    return data, elapsed, peak_rss(), peak_rss() - baseline
+
+
+def run_in_new_process(extractor, dirpath, repeat):
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(run, extractor, dirpath, repeat).result()
+
+
+if __name__ == "__main__":
+    dirpath = Path(sys.argv[1]) if len(sys.argv) > 1 else FIXTURES
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    results = {
+        extractor.__name__: run_in_new_process(extractor, dirpath, repeat)
+        for extractor in (Ecospold2DataExtractor, Ecospold2IterparseDataExtractor)
+    }
+
+    reference, *others = results.values()
+    key = lambda ds: ds["filename"]
+    for other in others:
+        assert sorted(other[0], key=key) == sorted(reference[0], key=key)
+    print("Outputs identical for {} datasets".format(len(reference[0])))
+
+    for name, (_, elapsed, peak, increase) in results.items():
+        print(
+            "{:>35}: {:8.4f} s per extraction, {:8.2f} MB peak RSS "
+            "({:+.2f} MB during extraction)".format(
+                name, elapsed, peak / 1e6, increase / 1e6
+            )
+        )
@@ -0,0 +1,66 @@
+"""Compare reading a characterization factor worksheet with the `openpyxl` and
+`calamine` backends of `ExcelExtractor`.
+
+Usage:
+
+    python dev/benchmarks/excel_backends.py [number of rows]
+
+Writes a synthetic workbook with a large `CFs` worksheet and a small `Indicators`
+worksheet to a temporary directory. The `calamine` backend requires
+`python-calamine`.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+import xlsxwriter
+
+from bw2io.extractors import ExcelExtractor
+
+
+def write_workbook(filepath, num_rows):
+    workbook = xlsxwriter.Workbook(filepath, {"constant_memory": True})
+    sheet = workbook.add_worksheet("CFs")
+    sheet.write_row(
+        0,
+        0,
+        [
+            "Method",
+            "Category",
+            "Indicator",
+            "Name",
+            "Compartment",
+            "Subcompartment",
+            "CF",
+        ],
+    )
+    for i in range(1, num_rows + 1):
+        sheet.write_row(
+            i,
+            0,
+            [f"method {i % 50}", "cat", "ind", f"flow {i}", "air", "urban", i / 7],
+        )
+    sheet = workbook.add_worksheet("Indicators")
+    sheet.write_row(0, 0, ["Method", "Category", "Indicator", "Unit"])
+    for i in range(50):
+        sheet.write_row(i + 1, 0, [f"method {i}", "cat", "ind", "kg"])
+    workbook.close()
+
+
+if __name__ == "__main__":
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    filepath = Path(tempfile.mkdtemp()) / "lcia.xlsx"
+    write_workbook(filepath, num_rows)
+
+    results = {}
+    for backend in ("openpyxl", "calamine"):
+        start = perf_counter()
+        results[backend] = ExcelExtractor.extract(filepath, backend=backend)
+        print(f"{num_rows} rows, {backend}: {perf_counter() - start:.2f} s")
+
+        start = perf_counter()
+        ExcelExtractor.extract(filepath, sheets=["Indicators"], backend=backend)
+        print(f"Only `Indicators` sheet, {backend}: {perf_counter() - start:.2f} s")
+    assert results["openpyxl"] == results["calamine"]
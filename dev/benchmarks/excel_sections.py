@@ -0,0 +1,84 @@
+"""Compare splitting an Excel worksheet into activities by copying the rest of the
+worksheet for each activity (the previous `ExcelImporter.process_activities`), and
+with `index_sections` and `RowRange` views.
+
+Usage:
+
+    python dev/benchmarks/excel_sections.py [number of rows]
+
+Writes a synthetic workbook with one worksheet and ten rows per activity to a
+temporary directory, and extracts it once with `ExcelExtractor`.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+import xlsxwriter
+
+from bw2io.extractors import ExcelExtractor
+from bw2io.importers.excel import ExcelImporter
+
+
+def process_activities_by_copying(importer, data):
+    """Previous implementation of ``process_activities``, without cutoffs"""
+    new_activity = lambda x: (
+        len(x)
+        and isinstance(x[0], str)
+        and len(x) > 1
+        and isinstance(x[1], str)
+        and x[0].strip().lower() == "activity"
+    )
+    results = []
+    for sn, ws in data:
+        for index, line in enumerate(ws):
+            if new_activity(line):
+                results.append(importer.get_activity(sn, ws[index:]))
+    return results
+
+
+def write_workbook(filepath, num_rows):
+    workbook = xlsxwriter.Workbook(filepath, {"constant_memory": True})
+    sheet = workbook.add_worksheet("activities")
+    rows = [["Database", "bench"], []]
+    for i in range(num_rows // 10):
+        rows.extend(
+            [
+                ["Activity", f"activity {i}"],
+                ["reference product", f"product {i}"],
+                ["unit", "kilogram"],
+                ["location", "GLO"],
+                ["Exchanges"],
+                ["name", "amount", "unit", "location", "type"],
+                [f"activity {i}", 1, "kilogram", "GLO", "production"],
+                [f"activity {i - 1}", 0.5, "kilogram", "GLO", "technosphere"],
+                ["Carbon dioxide, fossil", 2.5, "kilogram", "", "biosphere"],
+                [],
+            ]
+        )
+    for index, row in enumerate(rows):
+        sheet.write_row(index, 0, row)
+    workbook.close()
+    return len(rows)
+
+
+if __name__ == "__main__":
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    filepath = Path(tempfile.mkdtemp()) / "activities.xlsx"
+    num_rows = write_workbook(filepath, num_rows)
+    data = ExcelExtractor.extract(filepath)
+    os.remove(filepath)
+
+    importer = ExcelImporter.__new__(ExcelImporter)
+    importer.db_name = "bench"
+
+    start = perf_counter()
+    old = process_activities_by_copying(importer, data)
+    print(f"{num_rows} rows, copying: {perf_counter() - start:.2f} s")
+
+    start = perf_counter()
+    new = importer.process_activities(data)
+    print(f"{num_rows} rows, views: {perf_counter() - start:.2f} s")
+    assert old == new
@@ -0,0 +1,90 @@
+"""Compare deleting exchanges with a list of exchanges to skip (the previous
+`delete_exchanges_missing_activity` and `delete_ghost_exchanges`) and with
+`drop_exchanges`.
+
+Usage:
+
+    python dev/benchmarks/exchange_deletion.py [exchanges per dataset] [number of datasets]
+
+Runs in a temporary project directory, as deleted exchanges are logged. One in
+ten technosphere exchanges of the synthetic datasets is unlinked.
+"""
+
+import copy
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+os.environ["BRIGHTWAY2_DIR"] = tempfile.mkdtemp()
+
+from bw2data.logs import close_log, get_io_logger  # noqa: E402
+
+from bw2io.strategies.ecospold2 import (  # noqa: E402
+    delete_exchanges_missing_activity,
+    delete_ghost_exchanges,
+)
+from bw2io.utils import format_for_logging  # noqa: E402
+
+
+def skip_list_delete_ghost_exchanges(db):
+    """Previous implementation of ``delete_ghost_exchanges``"""
+    log, logfile = get_io_logger("Ecospold2-import-error")
+    for ds in db:
+        exchanges = ds.get("exchanges", [])
+        if not exchanges:
+            continue
+        skip = []
+        for exc in exchanges:
+            if exc.get("input") or exc.get("type") != "technosphere":
+                continue
+            log.critical(
+                "Purging unlinked exchange:\nFilename: {}\n{}".format(
+                    ds["filename"], format_for_logging(exc)
+                )
+            )
+            skip.append(exc)
+        ds["exchanges"] = [exc for exc in exchanges if exc not in skip]
+    close_log(log)
+    return db
+
+
+def make_datasets(num_exchanges, num_datasets):
+    return [
+        {
+            "filename": f"{i}.spold",
+            "exchanges": [
+                {
+                    "type": "technosphere" if j % 2 else "biosphere",
+                    "name": f"flow {j}",
+                    "amount": j / 7,
+                    "unit": "kilogram",
+                    "flow": f"flow {j}",
+                }
+                | ({} if j % 20 == 1 else {"input": ("db", f"{j}")})
+                for j in range(num_exchanges)
+            ],
+        }
+        for i in range(num_datasets)
+    ]
+
+
+def run(label, func, db):
+    db = copy.deepcopy(db)
+    start = perf_counter()
+    func(db)
+    print("{:>36}: {:8.2f} s".format(label, perf_counter() - start))
+    return db
+
+
+if __name__ == "__main__":
+    num_exchanges = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    num_datasets = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    db = make_datasets(num_exchanges, num_datasets)
+    print(f"{num_datasets} datasets with {num_exchanges} exchanges")
+    new = run("delete_ghost_exchanges", delete_ghost_exchanges, db)
+    old = run("skip list delete_ghost_exchanges", skip_list_delete_ghost_exchanges, db)
+    assert old == new
+    assert new == run(
+        "delete_exchanges_missing_activity", delete_exchanges_missing_activity, db
+    )
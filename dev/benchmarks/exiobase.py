@@ -0,0 +1,149 @@
+"""Compare writing an EXIOBASE technosphere table with the previous per-cell
+`csv.reader` iterator and exchange dictionaries, and with
+`Exiobase3MonetaryDataExtractor.get_technosphere_matrix` and processed arrays.
+
+Usage:
+
+    python dev/benchmarks/exiobase.py [number of sectors] [share of nonzero values]
+
+Runs in a temporary project directory with a synthetic `A.txt`; the full
+EXIOBASE 3 table has 9800 sectors, and about a third of its values are nonzero.
+Also times reading the table from a zip archive, and from a `MatrixCache`.
+"""
+
+import csv
+import os
+import random
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+from time import perf_counter
+
+os.environ["BRIGHTWAY2_DIR"] = tempfile.mkdtemp()
+
+import bw2data as bd  # noqa: E402
+import numpy as np  # noqa: E402
+from bw2data.backends.iotable import IOTableBackend  # noqa: E402
+
+from bw2io.extractors import MatrixCache  # noqa: E402
+from bw2io.extractors.exiobase import (  # noqa: E402
+    Exiobase3MonetaryDataExtractor,
+    remove_numerics,
+)
+from bw2io.importers.exiobase3_monetary import (  # noqa: E402
+    _label_ids,
+    _processed_vector,
+)
+
+
+def csv_technosphere_iterator(dirpath):
+    """Previous implementation of ``get_technosphere_iterator``"""
+    with (dirpath / "A.txt").open() as f:
+        reader = csv.reader(f, delimiter="\t")
+        locations = next(reader)[2:]
+        names = [remove_numerics(o) for o in next(reader)[2:]]
+
+        for line in reader:
+            inpt = (remove_numerics(line[1]), line[0])
+            for index, elem in enumerate(line[2:]):
+                if elem and float(elem) != 0:
+                    if abs(float(elem)) < 1e-15:
+                        continue
+                    else:
+                        yield (inpt, (names[index], locations[index]), float(elem))
+
+
+def write_table(dirpath, num_sectors, density):
+    rnd = random.Random(42)
+    sectors = [
+        (f"Sector {i} ({i % 90 + 10})", ["AT", "DE", "FR"][i % 3])
+        for i in range(num_sectors)
+    ]
+    with open(dirpath / "A.txt", "w") as f:
+        f.write("region\tregion\t" + "\t".join(o[1] for o in sectors) + "\n")
+        f.write("sector\tsector\t" + "\t".join(o[0] for o in sectors) + "\n")
+        f.write("region\tsector\n")
+        for name, location in sectors:
+            values = (
+                repr(rnd.random() * 1e-3) if rnd.random() < density else "0.0"
+                for _ in sectors
+            )
+            f.write(f"{location}\t{name}\t" + "\t".join(values) + "\n")
+    return [(remove_numerics(name), location) for name, location in sectors]
+
+
+if __name__ == "__main__":
+    num_sectors = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    density = float(sys.argv[2]) if len(sys.argv) > 2 else 0.3
+    dirpath = Path(tempfile.mkdtemp())
+    sectors = write_table(dirpath, num_sectors, density)
+
+    bd.projects.set_current("exiobase benchmark")
+    db = IOTableBackend("exiobase")
+    db.write(
+        {
+            ("exiobase", f"{name}|{location}"): {"name": name, "location": location}
+            for name, location in sectors
+        }
+    )
+    mapping = {(o["name"], o["location"]): o.id for o in db}
+    products = list(mapping.values())
+
+    start = perf_counter()
+    technosphere = [
+        {
+            "row": mapping[x],
+            "col": mapping[y],
+            "amount": z,
+            "flip": True,
+            "uncertainty_type": 0,
+        }
+        for x, y, z in csv_technosphere_iterator(dirpath)
+    ] + [
+        {"row": x, "col": x, "amount": 1, "flip": False, "uncertainty_type": 0}
+        for x in products
+    ]
+    db.write_exchanges(technosphere, [], [])
+    old = perf_counter() - start
+    print(f"{len(technosphere)} exchanges; dictionaries: {old:.2f} s")
+
+    start = perf_counter()
+    inputs, outputs, matrix = Exiobase3MonetaryDataExtractor.get_technosphere_matrix(
+        dirpath
+    )
+    read = perf_counter() - start
+    products = np.array(products)
+    db.write_exchanges(
+        _processed_vector(
+            np.concatenate(
+                [_label_ids(inputs, matrix.row, mapping)[matrix.row], products]
+            ),
+            np.concatenate(
+                [_label_ids(outputs, matrix.col, mapping)[matrix.col], products]
+            ),
+            np.concatenate([matrix.data, np.ones(len(products))]),
+            np.concatenate(
+                [np.ones(matrix.nnz, dtype=bool), np.zeros(len(products), dtype=bool)]
+            ),
+        ),
+        [],
+        [],
+    )
+    new = perf_counter() - start
+    print(
+        f"{matrix.nnz + len(products)} exchanges; arrays: {new:.2f} s ({read:.2f} s reading)"
+    )
+
+    zippath = dirpath / "IOT_benchmark.zip"
+    with zipfile.ZipFile(zippath, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.write(dirpath / "A.txt", "IOT_benchmark/A.txt")
+    start = perf_counter()
+    Exiobase3MonetaryDataExtractor.get_technosphere_matrix(zippath)
+    print(f"Reading from zip archive: {perf_counter() - start:.2f} s")
+
+    cache = MatrixCache(tempfile.mkdtemp())
+    for label in ("parsed and cached", "from cache"):
+        start = perf_counter()
+        Exiobase3MonetaryDataExtractor.get_technosphere_matrix(zippath, cache=cache)
+        print(f"Reading from zip archive, {label}: {perf_counter() - start:.2f} s")
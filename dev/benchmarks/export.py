@@ -0,0 +1,148 @@
+"""Compare formatting a database for CSV export, and exporting it to Excel, with
+the previous per-activity queries of `CSVFormatter`, and with batched queries and
+streamed rows.
+
+Usage:
+
+    python dev/benchmarks/export.py [number of activities] [exchanges per activity]
+
+Runs in a temporary project directory with a synthetic database linked to a
+biosphere database; a third of the activities have parameters. Excel export
+times include the overhead of `tracemalloc`.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+
+os.environ["BRIGHTWAY2_DIR"] = tempfile.mkdtemp()
+
+import bw2data as bd  # noqa: E402
+import xlsxwriter  # noqa: E402
+from bw2data.parameters import ActivityParameter, parameters  # noqa: E402
+
+from bw2io.export.csv import CSVFormatter  # noqa: E402
+from bw2io.export.excel import write_lci_excel  # noqa: E402
+
+
+class PreviousCSVFormatter(CSVFormatter):
+    """Previous implementation of ``CSVFormatter``, with two queries for the
+    parameters, one query for the exchanges, and one query per exchange input of
+    each activity"""
+
+    def get_activity_parameters(self, act):
+        data = [
+            o.dict
+            for o in ActivityParameter.select().where(
+                ActivityParameter.database == act[0],
+                ActivityParameter.code == act[1],
+            )
+        ]
+        if not data:
+            return {}
+        dct = self.order_dicts(data, "parameter")
+        dct["group"] = ActivityParameter.get(database=act[0], code=act[1]).group
+        return dct
+
+    def iter_activities(self):
+        for obj in self.objs:
+            yield self.get_activity(obj)
+
+
+def previous_write_lci_excel(database_name, dirpath):
+    """Previous implementation of ``write_lci_excel``, without formats"""
+    data = PreviousCSVFormatter(database_name).get_formatted_data()
+    workbook = xlsxwriter.Workbook(dirpath / "previous.xlsx")
+    sheet = workbook.add_worksheet(database_name)
+    for row_index, row in enumerate(data):
+        for col_index, value in enumerate(row):
+            if value is None:
+                continue
+            elif isinstance(value, (int, float)):
+                sheet.write_number(row_index, col_index, value)
+            else:
+                sheet.write_string(row_index, col_index, value)
+    workbook.close()
+
+
+def write_databases(num_activities, num_exchanges):
+    rnd = random.Random(42)
+    bd.Database("bio").write(
+        {
+            ("bio", str(i)): {
+                "name": f"flow {i}",
+                "categories": ("air",),
+                "unit": "kg",
+                "type": "emission",
+            }
+            for i in range(100)
+        }
+    )
+    bd.Database("bench").write(
+        {
+            ("bench", str(i)): {
+                "name": f"activity {i}",
+                "unit": "kg",
+                "location": "GLO",
+                "exchanges": [
+                    {"input": ("bench", str(i)), "amount": 1, "type": "production"}
+                ]
+                + [
+                    {
+                        "input": ("bench", str(rnd.randrange(num_activities))),
+                        "amount": rnd.random(),
+                        "type": "technosphere",
+                    }
+                    for _ in range(num_exchanges // 2)
+                ]
+                + [
+                    {
+                        "input": ("bio", str(rnd.randrange(100))),
+                        "amount": rnd.random(),
+                        "type": "biosphere",
+                    }
+                    for _ in range(num_exchanges - num_exchanges // 2 - 1)
+                ],
+            }
+            for i in range(num_activities)
+        }
+    )
+    parameters.new_activity_parameters(
+        [
+            {"name": f"p{i}", "amount": i, "database": "bench", "code": str(i)}
+            for i in range(0, num_activities, 3)
+        ],
+        "bench group",
+    )
+
+
+if __name__ == "__main__":
+    num_activities = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    num_exchanges = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    bd.projects.set_current("export benchmark")
+    write_databases(num_activities, num_exchanges)
+    dirpath = Path(tempfile.mkdtemp())
+
+    start = perf_counter()
+    old = PreviousCSVFormatter("bench").get_formatted_data()
+    print(f"Previous formatter: {perf_counter() - start:.2f} s")
+    start = perf_counter()
+    new = CSVFormatter("bench").get_formatted_data()
+    print(f"Batched formatter: {perf_counter() - start:.2f} s")
+    assert old == new
+
+    for label, writer in (
+        ("previous", previous_write_lci_excel),
+        ("batched and streamed", write_lci_excel),
+    ):
+        tracemalloc.start()
+        start = perf_counter()
+        writer("bench", dirpath=dirpath)
+        elapsed = perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+        print(f"Excel export, {label}: {elapsed:.2f} s, peak {peak:.0f} MB")
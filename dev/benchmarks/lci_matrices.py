@@ -0,0 +1,131 @@
+"""Compare exporting LCI matrices to Excel with the previous implementation, which
+looked up each node separately, summed each biosphere matrix row separately and
+wrote cells in matrix order, and with `lci_matrices_to_excel`; also times
+`lci_matrices_to_npz`.
+
+Usage:
+
+    python dev/benchmarks/lci_matrices.py [number of activities] [exchanges per activity]
+
+Runs in a temporary project directory with a synthetic database linked to a
+biosphere database. The previous implementation used the `bw2calc` 1 API
+(`fix_dictionaries`), and is adapted here to `LCA.dicts`.
+"""
+
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+os.environ["BRIGHTWAY2_DIR"] = tempfile.mkdtemp()
+
+import bw2data as bd  # noqa: E402
+import xlsxwriter  # noqa: E402
+from bw2calc import LCA  # noqa: E402
+
+from bw2io.export import lci_matrices_to_excel, lci_matrices_to_npz  # noqa: E402
+
+
+def previous_lci_matrices_to_excel(database_name, dirpath):
+    """Previous implementation of ``lci_matrices_to_excel``, without label sheets"""
+    lca = LCA({bd.Database(database_name).random(): 1})
+    lca.load_lci_data()
+    activity_dict = {bd.get_node(id=k).key: v for k, v in lca.dicts.activity.items()}
+    product_dict = {bd.get_node(id=k).key: v for k, v in lca.dicts.product.items()}
+    biosphere_dict = {
+        bd.get_node(id=k).key: v
+        for k, v in lca.dicts.biosphere.items()
+        if lca.biosphere_matrix[v, :].sum() != 0
+    }
+    workbook = xlsxwriter.Workbook(dirpath / "previous.xlsx")
+    sorted_activity_keys = sorted(
+        [(bd.get_node(key=key).get("name") or "Unknown", key) for key in activity_dict]
+    )
+    sorted_product_keys = sorted(
+        [(bd.get_node(key=key).get("name") or "Unknown", key) for key in product_dict]
+    )
+    sorted_bio_keys = sorted(
+        [(bd.get_node(key=key).get("name") or "Unknown", key) for key in biosphere_dict]
+    )
+    act_dict = {obj[1]: idx for idx, obj in enumerate(sorted_activity_keys)}
+    pro_dict = {obj[1]: idx for idx, obj in enumerate(sorted_product_keys)}
+    bio_dict = {obj[1]: idx for idx, obj in enumerate(sorted_bio_keys)}
+    pro_lookup = {v: pro_dict[k] for k, v in product_dict.items()}
+    bio_lookup = {v: bio_dict[k] for k, v in biosphere_dict.items()}
+    act_lookup = {v: act_dict[k] for k, v in activity_dict.items()}
+    for label, matrix, lookup, keys in (
+        ("technosphere", lca.technosphere_matrix, pro_lookup, sorted_product_keys),
+        ("biosphere", lca.biosphere_matrix, bio_lookup, sorted_bio_keys),
+    ):
+        sheet = workbook.add_worksheet(label)
+        for index, data in enumerate(sorted_activity_keys):
+            sheet.write_string(0, index + 1, data[0])
+        for index, data in enumerate(keys):
+            sheet.write_string(index + 1, 0, data[0])
+        coo = matrix.tocoo()
+        for row, col, value in zip(coo.row, coo.col, coo.data):
+            sheet.write_number(lookup[row] + 1, act_lookup[col] + 1, value)
+    workbook.close()
+
+
+def write_databases(num_activities, num_exchanges):
+    rnd = random.Random(42)
+    bd.Database("bio").write(
+        {
+            ("bio", str(i)): {
+                "name": f"flow {i}",
+                "categories": ("air",),
+                "unit": "kg",
+                "type": "emission",
+            }
+            for i in range(1000)
+        }
+    )
+    bd.Database("bench").write(
+        {
+            ("bench", str(i)): {
+                "name": f"activity {rnd.random()}",
+                "unit": "kg",
+                "exchanges": [
+                    {"input": ("bench", str(i)), "amount": 1, "type": "production"}
+                ]
+                + [
+                    {
+                        "input": ("bench", str(rnd.randrange(num_activities))),
+                        "amount": rnd.random() / num_exchanges,
+                        "type": "technosphere",
+                    }
+                    for _ in range(num_exchanges // 2)
+                ]
+                + [
+                    {
+                        "input": ("bio", str(rnd.randrange(1000))),
+                        "amount": rnd.random(),
+                        "type": "biosphere",
+                    }
+                    for _ in range(num_exchanges - num_exchanges // 2 - 1)
+                ],
+            }
+            for i in range(num_activities)
+        }
+    )
+
+
+if __name__ == "__main__":
+    num_activities = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    num_exchanges = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    bd.projects.set_current("matrix export benchmark")
+    write_databases(num_activities, num_exchanges)
+    dirpath = Path(tempfile.mkdtemp())
+
+    start = perf_counter()
+    previous_lci_matrices_to_excel("bench", dirpath)
+    print(f"Excel, previous: {perf_counter() - start:.2f} s")
+    start = perf_counter()
+    lci_matrices_to_excel("bench", dirpath=dirpath)
+    print(f"Excel, vectorized and streamed: {perf_counter() - start:.2f} s")
+    start = perf_counter()
+    lci_matrices_to_npz("bench", dirpath=dirpath)
+    print(f"NPZ: {perf_counter() - start:.2f} s")
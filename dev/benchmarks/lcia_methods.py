@@ -0,0 +1,114 @@
+"""Compare `create_default_lcia_methods` with and without `bulk=True`.
+
+Usage:
+
+    python dev/benchmarks/lcia_methods.py [processes]
+
+Runs in a temporary project directory with a synthetic `biosphere3` database
+containing the flows used by the bundled ecoinvent 3.9 LCIA methods, and
+overwrites the ~760 methods with each variant. Checks that the variants give the
+same metadata and processed characterization matrices.
+
+Then times `bw2setup` in new projects, with its default bulk writer and with
+`create_default_lcia_methods(bulk=False)`. If the ecoinvent elementary flows XML
+file isn't in the checkout, `bw2setup` creates the synthetic `biosphere3`
+database instead.
+"""
+
+import functools
+import json
+import os
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+from time import perf_counter
+
+os.environ["BRIGHTWAY2_DIR"] = tempfile.mkdtemp()
+
+import bw2data as bd  # noqa: E402
+import numpy as np  # noqa: E402
+
+import bw2io  # noqa: E402
+from bw2io.importers.base_lci import LCIImporter  # noqa: E402
+
+FILEPATH = Path(bw2io.__file__).parent / "data" / "lcia" / "lcia_39_ecoinvent.zip"
+BIOSPHERE_FILEPATH = (
+    Path(bw2io.__file__).parent / "data" / "lci" / "ecoinvent elementary flows 3.9.xml"
+)
+
+
+def create_biosphere():
+    with zipfile.ZipFile(FILEPATH) as archive:
+        data = json.load(archive.open("data.json"))
+    flows = {}
+    for method in data:
+        for cf in method["exchanges"]:
+            flows[cf["input"][1]] = {
+                "database": "biosphere3",
+                "code": cf["input"][1],
+                "name": cf["name"],
+                "categories": tuple(cf["categories"]),
+                "unit": "kilogram",
+                "type": "emission",
+                "exchanges": [],
+            }
+    importer = LCIImporter("biosphere3")
+    importer.data = list(flows.values())
+    importer.write_database(searchable=False, bulk=True)
+
+
+def snapshot():
+    result = {}
+    for name in sorted(bd.methods):
+        dp = bd.Method(name).datapackage()
+        array = dp.get_resource(dp.resources[0]["name"])[0]
+        result[name] = (dict(bd.methods[name]), np.sort(array))
+    return result
+
+
+def setup(bulk):
+    bd.projects.set_current(f"bw2setup-benchmark-{bulk}")
+    create_default_lcia_methods = bw2io.create_default_lcia_methods
+    create_default_biosphere3 = bw2io.create_default_biosphere3
+    if not BIOSPHERE_FILEPATH.exists():
+        bw2io.create_default_biosphere3 = create_biosphere
+    if not bulk:
+        bw2io.create_default_lcia_methods = functools.partial(
+            create_default_lcia_methods, bulk=False
+        )
+    try:
+        start = perf_counter()
+        bw2io.bw2setup()
+        return perf_counter() - start
+    finally:
+        bw2io.create_default_lcia_methods = create_default_lcia_methods
+        bw2io.create_default_biosphere3 = create_default_biosphere3
+
+
+def run(**kwargs):
+    start = perf_counter()
+    bw2io.create_default_lcia_methods(overwrite=True, **kwargs)
+    return perf_counter() - start
+
+
+if __name__ == "__main__":
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    bd.projects.set_current("lcia-methods-benchmark")
+    create_biosphere()
+
+    print("{:>20}: {:8.2f} s".format("write", run(bulk=False)))
+    expected = snapshot()
+    for label, kwargs in [
+        ("bulk write", {"bulk": True}),
+        (f"bulk, {processes} processes", {"bulk": True, "processes": processes}),
+    ]:
+        print("{:>20}: {:8.2f} s".format(label, run(**kwargs)))
+        result = snapshot()
+        assert result.keys() == expected.keys()
+        for name, (metadata, array) in result.items():
+            assert metadata == expected[name][0]
+            assert np.array_equal(array, expected[name][1])
+
+    print("{:>20}: {:8.2f} s".format("bw2setup", setup(bulk=True)))
+    print("{:>20}: {:8.2f} s".format("bw2setup, bulk=False", setup(bulk=False)))
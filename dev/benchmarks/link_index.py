@@ -0,0 +1,101 @@
+"""Compare `activity_hash`-based linking with `LinkIndex` on synthetic data.
+
+Usage:
+
+    python dev/benchmarks/link_index.py [number of exchanges]
+
+Builds a target database of 20.000 nodes and a source database with (by
+default) 1.000.000 exchanges, and links it three times: once with the
+previous `activity_hash` approach, once building a new `LinkIndex`, and
+once reusing the same `LinkIndex`.
+"""
+
+import random
+import sys
+from copy import deepcopy
+from time import perf_counter
+
+from bw2io.strategies import LinkIndex, link_iterable_by_fields
+from bw2io.utils import activity_hash
+
+FIELDS = ["name", "reference product", "unit", "location"]
+
+
+def make_data(num_exchanges, num_nodes=20_000, exchanges_per_node=50):
+    rng = random.Random(42)
+    locations = ["GLO", "RER", "CH", "DE", "US", "CN", "RoW"]
+    other = [
+        {
+            "name": f"Process {i}",
+            "reference product": f"Product {i % 5000}",
+            "unit": "kilogram",
+            "location": locations[i % len(locations)],
+            "database": "target",
+            "code": str(i),
+        }
+        for i in range(num_nodes)
+    ]
+    unlinked = []
+    for i in range(num_exchanges // exchanges_per_node):
+        exchanges = []
+        for _ in range(exchanges_per_node):
+            target = other[rng.randrange(num_nodes)]
+            exchanges.append(
+                {
+                    "name": target["name"].upper(),
+                    "reference product": target["reference product"],
+                    "unit": target["unit"],
+                    "location": target["location"],
+                    "type": "technosphere",
+                    "amount": 1.0,
+                }
+            )
+        unlinked.append({"name": f"Source {i}", "exchanges": exchanges})
+    return unlinked, other
+
+
+def link_with_activity_hash(unlinked, other):
+    candidates = {
+        activity_hash(ds, FIELDS): (ds["database"], ds["code"]) for ds in other
+    }
+    for ds in unlinked:
+        for exc in ds["exchanges"]:
+            key = activity_hash(exc, FIELDS)
+            if key in candidates:
+                exc["input"] = candidates[key]
+    return unlinked
+
+
+def timed(label, func, *args, **kwargs):
+    start = perf_counter()
+    result = func(*args, **kwargs)
+    print("{:>30}: {:6.2f} s".format(label, perf_counter() - start))
+    return result
+
+
+if __name__ == "__main__":
+    num_exchanges = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    unlinked, other = make_data(num_exchanges)
+    print(f"Linking {num_exchanges} exchanges against {len(other)} nodes")
+
+    expected = timed(
+        "activity_hash", link_with_activity_hash, deepcopy(unlinked), other
+    )
+    result = timed(
+        "LinkIndex (new index)",
+        link_iterable_by_fields,
+        deepcopy(unlinked),
+        other,
+        fields=FIELDS,
+    )
+    assert result == expected
+
+    index = LinkIndex.from_nodes(other, fields=FIELDS)
+    link_iterable_by_fields(deepcopy(unlinked), index=index)
+    result = timed(
+        "LinkIndex (reused index)",
+        link_iterable_by_fields,
+        deepcopy(unlinked),
+        index=index,
+    )
+    assert result == expected
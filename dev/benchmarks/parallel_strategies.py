@@ -0,0 +1,57 @@
+"""Compare applying per-dataset strategies one by one and fused in a worker pool.
+
+Usage:
+
+    python dev/benchmarks/parallel_strategies.py [number of datasets] [processes]
+
+Uses the synthetic ecospold2-like data of `columnar.py` (50 exchanges per
+dataset) and the per-dataset strategies of `SingleOutputEcospold2Importer`.
+"""
+
+import sys
+from copy import deepcopy
+from time import perf_counter
+
+from columnar import make_data
+
+from bw2io.strategies import (
+    drop_unspecified_subcategories,
+    fix_unreasonably_high_lognormal_uncertainties,
+    normalize_units,
+    remove_uncertainty_from_negative_loss_exchanges,
+    remove_zero_amount_coproducts,
+    remove_zero_amount_inputs_with_no_activity,
+    set_lognormal_loc_value,
+    update_ecoinvent_locations,
+)
+from bw2io.strategies.parallel import apply_per_dataset_strategies
+
+STRATEGIES = [
+    normalize_units,
+    update_ecoinvent_locations,
+    remove_zero_amount_coproducts,
+    remove_zero_amount_inputs_with_no_activity,
+    drop_unspecified_subcategories,
+    remove_uncertainty_from_negative_loss_exchanges,
+    fix_unreasonably_high_lognormal_uncertainties,
+    set_lognormal_loc_value,
+]
+
+
+if __name__ == "__main__":
+    num_datasets = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    data = make_data(num_datasets)
+    print(f"{num_datasets} datasets, {num_datasets * 50} exchanges")
+
+    serial = deepcopy(data)
+    start = perf_counter()
+    for strategy in STRATEGIES:
+        serial = strategy(serial)
+    print("{:>10}: {:8.2f} s".format("serial", perf_counter() - start))
+
+    parallel = deepcopy(data)
+    start = perf_counter()
+    parallel = apply_per_dataset_strategies(parallel, STRATEGIES, processes)
+    print("{:>10}: {:8.2f} s".format("parallel", perf_counter() - start))
+    assert parallel == serial
@@ -0,0 +1,86 @@
+"""Compare evaluating parameters and exchange formulas with a `ParameterSet` per
+dataset and in one batch with `evaluate_parameters`.
+
+Usage:
+
+    python dev/benchmarks/parameters.py [number of datasets]
+
+Each synthetic dataset has 5 input parameters, 10 calculated parameters (in
+dependency chains) and 30 exchanges with formulas. As in real exports, the
+formula texts are shared by many datasets.
+"""
+
+import copy
+import random
+import sys
+from time import perf_counter
+
+import numpy as np
+from bw2parameters import ParameterSet
+
+from bw2io.strategies.parameterization import evaluate_parameters
+
+TEMPLATES = [
+    "{0} * {1}",
+    "{0} / ({1} + 1)",
+    "sqrt(abs({0})) + {1} * scale",
+    "max({0}, {1}) - 0.5",
+    "{0} ** 2 / 100 + {1}",
+    "exp(-{0}) * {1}",
+]
+
+
+def make_datasets(num_datasets):
+    rng = random.Random(42)
+    db = []
+    for _ in range(num_datasets):
+        parameters = {f"in_{i}": {"amount": rng.random() * 10} for i in range(5)}
+        rng_formulas = random.Random(rng.randrange(20))
+        for i in range(10):
+            names = list(parameters)
+            parameters[f"calc_{i}"] = {
+                "formula": rng_formulas.choice(TEMPLATES).format(
+                    rng_formulas.choice(names), rng_formulas.choice(names)
+                )
+            }
+        names = list(parameters)
+        exchanges = [
+            {
+                "formula": rng_formulas.choice(TEMPLATES).format(
+                    rng_formulas.choice(names), rng_formulas.choice(names)
+                )
+            }
+            for _ in range(30)
+        ]
+        db.append({"parameters": parameters, "exchanges": exchanges})
+    return db
+
+
+def per_dataset(db, global_parameters):
+    for ds in db:
+        ParameterSet(ds["parameters"], global_parameters)(ds["exchanges"])
+    return db
+
+
+def amounts(db):
+    return np.array(
+        [exc["amount"] for ds in db for exc in ds["exchanges"]]
+        + [p["amount"] for ds in db for p in ds["parameters"].values()]
+    )
+
+
+def run(label, func, db):
+    db = copy.deepcopy(db)
+    start = perf_counter()
+    func(db, {"scale": 2.5})
+    print("{:>20}: {:8.3f} s".format(label, perf_counter() - start))
+    return amounts(db)
+
+
+if __name__ == "__main__":
+    num_datasets = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    db = make_datasets(num_datasets)
+    print(f"{num_datasets} datasets")
+    new = run("evaluate_parameters", evaluate_parameters, db)
+    old = run("ParameterSet", per_dataset, db)
+    assert np.allclose(old, new, equal_nan=True)
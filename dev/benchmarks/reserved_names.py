@@ -0,0 +1,72 @@
+"""Compare the previous per-symbol regular expressions with the single-pass
+matcher for uppercasing reserved names in formulas.
+
+Usage:
+
+    python dev/benchmarks/reserved_names.py [number of formulas] [unique formulas]
+
+Formulas are drawn from a smaller set of unique formulas, as the same formula
+text is repeated across many datasets in real imports. Names are separated by
+spaces, as the previous implementation skipped a reserved name directly after
+another one.
+"""
+
+import random
+import re
+import sys
+from time import perf_counter
+
+from bw2io.strategies.parameterization import ReservedVariableNameSubstitutor
+
+NAMES = ["yield", "max", "min", "lambda", "sum", "scale", "area", "p_2", "abs"]
+
+
+class PerSymbolSubstitutor(ReservedVariableNameSubstitutor):
+    """Previous implementation: one regular expression per reserved symbol"""
+
+    def __init__(self):
+        super().__init__()
+        self.matches = [
+            (
+                re.compile("(^|[^A-Za-z_]){}([^A-Za-z_]|$)".format(symbol)),
+                r"\1{}\2".format(symbol.upper()),
+            )
+            for symbol in self.symbols
+        ]
+
+    def fix_formula(self, string):
+        for pattern, substitution in self.matches:
+            string = pattern.sub(substitution, string)
+        return string
+
+
+def make_formulas(num_formulas, num_unique):
+    rng = random.Random(42)
+    unique = [
+        " + ".join(
+            f"{rng.choice(NAMES)}( {rng.choice(NAMES)} ) * {rng.random():.3f}"
+            for _ in range(3)
+        )
+        for _ in range(num_unique)
+    ]
+    return [rng.choice(unique) for _ in range(num_formulas)]
+
+
+def run(label, substitutor, formulas):
+    start = perf_counter()
+    result = [substitutor.fix_formula(formula) for formula in formulas]
+    print("{:>22}: {:8.3f} s".format(label, perf_counter() - start))
+    return result
+
+
+if __name__ == "__main__":
+    num_formulas = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    num_unique = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    formulas = make_formulas(num_formulas, num_unique)
+    print(f"{num_formulas} formulas, {num_unique} unique")
+    new = run("single pass", ReservedVariableNameSubstitutor(), formulas)
+    uncached = run(
+        "single pass, no cache", ReservedVariableNameSubstitutor(0), formulas
+    )
+    old = run("per-symbol", PerSymbolSubstitutor(), formulas)
+    assert new == uncached == old
@@ -0,0 +1,84 @@
+"""Peak memory and time of reading a SimaPro CSV export.
+
+Usage:
+
+    python dev/benchmarks/simapro_csv.py [number of processes]
+
+Writes a synthetic export with 60 exchanges per process, and compares holding
+all parsed lines (what `SimaProCSVExtractor.extract` did before it streamed the
+file), `extract`, and consuming `iter_extract` one dataset at a time.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+from time import perf_counter
+
+from bw2io.extractors.simapro_csv import SimaProCSVExtractor
+
+HEADER = """{SimaPro 9.0.0}
+{processes}
+{Project: benchmark}
+{CSV separator: Semicolon}
+{Decimal separator: .}
+
+"""
+
+
+def write_file(filepath, num_processes):
+    rng = random.Random(42)
+    with open(filepath, "w", encoding="latin-1") as f:
+        f.write(HEADER)
+        for i in range(num_processes):
+            f.write(
+                f"Process\n\nProcess identifier\nP{i}\n\nProcess name\nprocess {i}\n\n"
+            )
+            f.write(f"Products\nproduct {i};kg;1;100;not defined;Others;\n\n")
+            f.write("Materials/fuels\n")
+            for j in range(40):
+                f.write(
+                    f"product {rng.randrange(num_processes)};kg;{rng.random()};"
+                    f"Lognormal;1.2;0;0;(1,1,1,1,1,na)\n"
+                )
+            f.write("\nEmissions to air\n")
+            for j in range(20):
+                f.write(f"Emission {j};;kg;{rng.random()};Undefined;0;0;0;\n")
+            f.write("\nEnd\n\n")
+        f.write("Project Input parameters\nscale;3;Undefined;0;0;0;No;\n\n")
+
+
+def measure(label, func):
+    tracemalloc.start()
+    start = perf_counter()
+    func()
+    elapsed = perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print("{:>20}: {:8.2f} s {:8.0f} MB peak".format(label, elapsed, peak / 1e6))
+
+
+def consume(filepath):
+    datasets, _, _ = SimaProCSVExtractor.iter_extract(filepath, encoding="latin-1")
+    for ds in datasets:
+        pass
+
+
+if __name__ == "__main__":
+    num_processes = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    with tempfile.TemporaryDirectory() as dirpath:
+        filepath = os.path.join(dirpath, "export.csv")
+        write_file(filepath, num_processes)
+        print(
+            f"{num_processes} processes, {os.path.getsize(filepath) / 1e6:.0f} MB file"
+        )
+        measure(
+            "all lines",
+            lambda: list(SimaProCSVExtractor.iter_lines(filepath, encoding="latin-1")),
+        )
+        measure(
+            "extract",
+            lambda: SimaProCSVExtractor.extract(filepath, encoding="latin-1"),
+        )
+        measure("iter_extract", lambda: consume(filepath))
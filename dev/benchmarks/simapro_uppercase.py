@@ -0,0 +1,98 @@
+"""Compare the previous per-name regular expressions with the single-pass
+matcher for changing parameter references in SimaPro formulas to uppercase.
+
+Usage:
+
+    python dev/benchmarks/simapro_uppercase.py [number of parameters]
+
+Builds a synthetic SimaPro export with global input and calculated parameters
+(each calculated parameter references three others in lowercase), times reading
+its global parameters with `SimaProCSVExtractor.get_global_parameters`, and
+times uppercasing all calculated parameter formulas with both approaches.
+"""
+
+import os
+import random
+import re
+import sys
+import tempfile
+from time import perf_counter
+
+from bw2io.extractors.simapro_csv import (
+    SimaProCSVExtractor,
+    compile_uppercase_names,
+    replace_with_uppercase,
+)
+
+HEADER = """{SimaPro 9.0.0}
+{processes}
+{Project: benchmark}
+{CSV separator: Semicolon}
+{Decimal separator: .}
+
+"""
+
+# Previous implementation: one regular expression per name
+PER_NAME_EXPRESSION = "(?:^|[^a-zA-Z_])(?P<variable>{})(?:[^a-zA-Z_]|$)"
+
+
+def per_name_replace(string, names, precompiled):
+    for name in names:
+        for result in precompiled[name].findall(string):
+            string = string.replace(result, name)
+    return string
+
+
+def write_file(filepath, num_parameters):
+    rng = random.Random(42)
+    num_inputs = num_parameters // 2
+    with open(filepath, "w", encoding="latin-1") as f:
+        f.write(HEADER)
+        f.write("Project Input parameters\n")
+        for i in range(num_inputs):
+            f.write(f"input_{i};{rng.random()};Undefined;0;0;0;No;\n")
+        f.write("\nProject Calculated parameters\n")
+        for i in range(num_parameters - num_inputs):
+            a, b, c = (rng.randrange(num_inputs) for _ in range(3))
+            f.write(f"calc_{i};input_{a}*2+input_{b}/Input_{c};\n")
+        f.write("\n")
+
+
+if __name__ == "__main__":
+    num_parameters = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    with tempfile.TemporaryDirectory() as dirpath:
+        filepath = os.path.join(dirpath, "export.csv")
+        write_file(filepath, num_parameters)
+        _, header, lines = SimaProCSVExtractor.read_file_outline(
+            filepath, encoding="latin-1"
+        )
+    metadata = SimaProCSVExtractor.get_project_metadata(header)
+
+    start = perf_counter()
+    parameters, _ = SimaProCSVExtractor.get_global_parameters(lines, metadata)
+    print(
+        "{:>28}: {:8.3f} s".format(
+            f"get_global_parameters ({num_parameters})", perf_counter() - start
+        )
+    )
+
+    names = list(parameters)
+    formulas = [
+        SimaProCSVExtractor.parse_calculated_parameter(line, metadata)["formula"]
+        for line in lines
+        if len(line) == 2
+    ]
+
+    start = perf_counter()
+    precompiled = compile_uppercase_names(names)
+    new = [replace_with_uppercase(formula, names, precompiled) for formula in formulas]
+    print("{:>28}: {:8.3f} s".format("single pass", perf_counter() - start))
+
+    start = perf_counter()
+    precompiled = {
+        name: re.compile(PER_NAME_EXPRESSION.format(name), flags=re.IGNORECASE)
+        for name in names
+    }
+    old = [per_name_replace(formula, names, precompiled) for formula in formulas]
+    print("{:>28}: {:8.3f} s".format("per-name expressions", perf_counter() - start))
+    assert old == new
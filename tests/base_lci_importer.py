@@ -2,12 +2,14 @@ from copy import deepcopy
 
 import numpy as np
 import pytest
-from bw2data import Database, databases
+from bw2data import Database, databases, get_node
 from bw2data.parameters import *
 from bw2data.tests import bw2test
 
 from bw2io.errors import NonuniqueCode, StrategyError, WrongDatabase
 from bw2io.importers.base_lci import LCIImporter
+from bw2io.importers.bulk_write import bulk_write
+from bw2io.importers.incremental import incremental_write
 
 DATA = [
     {
@@ -436,6 +438,126 @@ def test_database_update_existing_data(lci):
     assert {act["location"] for act in Database("PCB")} == {"CH"}
 
 
+def _database_contents(name):
+    return {
+        act["code"]: (
+            {k: v for k, v in act.as_dict().items() if k != "id"},
+            sorted(
+                (exc["type"], exc["amount"], exc.input["code"])
+                for exc in act.exchanges()
+            ),
+        )
+        for act in Database(name)
+    }
+
+
+def test_write_database_bulk(lci):
+    data = deepcopy(lci.data)
+    lci.write_database()
+    expected = _database_contents("PCB")
+
+    lci.data = data
+    lci.write_database(bulk=True, batch_size=1)
+    assert _database_contents("PCB") == expected
+    assert databases["PCB"]["number"] == 2
+    assert databases["PCB"]["searchable"]
+    assert lci.write_report["nodes"] == 2
+    assert lci.write_report["exchanges"] == 3
+    assert lci.write_report["rows_per_second"] > 0
+
+
+def test_write_database_bulk_upsert(lci):
+    lci.write_database(bulk=True)
+    lci.data = deepcopy(DATA_NO_PARAMS[:1])
+    lci.write_database(bulk=True, delete_existing=False)
+
+    assert len(Database("PCB")) == 2
+    assert databases["PCB"]["number"] == 2
+    assert {act["location"] for act in Database("PCB")} == {"CH", "GLO"}
+    assert (
+        sum(exc["amount"] for act in Database("PCB") for exc in act.exchanges()) == 101
+    )
+
+
+def test_bulk_write_rolls_back(lci):
+    lci.write_database(bulk=True)
+    data = deepcopy(DATA_NO_PARAMS)
+    data[1]["code"] = data[0]["code"]
+    with pytest.raises(NonuniqueCode, match=data[0]["code"]):
+        bulk_write(Database("PCB"), iter(data), batch_size=1)
+    assert len(Database("PCB")) == 2
+    assert {act["location"] for act in Database("PCB")} == {"GLO"}
+
+
+def test_write_database_incremental_unchanged(lci):
+    data = deepcopy(lci.data)
+    lci.write_database()
+    ids = {act["code"]: act.id for act in Database("PCB")}
+    expected = _database_contents("PCB")
+
+    lci.data = data
+    lci.write_database(incremental=True)
+    assert lci.write_report["unchanged"] == 2
+    assert not lci.write_report["added"]
+    assert not lci.write_report["changed"]
+    assert not lci.write_report["removed"]
+    assert _database_contents("PCB") == expected
+    assert {act["code"]: act.id for act in Database("PCB")} == ids
+
+
+def test_write_database_incremental_changes(lci):
+    new_data = deepcopy(DATA_NO_PARAMS)
+    lci.data = deepcopy(new_data)
+    lci.write_database()
+    expected = _database_contents("PCB")
+
+    lci.data = deepcopy(DATA)
+    lci.write_database()
+    lci.data = new_data
+    lci.write_database(incremental=True)
+    assert sorted(lci.write_report["changed"]) == sorted(ds["code"] for ds in DATA)
+    assert _database_contents("PCB") == expected
+    assert {act["location"] for act in Database("PCB")} == {"CH"}
+
+
+def test_write_database_incremental_added_removed(lci):
+    lci.write_database()
+    data = deepcopy(DATA_NO_PARAMS[1:])
+    data.append(
+        {
+            "code": "new",
+            "database": "PCB",
+            "exchanges": [
+                {"amount": 1.0, "input": ("PCB", "new"), "type": "production"},
+                {
+                    "amount": 2.0,
+                    "input": ("PCB", data[0]["code"]),
+                    "type": "technosphere",
+                },
+            ],
+            "location": "DE",
+            "name": "new",
+            "type": "process",
+            "unit": "kilogram",
+        }
+    )
+    report = incremental_write(Database("PCB"), deepcopy(data), dry_run=True)
+    assert report["added"] == ["new"]
+    assert report["removed"] == [DATA_NO_PARAMS[0]["code"]]
+    assert report["exchanges_added"] == 3
+    assert report["exchanges_removed"] == 3
+    assert len(Database("PCB")) == 2
+    assert "new" not in {act["code"] for act in Database("PCB")}
+
+    lci.data = data
+    lci.write_database(incremental=True)
+    assert databases["PCB"]["number"] == 2
+    assert {act["code"] for act in Database("PCB")} == {"new", data[0]["code"]}
+    assert sorted(
+        exc["amount"] for exc in get_node(database="PCB", code="new").exchanges()
+    ) == [1.0, 2.0]
+
+
 def test_update_activity_parameters(lci):
     lci.write_project_parameters()
     lci.write_database(activate_parameters=True)
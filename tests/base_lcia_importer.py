@@ -1,5 +1,7 @@
+import numpy as np
 import pytest
-from bw2data import Database, config
+from bw2data import Database, Method, config, methods
+from bw2data.errors import UnknownObject
 from bw2data.tests import bw2test
 
 from bw2io.importers.base_lcia import LCIAImporter
@@ -58,3 +60,125 @@ def test_add_missing_cfs():
     assert toys["database"] == "biosphere"
     print(list(toys._data.items()))
     assert len(toys._data.keys()) == 7
+
+
+def lcia_data():
+    return [
+        {
+            "name": ("a method", name),
+            "description": "",
+            "filename": "methods.xlsx",
+            "unit": "kg",
+            "exchanges": [
+                {"input": ("biosphere", 1), "amount": amount},
+                {"input": ["biosphere", "2"], "amount": {"amount": 2, "loc": 2}},
+            ],
+        }
+        for name, amount in [("first", 1.5), ("second", -3)]
+    ]
+
+
+def _method_contents(name):
+    method = Method(name)
+    dp = method.datapackage()
+    return (
+        dict(methods[name]),
+        method.load(),
+        dp.metadata["resources"],
+        [dp.get_resource(r["name"])[0].tolist() for r in dp.resources],
+    )
+
+
+@bw2test
+def test_write_methods_bulk():
+    initial_biosphere()
+    imp = LCIAImporter("test")
+    imp.data = lcia_data()
+    for ds in imp.data:
+        for cf in ds["exchanges"]:
+            cf["input"] = tuple(cf["input"])
+    imp.write_methods()
+    expected = {name: _method_contents(name) for name in methods}
+
+    imp = LCIAImporter("test")
+    imp.data = lcia_data()
+    with pytest.raises(ValueError):
+        imp.write_methods(bulk=True)
+    imp.write_methods(overwrite=True, bulk=True)
+    assert imp.write_report["methods"] == 2
+    assert imp.write_report["cfs"] == 4
+    assert {name: _method_contents(name) for name in methods} == expected
+
+
+@bw2test
+def test_write_methods_bulk_overwrite_deletes_files():
+    initial_biosphere()
+    imp = LCIAImporter("test")
+    imp.data = lcia_data()
+    imp.write_methods(bulk=True)
+    name = ("a method", "first")
+    method = Method(name)
+    processed = method.filepath_processed().rename(
+        method.filepath_processed().with_name("old.zip")
+    )
+    intermediate = method.dirpath_processed().parent / "intermediate"
+    (intermediate / (method.filename + ".pickle")).rename(intermediate / "old.pickle")
+    methods[name] = {**methods[name], "abbreviation": "old"}
+
+    imp.write_methods(overwrite=True, bulk=True)
+    assert not processed.exists()
+    assert not (intermediate / "old.pickle").exists()
+    assert methods[name]["abbreviation"] != "old"
+    assert Method(name).filepath_processed().exists()
+
+
+@bw2test
+def test_write_methods_bulk_flushes_metadata_once(monkeypatch):
+    initial_biosphere()
+    imp = LCIAImporter("test")
+    imp.data = lcia_data()
+    flushes = []
+    monkeypatch.setattr(methods, "flush", lambda *args, **kwargs: flushes.append(1))
+    imp.write_methods(bulk=True)
+    assert len(flushes) == 1
+    assert set(methods) == {("a method", "first"), ("a method", "second")}
+
+
+@bw2test
+def test_write_methods_bulk_registers_after_processing(monkeypatch):
+    initial_biosphere()
+    imp = LCIAImporter("test")
+    imp.data = lcia_data()
+
+    def fail(*args):
+        raise OSError
+
+    monkeypatch.setattr("bw2io.importers.bulk_lcia._write_processed", fail)
+    with pytest.raises(OSError):
+        imp.write_methods(bulk=True)
+    assert not len(methods)
+
+
+@bw2test
+def test_write_methods_bulk_processes():
+    initial_biosphere()
+    imp = LCIAImporter("test")
+    imp.data = lcia_data()
+    imp.write_methods(bulk=True, processes=2)
+    array = (
+        Method(("a method", "second"))
+        .datapackage()
+        .get_resource("a_method_second_matrix_data.data")[0]
+    )
+    assert np.allclose(sorted(array), [-3, 2])
+
+
+@bw2test
+def test_write_methods_bulk_unknown_flow():
+    initial_biosphere()
+    imp = LCIAImporter("test")
+    imp.data = lcia_data()
+    imp.data[0]["exchanges"][0]["input"] = ("biosphere", "missing")
+    with pytest.raises(UnknownObject):
+        imp.write_methods(bulk=True)
+    assert not len(methods)
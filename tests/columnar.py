@@ -0,0 +1,137 @@
+import functools
+from copy import deepcopy
+
+import pytest
+from bw2data.tests import bw2test
+
+from bw2io import SingleOutputEcospold2Importer
+from bw2io.columnar import COLUMNAR_STRATEGIES, ColumnarData, get_columnar_strategy
+from bw2io.strategies import (
+    fix_unreasonably_high_lognormal_uncertainties,
+    normalize_units,
+)
+
+from .ecospold2.ecospold2_importer import FIXTURES
+
+
+def sample_data(bare_node=True):
+    data = [
+        {
+            "name": "a",
+            "unit": "kg",
+            "database": "db",
+            "code": "1",
+            "parameters": {"p": {"amount": 1, "unit": "m3"}},
+            "exchanges": [
+                {
+                    "type": "production",
+                    "name": "a",
+                    "unit": "kg",
+                    "amount": 1.0,
+                    "uncertainty type": 0,
+                    "loc": 1.0,
+                },
+                {
+                    "type": "production",
+                    "name": "b",
+                    "unit": "kg",
+                    "amount": 0.0,
+                    "uncertainty type": 0,
+                },
+                {
+                    "type": "technosphere",
+                    "name": "a",
+                    "unit": "kilowatt hour",
+                    "amount": -2.0,
+                    "uncertainty type": 2,
+                    "loc": 0.5,
+                    "scale": 3.0,
+                    "categories": ["not", "hashable"],
+                    "properties": {"foo": {"amount": 1.0}},
+                },
+                {
+                    "type": "technosphere",
+                    "name": "c",
+                    "unit": "MJ",
+                    "amount": 0.0,
+                    "uncertainty type": 0,
+                    "input": ("db", "2"),
+                },
+                {
+                    "type": "biosphere",
+                    "name": "c",
+                    "amount": 4.0,
+                    "uncertainty type": 2,
+                    "loc": 0.1,
+                    "scale": 1.0,
+                    "categories": ("air",),
+                    "comment": None,
+                },
+            ],
+        },
+        {"name": "empty", "exchanges": []},
+    ]
+    if bare_node:
+        data.insert(1, {"name": "no exchanges", "categories": ("air",)})
+    return data
+
+
+def test_round_trip():
+    data = sample_data()
+    assert ColumnarData.from_data(deepcopy(data)).to_data() == data
+
+
+def test_sequence_interface():
+    columnar = ColumnarData.from_data(sample_data())
+    assert len(columnar) == 3
+    assert columnar[-1] == {"name": "empty", "exchanges": []}
+    assert [ds["name"] for ds in columnar] == ["a", "no exchanges", "empty"]
+
+
+@pytest.mark.parametrize(
+    "strategy",
+    list(COLUMNAR_STRATEGIES)
+    + [
+        functools.partial(
+            fix_unreasonably_high_lognormal_uncertainties, cutoff=0.5, replacement=0.1
+        )
+    ],
+)
+def test_vectorized_strategy_matches(strategy):
+    expected = strategy(sample_data(bare_node=False))
+    vectorized = get_columnar_strategy(strategy)
+    assert vectorized is not None
+    columnar = ColumnarData.from_data(sample_data(bare_node=False))
+    assert vectorized(columnar).to_data() == expected
+
+
+def test_non_vectorized_strategy():
+    def add_comment(db):
+        for ds in db:
+            ds["comment"] = "hi"
+        return db
+
+    assert get_columnar_strategy(add_comment) is None
+    result = ColumnarData.from_data(sample_data()).apply(add_comment).to_data()
+    assert all(ds["comment"] == "hi" for ds in result)
+
+
+def test_columnar_units_relabel_then_filter():
+    columnar = ColumnarData.from_data(sample_data())
+    columnar = columnar.apply(normalize_units)
+    assert {exc.get("unit") for exc in columnar[0]["exchanges"]} == {
+        "kilogram",
+        "kilowatt hour",
+        "megajoule",
+        None,
+    }
+
+
+@bw2test
+def test_importer_columnar_strategies_same_result():
+    expected = SingleOutputEcospold2Importer(FIXTURES, "ei", use_mp=False)
+    expected.apply_strategies()
+    imp = SingleOutputEcospold2Importer(FIXTURES, "ei", use_mp=False)
+    imp.apply_strategies(columnar=True)
+    assert isinstance(imp.data, list)
+    assert imp.data == expected.data
@@ -0,0 +1,79 @@
+import pytest
+from bw2data import Database, get_node
+from bw2data.tests import bw2test
+
+pytest.importorskip("ecoinvent_interface")
+
+from bw2io.ecoinvent import (  # noqa: E402
+    CF_LABELS,
+    biosphere_flow_mapping,
+    group_characterization_factors,
+    header_columns,
+    header_dict,
+)
+
+ROWS = [
+    ["Method", "Category", "Indicator", "Name", "Compartment", "Subcompartment", "CF"],
+    ["m", "c", "i1", "Carbon dioxide, fossil", "air", "unspecified", 1],
+    ["m", "c", "i2", "Methane", "air", "urban", 28.5],
+    [None] * 7,
+    ["m", "c", "i1", "Methane", "air", "urban", 29],
+    ["m", "c", "i1", "Methan", "air", "urban", 30],
+    ["m", "c", "i2", "Unobtainium", "air", "urban", 2],
+    ["m", "c", "i3", "Methane", "air", "urban", None],
+    ["m", "c", "i1", "Carbon dioxide, fossil", "air", "unspecified", 2],
+]
+
+MAPPING = {
+    ("Carbon dioxide, fossil", "air"): 1,
+    ("Methane", "air", "urban"): 2,
+    ("Ethane", "air", "urban"): 3,
+}
+
+
+def test_header_columns():
+    columns = header_columns(iter(ROWS), ["name", "cf"])
+    expected = header_dict(ROWS)
+    assert columns == {
+        "name": [row["name"] for row in expected],
+        "cf": [row["cf"] for row in expected],
+    }
+    assert header_columns(iter(ROWS[:1]), ["name", "cf"]) == {"name": [], "cf": []}
+    assert header_columns(iter(ROWS), ["cf"])["cf"][:2] == [1, 28.5]
+    with pytest.raises(KeyError):
+        header_columns(iter(ROWS), ["cf 3.4"])
+
+
+def test_group_characterization_factors(capsys):
+    columns = header_columns(ROWS, CF_LABELS + ("cf",))
+    assert group_characterization_factors(columns, "cf", MAPPING) == {
+        ("m", "c", "i1"): [(1, 1.0), (2, 29.0), (2, 30.0), (1, 2.0)],
+        ("m", "c", "i2"): [(2, 28.5)],
+    }
+    assert capsys.readouterr().out.splitlines() == [
+        "Substituting Methane for Methan",
+        "Skipping unmatched flow Unobtainium:(air, urban)",
+    ]
+    assert list(
+        group_characterization_factors(columns, "cf", MAPPING, prefix=("ei",))
+    ) == [("ei", "m", "c", "i1"), ("ei", "m", "c", "i2")]
+
+
+def test_group_characterization_factors_empty():
+    columns = header_columns(ROWS[:1], CF_LABELS + ("cf",))
+    assert group_characterization_factors(columns, "cf", MAPPING) == {}
+
+
+@bw2test
+def test_biosphere_flow_mapping():
+    Database("bio").write(
+        {
+            ("bio", "a"): {"name": "CO2", "categories": ("air",)},
+            ("bio", "b"): {"name": "[Deleted]Land", "categories": ("soil", "land")},
+        }
+    )
+    assert biosphere_flow_mapping("bio") == {
+        ("CO2", "air"): get_node(code="a").id,
+        ("[Deleted]Land", "soil", "land"): get_node(code="b").id,
+        ("Land", "soil", "land"): get_node(code="b").id,
+    }
@@ -1,5 +1,8 @@
+from copy import deepcopy
 from pathlib import Path
 
+from lxml import etree
+
 from bw2io.extractors.ecospold1 import Ecospold1DataExtractor
 
 FIXTURES = Path(__file__).parent.parent / "fixtures" / "ecospold1"
@@ -119,3 +122,58 @@ def test_ecospold1_extractor():
             continue
         assert value == EXPECTED[key]
     assert EXPECTED["exchanges"][0] == ei["exchanges"][0]
+
+
+def multi_dataset_file(dirpath, num_datasets):
+    tree = etree.parse(
+        str(
+            FIXTURES
+            / "Acrylonitrile-butadiene-styrene copolymer (ABS), resin, at plant CTR.xml"
+        )
+    )
+    root = tree.getroot()
+    (dataset,) = root.findall("{%s}dataset" % Ecospold1DataExtractor.NAMESPACE)
+    for number in range(2, num_datasets + 1):
+        copy = deepcopy(dataset)
+        copy.set("number", str(number))
+        root.append(copy)
+    filepath = Path(dirpath) / "multi.xml"
+    tree.write(str(filepath), xml_declaration=True, encoding="utf-8")
+    return filepath
+
+
+def test_ecospold1_split_file(tmp_path):
+    filepath = multi_dataset_file(tmp_path, 5)
+    documents = list(Ecospold1DataExtractor.split_file(filepath, batch_size=2))
+    assert len(documents) == 3
+    assert [
+        [
+            ds["code"]
+            for ds in Ecospold1DataExtractor.process_document(d, filepath, "foo")
+        ]
+        for d in documents
+    ] == [[1, 2], [3, 4], [5]]
+
+
+def test_ecospold1_iter_extract_split_datasets(tmp_path):
+    filepath = multi_dataset_file(tmp_path, 5)
+    expected = Ecospold1DataExtractor.process_file(filepath, "foo")
+    assert [ds["code"] for ds in expected] == [1, 2, 3, 4, 5]
+    assert (
+        list(
+            Ecospold1DataExtractor.iter_extract(
+                filepath, "foo", use_mp=False, batch_size=2
+            )
+        )
+        == expected
+    )
+    assert (
+        Ecospold1DataExtractor.extract(
+            filepath,
+            "foo",
+            processes=2,
+            split_datasets=True,
+            batch_size=1,
+        )
+        == expected
+    )
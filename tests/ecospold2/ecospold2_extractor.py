@@ -1,8 +1,14 @@
+import os
 from pathlib import Path
 from lxml import objectify
 import pytest
 
-from bw2io.extractors.ecospold2 import Ecospold2DataExtractor, getattr2
+from bw2io.extractors import ExtractionCache
+from bw2io.extractors.ecospold2 import (
+    Ecospold2DataExtractor,
+    Ecospold2IterparseDataExtractor,
+    getattr2,
+)
 
 FIXTURES = Path(__file__).resolve().parent.parent / "fixtures" / "ecospold2"
 
@@ -286,6 +292,21 @@ def test_extraction_with_synonyms():
     assert data[0] == expected
 
 
+@pytest.mark.parametrize(
+    "filename",
+    [
+        "00000_11111111-2222-3333-4444-555555555555_66666666-7777-8888-9999-000000000000.spold",
+        "00000_11111111-2222-3333-4444-555555555555_66666666-7777-8888-9999-000000000000_with_synonyms.spold",
+    ],
+)
+def test_iterparse_extraction_matches_objectify(filename):
+    expected = Ecospold2DataExtractor.extract(FIXTURES / filename, "ei", use_mp=False)
+    data = Ecospold2IterparseDataExtractor.extract(
+        FIXTURES / filename, "ei", use_mp=False
+    )
+    assert data == expected
+
+
 @pytest.fixture(
     params=[
         ["Things and stuff and whatnot", "a Kiki comment", ""],
@@ -336,3 +357,78 @@ def test_condense_multiline_comment(request, activity_multiline_gc):
         getattr2(activity_multiline_gc, "generalComment")
     )
     assert res == expected
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_extraction_mp_chunked(ordered):
+    expected = Ecospold2DataExtractor.extract(FIXTURES, "ei", use_mp=False)
+    data = Ecospold2DataExtractor.extract(
+        FIXTURES, "ei", use_mp=True, processes=2, chunksize=1, ordered=ordered
+    )
+    if ordered:
+        assert data == expected
+    else:
+        key = lambda ds: ds["filename"]
+        assert sorted(data, key=key) == sorted(expected, key=key)
+
+
+def test_iter_extract_is_lazy():
+    iterator = Ecospold2DataExtractor.iter_extract(FIXTURES, "ei", use_mp=False)
+    first = next(iterator)
+    assert first["database"] == "ei"
+    assert len(list(iterator)) == 1
+
+
+def test_extraction_cache(tmp_path, monkeypatch):
+    cache = ExtractionCache(tmp_path)
+    expected = Ecospold2DataExtractor.extract(FIXTURES, "ei", use_mp=False)
+    data = Ecospold2DataExtractor.extract(FIXTURES, "ei", use_mp=False, cache=cache)
+    assert data == expected
+    assert len(cache) == 2
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Should use cached data")
+
+    monkeypatch.setattr(Ecospold2DataExtractor, "extract_activity", fail)
+    data = Ecospold2DataExtractor.extract(FIXTURES, "other", use_mp=False, cache=cache)
+    assert [ds["database"] for ds in data] == ["other", "other"]
+    assert [ds["filename"] for ds in data] == [ds["filename"] for ds in expected]
+
+
+def test_extraction_cache_keyed_by_extractor_version(tmp_path, monkeypatch):
+    cache = ExtractionCache(tmp_path)
+    Ecospold2DataExtractor.extract(FIXTURES, "ei", use_mp=False, cache=cache)
+    hashes = [cache.file_hash(fp) for fp in sorted(FIXTURES.glob("*.spold"))]
+    assert all(cache.get(Ecospold2DataExtractor, h) is not None for h in hashes)
+
+    monkeypatch.setattr(
+        Ecospold2DataExtractor, "version", Ecospold2DataExtractor.version + 1
+    )
+    assert all(cache.get(Ecospold2DataExtractor, h) is None for h in hashes)
+    Ecospold2DataExtractor.extract(FIXTURES, "ei", use_mp=False, cache=cache)
+    assert len(cache) == 4
+    assert cache.invalidate(Ecospold2DataExtractor) == 2
+    assert len(cache) == 2
+
+
+def test_extraction_cache_invalidate_file(tmp_path):
+    cache = ExtractionCache(tmp_path)
+    Ecospold2DataExtractor.extract(FIXTURES, "ei", use_mp=False, cache=cache)
+    filepath = next(FIXTURES.glob("*.spold"))
+    assert cache.invalidate(Ecospold2DataExtractor, filepath) == 1
+    assert len(cache) == 1
+    assert cache.clear() == 1
+    assert len(cache) == 0
+
+
+def test_extraction_cache_lru_eviction(tmp_path):
+    cache = ExtractionCache(tmp_path)
+    Ecospold2DataExtractor.extract(FIXTURES, "ei", use_mp=False, cache=cache)
+    first, second = sorted(
+        cache.dirpath.glob("*/*.pickle.z"), key=lambda fp: fp.stat().st_mtime
+    )
+    os.utime(first, (0, 0))
+    cache.max_size = second.stat().st_size
+    assert cache.evict() == 1
+    assert not first.exists()
+    assert second.exists()
@@ -0,0 +1,109 @@
+import datetime
+
+import pytest
+import xlsxwriter
+
+from bw2io.extractors import excel
+from bw2io.extractors.excel import ExcelExtractor
+
+calamine = pytest.mark.skipif(
+    excel.CalamineWorkbook is None, reason="requires python-calamine"
+)
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    filepath = tmp_path / "mixed.xlsx"
+    wb = xlsxwriter.Workbook(filepath)
+    ws = wb.add_worksheet("mixed")
+    ws.write_row(0, 0, ["  name ", 1, 1.0, 2.5, True, None, 1e20, -3])
+    ws.write_formula(1, 0, "=1/0", None, "#DIV/0!")
+    ws.write_formula(1, 1, "=1+1", None, 2)
+    date_format = wb.add_format({"num_format": "yyyy-mm-dd"})
+    ws.write_datetime(2, 0, datetime.datetime(2020, 1, 2), date_format)
+    ws.write(2, 3, "z")
+    ws.write(4, 2, "after empty row")
+    ws.write_formula(5, 0, '="a"&"b"', None, "ab")
+    ws.write_boolean(5, 1, False)
+    offset = wb.add_worksheet("offset")
+    offset.write(2, 2, "c")
+    offset.write(3, 4, 0.125)
+    wb.add_worksheet("empty")
+    wb.close()
+    return filepath
+
+
+EXPECTED = [
+    (
+        "mixed",
+        [
+            ["name", 1, 1, 2.5, True, None, 1e20, -3],
+            [None, 2, None, None, None, None, None, None],
+            [datetime.datetime(2020, 1, 2), None, None, "z"] + [None] * 4,
+            [None] * 8,
+            [None, None, "after empty row"] + [None] * 5,
+            ["ab", False] + [None] * 6,
+        ],
+    ),
+    (
+        "offset",
+        [
+            [None] * 5,
+            [None] * 5,
+            [None, None, "c", None, None],
+            [None, None, None, None, 0.125],
+        ],
+    ),
+    ("empty", []),
+]
+
+
+def typed(data):
+    return [(name, [[(type(x), x) for x in row] for row in ws]) for name, ws in data]
+
+
+@pytest.mark.parametrize(
+    "backend", ["openpyxl", pytest.param("calamine", marks=calamine)]
+)
+def test_extract_backends(workbook, backend):
+    assert typed(ExcelExtractor.extract(workbook, backend=backend)) == typed(EXPECTED)
+
+
+@calamine
+def test_default_backend_is_calamine(workbook, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError
+
+    monkeypatch.setattr(excel, "load_workbook", fail)
+    assert ExcelExtractor.extract(workbook) == EXPECTED
+
+
+@pytest.mark.parametrize(
+    "backend", ["openpyxl", pytest.param("calamine", marks=calamine)]
+)
+def test_extract_named_sheets(workbook, backend):
+    assert ExcelExtractor.extract(
+        workbook, sheets=["empty", "offset"], backend=backend
+    ) == [EXPECTED[2], EXPECTED[1]]
+    with pytest.raises(KeyError):
+        ExcelExtractor.extract(workbook, sheets=["missing"], backend=backend)
+
+
+@pytest.mark.parametrize(
+    "backend", ["openpyxl", pytest.param("calamine", marks=calamine)]
+)
+def test_iter_rows(workbook, backend):
+    rows = ExcelExtractor.iter_rows(workbook, "mixed", backend=backend)
+    assert next(rows) == EXPECTED[0][1][0]
+    assert list(rows) == EXPECTED[0][1][1:]
+    assert (
+        next(ExcelExtractor.iter_rows(workbook, "mixed", strip=False, backend=backend))[
+            0
+        ]
+        == "  name "
+    )
+
+
+def test_unknown_backend(workbook):
+    with pytest.raises(ValueError):
+        ExcelExtractor.extract(workbook, backend="pandas")
@@ -6,6 +6,7 @@ from bw2data.parameters import *
 from bw2data.tests import bw2test
 
 from bw2io import ExcelImporter
+from bw2io.importers.excel import RowRange, index_sections
 
 
 @pytest.fixture
@@ -365,3 +366,83 @@ def test_get_activity_metadata_indexing(no_init):
         "worksheet name": "a",
     }
     assert ei.get_activity("a", given) == expected
+
+
+def test_index_sections():
+    given = [
+        ["Database", "db"],
+        [" project parameters "],
+        ["Activity", "a"],
+        [1, "activity"],
+        [],
+        ["Exchanges"],
+        ["activity", "b"],
+        ["Parameters", "group"],
+    ]
+    sections = index_sections(given)
+    assert sections["database"] == [0]
+    assert sections["project parameters"] == [1]
+    assert sections["activity"] == [2, 6]
+    assert sections["exchanges"] == [5]
+    assert sections["parameters"] == [7]
+    assert sections["database parameters"] == []
+
+
+def test_row_range():
+    rows = [["a"], ["b"], ["c"], ["d"]]
+    view = RowRange(rows, 1, 4)
+    assert len(view) == 3
+    assert view[0] is rows[1]
+    assert view[-1] is rows[3]
+    assert view == [["b"], ["c"], ["d"]]
+    assert view[1:] == [["c"], ["d"]]
+    assert view[1:].rows is rows
+    assert view[:0] == []
+    assert view[::2] == [["b"], ["d"]]
+    assert list(view[1:][1:]) == [["d"]]
+    with pytest.raises(IndexError):
+        view[3]
+
+
+@bw2test
+def test_process_activities_sections(no_init, monkeypatch):
+    monkeypatch.setattr(
+        "bw2io.importers.excel.ExcelImporter.get_activity", lambda a, b, c: c
+    )
+    ei = ExcelImporter()
+    given = [
+        (
+            "n",
+            [
+                ["Activity", "a"],
+                ["unit", "kg"],
+                ["Exchanges"],
+                ["Activity", "b"],
+                ["Activity", "c"],
+                [],
+                ["Database", "db"],
+                ["Activity", "d"],
+            ],
+        )
+    ]
+    assert ei.process_activities(given) == [
+        [["Activity", "a"], ["unit", "kg"], ["Exchanges"]],
+        [["Activity", "b"]],
+        [["Activity", "c"], []],
+        [["Activity", "d"]],
+    ]
+    # Section index given for each worksheet
+    sections = [index_sections(given[0][1])]
+    assert ei.process_activities(given, sections)[1] == [["Activity", "b"]]
+
+
+@bw2test
+def test_get_activity_without_rows(no_init):
+    ei = ExcelImporter()
+    ei.db_name = "db"
+    assert ei.get_activity("a", [["Activity", "a"], ["Activity", "b"]]) == {
+        "name": "a",
+        "exchanges": [],
+        "worksheet name": "a",
+        "database": "db",
+    }
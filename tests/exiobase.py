@@ -0,0 +1,128 @@
+import zipfile
+
+import numpy as np
+import pytest
+from bw_processing.utils import resolve_dict_iterator
+
+from bw2io.extractors import Exiobase3MonetaryDataExtractor, MatrixCache
+from bw2io.importers.exiobase3_monetary import _processed_vector
+
+A = """region\tregion\tAT\tDE\tDE
+sector\tsector\tRice (01)\tSteel\tTrains
+region\tsector
+AT\tRice (01)\t0.5\t0\t1e-16
+DE\tSteel\t\t-2.25\t0.1
+DE\tTrains\t0.0\t0.3
+"""
+
+S = """region\tAT\tDE\tDE
+stressor\tRice (01)\tSteel\tTrains
+CO2 - combustion - air\t1.5\t0\t2
+Water\t0\t0\t0
+"""
+
+
+def write_tables(dirpath):
+    (dirpath / "satellite").mkdir()
+    (dirpath / "A.txt").write_text(A)
+    (dirpath / "satellite" / "S.txt").write_text(S)
+    return dirpath
+
+
+def test_get_technosphere_matrix(tmp_path):
+    inputs, outputs, matrix = Exiobase3MonetaryDataExtractor.get_technosphere_matrix(
+        write_tables(tmp_path)
+    )
+    assert inputs == [("Rice", "AT"), ("Steel", "DE"), ("Trains", "DE")]
+    assert outputs == [("Rice", "AT"), ("Steel", "DE"), ("Trains", "DE")]
+    assert matrix.shape == (3, 3)
+    assert matrix.row.tolist() == [0, 1, 1, 2]
+    assert matrix.col.tolist() == [0, 1, 2, 1]
+    assert matrix.data.tolist() == [0.5, -2.25, 0.1, 0.3]
+
+    _, _, matrix = Exiobase3MonetaryDataExtractor.get_technosphere_matrix(
+        tmp_path, ignore_small_balancing_corrections=False
+    )
+    assert matrix.data.tolist() == [0.5, 1e-16, -2.25, 0.1, 0.3]
+
+
+def test_get_biosphere_matrix(tmp_path):
+    flows, outputs, matrix = Exiobase3MonetaryDataExtractor.get_biosphere_matrix(
+        write_tables(tmp_path)
+    )
+    assert flows == ["CO2 - combustion - air", "Water"]
+    assert outputs == [("Rice", "AT"), ("Steel", "DE"), ("Trains", "DE")]
+    assert matrix.toarray().tolist() == [[1.5, 0, 2], [0, 0, 0]]
+
+
+def test_iterators(tmp_path):
+    write_tables(tmp_path)
+    assert list(
+        Exiobase3MonetaryDataExtractor.get_technosphere_iterator(tmp_path, 3)
+    ) == [
+        (("Rice", "AT"), ("Rice", "AT"), 0.5),
+        (("Steel", "DE"), ("Steel", "DE"), -2.25),
+        (("Steel", "DE"), ("Trains", "DE"), 0.1),
+        (("Trains", "DE"), ("Steel", "DE"), 0.3),
+    ]
+    assert list(Exiobase3MonetaryDataExtractor.get_biosphere_iterator(tmp_path)) == [
+        ("CO2 - combustion - air", ("Rice", "AT"), 1.5),
+        ("CO2 - combustion - air", ("Trains", "DE"), 2.0),
+    ]
+
+
+@pytest.mark.parametrize("root", ["", "IOT_2017_ixi/"])
+def test_read_from_zip(tmp_path, root):
+    filepath = tmp_path / "IOT_2017_ixi.zip"
+    with zipfile.ZipFile(filepath, "w") as zf:
+        zf.writestr("README.txt", "")
+        zf.writestr(root + "A.txt", A)
+        zf.writestr(root + "satellite/S.txt", S)
+    assert Exiobase3MonetaryDataExtractor.get_technosphere_matrix(filepath)[2].nnz == 4
+    assert list(Exiobase3MonetaryDataExtractor.get_biosphere_iterator(filepath)) == [
+        ("CO2 - combustion - air", ("Rice", "AT"), 1.5),
+        ("CO2 - combustion - air", ("Trains", "DE"), 2.0),
+    ]
+
+
+def test_matrix_cache(tmp_path):
+    cache = MatrixCache(tmp_path / "cache")
+    dirpath = tmp_path / "data"
+    dirpath.mkdir()
+    write_tables(dirpath)
+    extractor = Exiobase3MonetaryDataExtractor
+
+    inputs, outputs, matrix = extractor.get_technosphere_matrix(dirpath, cache=cache)
+    cached = extractor.get_technosphere_matrix(dirpath, cache=cache)
+    assert cached[:2] == (inputs, outputs)
+    assert isinstance(cached[2].data.base, np.memmap)
+    assert (cached[2] != matrix).nnz == 0
+    assert (
+        extractor.get_technosphere_matrix(
+            dirpath, ignore_small_balancing_corrections=False, cache=cache
+        )[2].nnz
+        == 5
+    )
+
+    (dirpath / "A.txt").write_text(A.replace("0.5", "0.75"))
+    assert extractor.get_technosphere_matrix(dirpath, cache=cache)[2].data[0] == 0.75
+    assert cache.clear() == 3
+
+
+def test_processed_vector_same_as_dict_iterator():
+    rows = np.array([3, 1, 3, 2, 1])
+    cols = np.array([1, 2, 0, 2, 2])
+    amounts = np.array([0.5, 2, -1, 0.25, 1])
+    flip = np.array([True, False, True, True, False])
+    arrays = _processed_vector(rows, cols, amounts, flip)
+    data, indices, distributions, flips, _, _ = resolve_dict_iterator(
+        {"row": r, "col": c, "amount": a, "flip": f, "uncertainty_type": 0}
+        for r, c, a, f in zip(rows, cols, amounts, flip)
+    )
+    assert np.array_equal(arrays["data_array"], data)
+    assert np.array_equal(arrays["indices_array"], indices)
+    assert np.array_equal(arrays["flip_array"], flips)
+    for field in distributions.dtype.names:
+        assert np.array_equal(
+            arrays["distributions_array"][field], distributions[field], equal_nan=True
+        )
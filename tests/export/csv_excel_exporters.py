@@ -3,6 +3,8 @@ import tempfile
 
 import pytest
 from bw2data import Database
+from bw2data.backends import ActivityDataset
+from bw2data.errors import UnknownObject
 from bw2data.parameters import (
     ActivityParameter,
     DatabaseParameter,
@@ -13,7 +15,7 @@ from bw2data.parameters import (
 )
 from bw2data.tests import bw2test
 
-from bw2io.export.csv import write_lci_csv
+from bw2io.export.csv import CSVFormatter, write_lci_csv
 from bw2io.export.excel import write_lci_excel
 from bw2io.extractors.csv import CSVExtractor
 from bw2io.extractors.excel import ExcelExtractor
@@ -86,6 +88,48 @@ def test_write_lci_csv_complicated(setup):
     assert given == expected
 
 
+@pytest.mark.parametrize("batch_size", [1, 500])
+def test_csv_formatter_batches_same_as_per_activity(setup, batch_size):
+    formatter = CSVFormatter("example")
+    expected = [
+        formatter.get_activity(act)
+        for act in sorted(Database("example"), key=lambda x: x["name"])
+    ]
+    assert expected[0]["parameters"]
+    assert (
+        list(CSVFormatter("example", batch_size=batch_size).iter_activities())
+        == expected
+    )
+
+
+def test_csv_formatter_no_queries_per_activity(setup, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("Per-activity lookup")
+
+    formatter = CSVFormatter("example")
+    monkeypatch.setattr(type(next(iter(Database("example")))), "exchanges", fail)
+    monkeypatch.setattr(formatter, "get_activity_parameters", fail)
+    assert len(formatter.get_formatted_data()) > 10
+
+
+@bw2test
+def test_csv_formatter_missing_input():
+    Database("example").write(
+        {
+            ("example", "a"): {
+                "name": "a",
+                "exchanges": [
+                    {"input": ("example", "b"), "amount": 1, "type": "technosphere"}
+                ],
+            },
+            ("example", "b"): {"name": "b"},
+        }
+    )
+    ActivityDataset.delete().where(ActivityDataset.code == "b").execute()
+    with pytest.raises(UnknownObject):
+        list(CSVFormatter("example").iter_activities())
+
+
 def test_write_lci_excel_complicated(setup):
     fp = write_lci_excel("example")
     given = ExcelExtractor.extract(fp)[0][1]
@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+import scipy.io
+from bw2data import Database, get_node
+from bw2data.tests import bw2test
+
+from bw2io.export import (
+    lci_matrices_to_excel,
+    lci_matrices_to_matlab,
+    lci_matrices_to_npz,
+)
+from bw2io.extractors import ExcelExtractor
+
+
+@pytest.fixture
+@bw2test
+def setup():
+    Database("bio").write(
+        {
+            ("bio", "co2"): {
+                "name": "CO2",
+                "unit": "kg",
+                "categories": ("air", "urban"),
+                "type": "emission",
+            },
+            ("bio", "zero"): {
+                "name": "Zero",
+                "categories": ("air",),
+                "type": "emission",
+            },
+        }
+    )
+    Database("up").write(
+        {
+            ("up", "u"): {
+                "name": "upstream",
+                "unit": "kg",
+                "exchanges": [
+                    {"input": ("up", "u"), "amount": 1, "type": "production"},
+                    {"input": ("bio", "co2"), "amount": 3, "type": "biosphere"},
+                ],
+            },
+        }
+    )
+    Database("db").write(
+        {
+            ("db", "b"): {
+                "name": "b",
+                "unit": "kg",
+                "location": "GLO",
+                "reference product": "product b",
+                "exchanges": [
+                    {"input": ("db", "b"), "amount": 1, "type": "production"},
+                    {"input": ("db", "a"), "amount": 0.5, "type": "technosphere"},
+                    {"input": ("bio", "co2"), "amount": 2, "type": "biosphere"},
+                    {"input": ("bio", "zero"), "amount": 0, "type": "biosphere"},
+                ],
+            },
+            ("db", "a"): {
+                "name": "a",
+                "unit": "kg",
+                "exchanges": [
+                    {"input": ("db", "a"), "amount": 2, "type": "production"},
+                    {"input": ("up", "u"), "amount": 4, "type": "technosphere"},
+                ],
+            },
+        }
+    )
+
+
+def test_lci_matrices_to_excel(setup, tmp_path):
+    data = dict(ExcelExtractor.extract(lci_matrices_to_excel("db", dirpath=tmp_path)))
+    assert data["technosphere"] == [
+        [None, "a", "b", "upstream"],
+        ["a", 2, -0.5, None],
+        ["b", None, 1, None],
+        ["upstream", -4, None, 1],
+    ]
+    assert data["biosphere"] == [[None, "a", "b", "upstream"], ["CO2", None, 2, 3]]
+    assert data["technosphere-labels"][1:] == [
+        [1, "a", None, "kg", None, "Unknown"],
+        [2, "b", "product b", "kg", None, "GLO"],
+        [3, "upstream", None, "kg", None, "Unknown"],
+    ]
+    assert data["biosphere-labels"] == [
+        ["Index", "Name", "Unit", "Categories"],
+        [1, "CO2", "kg", "air - urban"],
+    ]
+
+
+def test_lci_matrices_to_excel_without_descendants(setup, tmp_path):
+    fp = lci_matrices_to_excel("db", include_descendants=False, dirpath=tmp_path)
+    data = dict(ExcelExtractor.extract(fp))
+    assert data["technosphere"][0] == [None, "a", "b"]
+    assert data["technosphere"][3] == ["upstream", -4, None]
+    assert data["biosphere"] == [[None, "a", "b"], ["CO2", None, 2]]
+
+
+def test_lci_matrices_to_npz(setup, tmp_path):
+    arrays = np.load(lci_matrices_to_npz("db", dirpath=tmp_path))
+    technosphere = scipy.sparse.coo_matrix(
+        (
+            arrays["technosphere_data"],
+            (arrays["technosphere_row"], arrays["technosphere_col"]),
+        ),
+        shape=arrays["technosphere_shape"],
+    ).toarray()
+    names = arrays["activities_name"].tolist()
+    assert sorted(names) == ["a", "b", "upstream"]
+    assert arrays["products_name"].tolist() == names
+    a, b = names.index("a"), names.index("b")
+    assert technosphere[a, b] == -0.5
+    assert arrays["activities_id"][b] == get_node(code="b").id
+    assert arrays["activities_reference_product"][b] == "product b"
+    flows = arrays["flows_categories"].tolist()
+    assert sorted(flows) == ["air", "air::urban"]
+    biosphere = scipy.sparse.coo_matrix(
+        (arrays["biosphere_data"], (arrays["biosphere_row"], arrays["biosphere_col"])),
+        shape=arrays["biosphere_shape"],
+    ).toarray()
+    assert biosphere[flows.index("air::urban"), b] == 2
+    assert arrays["biosphere_shape"].tolist() == [2, 3]
+
+
+def test_lci_matrices_to_matlab(setup, tmp_path):
+    assert lci_matrices_to_matlab("db", dirpath=tmp_path) == tmp_path
+    matrices = scipy.io.loadmat(tmp_path / "db.mat")
+    assert matrices["technosphere"].shape == (3, 3)
+    assert matrices["biosphere"].shape == (2, 3)
+    data = dict(ExcelExtractor.extract(tmp_path / "db.xlsx"))
+    assert sorted(row[1] for row in data["technosphere"][1:]) == ["a", "b", "upstream"]
+    assert len(data["biosphere"]) == 3
@@ -0,0 +1,98 @@
+from bw2data import Database, get_node
+from bw2data.tests import bw2test
+
+from bw2io import lookup
+from bw2io.lookup import clear_cache, database_nodes, iter_database_nodes
+
+
+def write_biosphere():
+    Database("bio").write(
+        {
+            ("bio", "a"): {
+                "name": "CO2",
+                "categories": ("air",),
+                "unit": "kilogram",
+                "type": "emission",
+            },
+            ("bio", "b"): {
+                "name": "Land",
+                "categories": ("natural resource", "land"),
+                "type": "natural resource",
+            },
+        }
+    )
+
+
+@bw2test
+def test_database_nodes():
+    write_biosphere()
+    nodes = sorted(
+        database_nodes("bio", ["name", "categories", "unit", "key", "id"]),
+        key=lambda node: node["name"],
+    )
+    assert nodes == [
+        {
+            "name": "CO2",
+            "categories": ("air",),
+            "unit": "kilogram",
+            "key": ("bio", "a"),
+            "id": get_node(code="a").id,
+        },
+        {
+            "name": "Land",
+            "categories": ("natural resource", "land"),
+            "key": ("bio", "b"),
+            "id": get_node(code="b").id,
+        },
+    ]
+    assert sorted(node["code"] for node in database_nodes("bio")) == ["a", "b"]
+
+
+@bw2test
+def test_database_nodes_missing_database():
+    assert database_nodes("nope", ["code"]) == []
+
+
+@bw2test
+def test_database_nodes_cache_invalidated():
+    write_biosphere()
+    nodes = database_nodes("bio", ["name"])
+    assert database_nodes("bio", ["name"]) is nodes
+
+    node = get_node(code="a")
+    node["name"] = "Carbon dioxide"
+    node.save()
+    assert sorted(node["name"] for node in database_nodes("bio", ["name"])) == [
+        "Carbon dioxide",
+        "Land",
+    ]
+
+    Database("bio").write({("bio", "c"): {"name": "Water"}})
+    assert database_nodes("bio", ["name"]) == [{"name": "Water"}]
+
+    Database("bio").delete(warn=False)
+    assert database_nodes("bio", ["name"]) == []
+
+
+@bw2test
+def test_database_nodes_cache_size(monkeypatch):
+    monkeypatch.setattr(lookup, "CACHE_SIZE", 2)
+    clear_cache()
+    write_biosphere()
+    nodes = database_nodes("bio", ["name"])
+    database_nodes("bio", ["code"])
+    assert database_nodes("bio", ["name"]) is nodes
+    database_nodes("bio", ["type"])
+    assert len(lookup._cache) == 2
+    assert database_nodes("bio", ["name"]) is nodes
+
+    clear_cache()
+    assert not lookup._cache
+    assert database_nodes("bio", ["name"]) is not nodes
+
+
+@bw2test
+def test_iter_database_nodes_lazy():
+    nodes = iter_database_nodes("bio", ["name"], kinds=["emission"])
+    write_biosphere()
+    assert list(nodes) == [{"name": "CO2", "type": "emission"}]
@@ -1,4 +1,13 @@
-from bw2io.strategies.parameterization import variable_subtitutor
+import pytest
+from bw2parameters import ParameterSet
+from bw2parameters.errors import ParameterError, SelfReference
+
+from bw2io.strategies.parameterization import (
+    ReservedVariableNameSubstitutor,
+    compile_formula,
+    evaluate_parameters,
+    variable_subtitutor,
+)
 
 
 def test_yield_in_formula():
@@ -23,3 +32,103 @@ def test_yield_at_end():
     given = "foo*yield"
     expected = "foo*YIELD"
     assert variable_subtitutor.fix_formula(given) == expected
+
+
+def test_adjacent_reserved_names():
+    assert variable_subtitutor.fix_formula("yield*yield") == "YIELD*YIELD"
+    assert variable_subtitutor.fix_formula("max(min, 2)") == "MAX(MIN, 2)"
+
+
+def test_reserved_name_prefix():
+    assert variable_subtitutor.fix_formula("yield2 + max_a") == "yield2 + max_a"
+
+
+def test_fix_formula_cached():
+    substitutor = ReservedVariableNameSubstitutor(cache_size=1)
+    assert substitutor.fix_formula("yield") == "YIELD"
+    assert substitutor.fix_formula("yield") == "YIELD"
+    assert substitutor._fix_formula.cache_info().hits == 1
+
+
+def parameterized_datasets():
+    return [
+        {
+            "parameters": {
+                "a": {"amount": a},
+                "b": {"formula": "sqrt(c) + a"},
+                "c": {"formula": "a * scale"},
+            },
+            "exchanges": [
+                {"formula": "b / 2"},
+                {"formula": "a if a > 1 else -1"},
+                {"formula": "missing", "amount": 4},
+                {"amount": 5},
+            ],
+        }
+        for a in (1, 2.5, 4)
+    ]
+
+
+def test_compile_formula():
+    names, code = compile_formula("max(a, 2) * sqrt(b) + -c ** 2")
+    assert names == {"a", "b", "c", "max", "sqrt"}
+    assert code is not None
+    assert compile_formula("a if a > 1 else b") == ({"a", "b"}, None)
+    assert compile_formula("a.real")[1] is None
+
+
+def test_evaluate_parameters_same_as_parameter_set():
+    expected = parameterized_datasets()
+    for ds in expected:
+        ParameterSet(ds["parameters"], {"scale": 3})(ds["exchanges"])
+    given = evaluate_parameters(parameterized_datasets(), {"scale": 3})
+    for ds, other in zip(given, expected):
+        for name, parameter in ds["parameters"].items():
+            assert parameter["amount"] == pytest.approx(
+                other["parameters"][name]["amount"]
+            )
+        assert [exc["amount"] for exc in ds["exchanges"]] == pytest.approx(
+            [exc["amount"] for exc in other["exchanges"]]
+        )
+    assert given[0]["exchanges"][1]["amount"] == -1
+
+
+def test_evaluate_parameters_global_precedence():
+    db = [{"parameters": {"scale": {"amount": 1}, "a": {"formula": "scale * 2"}}}]
+    evaluate_parameters(db, {"scale": 3})
+    assert db[0]["parameters"]["scale"]["amount"] == 3
+    assert db[0]["parameters"]["a"]["amount"] == 6
+
+
+def test_evaluate_parameters_without_parameters():
+    db = [{"exchanges": [{"formula": "2 * 3"}]}, {"name": "foo"}]
+    assert evaluate_parameters(db)[0]["exchanges"][0]["amount"] == 6
+
+
+def test_evaluate_parameters_errors():
+    with pytest.raises(SelfReference):
+        evaluate_parameters([{"parameters": {"a": {"formula": "a + 1"}}}])
+    with pytest.raises(ParameterError):
+        evaluate_parameters(
+            [{"parameters": {"a": {"formula": "b"}, "b": {"formula": "a"}}}]
+        )
+    with pytest.raises(ParameterError):
+        evaluate_parameters([{"parameters": {"a": {"formula": "unknown"}}}])
+    with pytest.raises(ZeroDivisionError):
+        evaluate_parameters(
+            [{"parameters": {"a": {"amount": 0}, "b": {"formula": "1 / a"}}}]
+        )
+
+
+def test_evaluate_parameters_zero_division_from_vectorized():
+    def parameters():
+        return {
+            "a": {"amount": 1},
+            "z": {"formula": "a - 1"},
+            "b": {"formula": "a / z"},
+        }
+
+    with pytest.raises(ZeroDivisionError):
+        ParameterSet(parameters()).evaluate()
+    with pytest.raises(ZeroDivisionError):
+        evaluate_parameters([{"parameters": parameters()}])
@@ -0,0 +1,133 @@
+import os
+from types import GeneratorType
+
+from bw2data.tests import bw2test
+
+from bw2io.extractors.simapro_csv import (
+    SimaProCSVExtractor,
+    compile_uppercase_names,
+    replace_with_uppercase,
+)
+
+SP_FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "simapro")
+
+HEADER = """{SimaPro 9.0.0}
+{processes}
+{Project: streaming}
+{CSV separator: Semicolon}
+{Decimal separator: .}
+
+"""
+
+PROCESS = """Process
+
+Process identifier
+{code}
+
+Products
+{name};kg;1;100;not defined;Others;
+
+Materials/fuels
+Steel;kg;2*Scale;Undefined;0;0;0;
+
+End
+
+"""
+
+PARAMETERS = """Project Input parameters
+scale;3;Undefined;0;0;0;No;
+
+Quantities
+Mass;Yes
+"""
+
+# Ignored, as it comes after the end of the datasets
+LATE_PROCESS = """
+Process
+
+Process identifier
+late
+
+Products
+late;kg;1;100;not defined;Others;
+
+End
+"""
+
+
+def write_file(dirpath):
+    filepath = os.path.join(dirpath, "streaming.csv")
+    with open(filepath, "w", encoding="latin-1") as f:
+        f.write(
+            HEADER
+            + PROCESS.format(code="a", name="first")
+            + PROCESS.format(code="b", name="second")
+            + PARAMETERS
+            + LATE_PROCESS
+        )
+    return filepath
+
+
+@bw2test
+def test_iter_extract_resolves_global_parameters_first(tmp_path):
+    datasets, global_parameters, metadata = SimaProCSVExtractor.iter_extract(
+        write_file(tmp_path), encoding="latin-1"
+    )
+    assert isinstance(datasets, GeneratorType)
+    assert global_parameters["SCALE"]["amount"] == 3
+    assert metadata["Project"] == "streaming"
+
+    first = next(datasets)
+    assert first["code"] == "a"
+    assert first["database"] == "streaming"
+    (steel,) = [exc for exc in first["exchanges"] if exc["name"] == "Steel"]
+    assert steel["formula"] == "2*SCALE"
+    assert steel["amount"] == 6
+    assert [ds["code"] for ds in datasets] == ["b"]
+
+
+@bw2test
+def test_extract_same_as_iter_extract(tmp_path):
+    filepath = write_file(tmp_path)
+    datasets, global_parameters, metadata = SimaProCSVExtractor.iter_extract(
+        filepath, encoding="latin-1"
+    )
+    assert SimaProCSVExtractor.extract(filepath, encoding="latin-1") == (
+        list(datasets),
+        global_parameters,
+        metadata,
+    )
+
+
+@bw2test
+def test_iter_extract_batch_size(tmp_path):
+    filepath = write_file(tmp_path)
+    datasets, _, _ = SimaProCSVExtractor.iter_extract(
+        filepath, encoding="latin-1", batch_size=1
+    )
+    assert [[exc.get("amount") for exc in ds["exchanges"]] for ds in datasets] == [
+        [1, 6]
+    ] * 2
+
+
+@bw2test
+def test_extract_fixture():
+    datasets, _, metadata = SimaProCSVExtractor.extract(
+        os.path.join(SP_FIXTURES_DIR, "allocation.csv"), encoding="latin-1"
+    )
+    assert len(datasets) == 2
+    assert metadata["Project"]
+
+
+def test_replace_with_uppercase():
+    names = ["A", "AREA", "P2"]
+    assert replace_with_uppercase("a*Area+p2", names) == "A*AREA+P2"
+    # Only whole names, also when adjacent
+    assert replace_with_uppercase("a*a+area_2+ab", names) == "A*A+area_2+ab"
+    assert replace_with_uppercase("sqrt(a)/2a", names) == "sqrt(A)/2A"
+
+
+def test_compile_uppercase_names():
+    precompiled = compile_uppercase_names(["SCALE"])
+    assert replace_with_uppercase("2*scale", ["SCALE"], precompiled) == "2*SCALE"
+    assert precompiled("Scale+unknown") == "SCALE+unknown"
@@ -1,7 +1,12 @@
+import logging
+
+import pytest
 from stats_arrays import LognormalUncertainty, UndefinedUncertainty
 
 from bw2io.strategies.ecospold2 import (
     add_cpc_classification_from_single_reference_product,
+    delete_exchanges_missing_activity,
+    delete_ghost_exchanges,
     delete_none_synonyms,
     drop_temporary_outdated_biosphere_flows,
     fix_unreasonably_high_lognormal_uncertainties,
@@ -387,5 +392,56 @@ def test_delete_none_synonyms():
     assert delete_none_synonyms(db) == expected
 
 
+@pytest.fixture
+def io_logger(monkeypatch, tmp_path):
+    """Write strategy logs to ``tmp_path`` instead of the current project"""
+
+    def get_io_logger(name):
+        logger = logging.getLogger(name)
+        logger.addHandler(logging.FileHandler(tmp_path / (name + ".log")))
+        return logger, tmp_path / (name + ".log")
+
+    monkeypatch.setattr("bw2io.strategies.ecospold2.get_io_logger", get_io_logger)
+
+
+def test_delete_exchanges_missing_activity(io_logger):
+    db = [
+        {
+            "filename": "a",
+            "exchanges": [
+                {"type": "technosphere", "name": "unlinked"},
+                {"type": "technosphere", "name": "linked", "input": ("db", "a")},
+                {"type": "technosphere", "name": "other", "activity": "b"},
+                {"type": "biosphere", "name": "unlinked"},
+                {"type": "production", "name": "unlinked"},
+            ],
+        },
+        {"filename": "b", "exchanges": []},
+    ]
+    assert [
+        exc["name"] for exc in delete_exchanges_missing_activity(db)[0]["exchanges"]
+    ] == ["linked", "other", "unlinked"]
+    assert db[1]["exchanges"] == []
+
+
+def test_delete_ghost_exchanges(io_logger):
+    db = [
+        {
+            "filename": "a",
+            "exchanges": [
+                {"type": "technosphere", "name": "ghost"},
+                {"type": "technosphere", "name": "linked", "input": ("db", "a")},
+                {"type": "technosphere", "name": "ghost"},
+                {"type": "biosphere", "name": "unlinked"},
+            ],
+        },
+        {"filename": "b"},
+    ]
+    assert delete_ghost_exchanges(db)[0]["exchanges"] == [
+        {"type": "technosphere", "name": "linked", "input": ("db", "a")},
+        {"type": "biosphere", "name": "unlinked"},
+    ]
+
+
 if __name__ == "__main__":
     test_delete_none_synonyms()
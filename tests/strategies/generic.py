@@ -17,6 +17,7 @@ from bw2io.strategies import (
     split_exchanges,
     tupleize_categories,
 )
+from bw2io.strategies.generic import drop_exchanges
 
 
 def test_tupleize_exchanges():
@@ -914,3 +915,21 @@ def test_match_against_only_available_in_given_context_tree_custom_type():
         match_against_only_available_in_given_context_tree(given, "foo", kinds=["w00t"])
         == expected
     )
+
+
+def test_drop_exchanges():
+    first, second, third = {"amount": 0}, {"amount": 1}, {"amount": 0}
+    ds = {"exchanges": [first, second, third]}
+    dropped = drop_exchanges(ds, lambda exc: not exc["amount"])
+    assert dropped == [first, third]
+    assert dropped[1] is third
+    assert ds["exchanges"] == [second]
+    assert ds["exchanges"][0] is second
+
+
+def test_drop_exchanges_nothing_dropped():
+    exchanges = [{"amount": 1}]
+    ds = {"exchanges": exchanges}
+    assert drop_exchanges(ds, lambda exc: False) == []
+    assert ds["exchanges"] is exchanges
+    assert drop_exchanges({}, lambda exc: True) == []
@@ -4,7 +4,8 @@ import unittest
 import pytest
 
 from bw2io.errors import StrategyError
-from bw2io.strategies import link_iterable_by_fields
+from bw2io.strategies import LinkIndex, link_iterable_by_fields
+from bw2io.strategies.generic import format_nonunique_key_error
 
 
 def test_all_datasets_in_target_have_database_field():
@@ -488,3 +489,47 @@ def test_without_node_filters():
     ]
 
     assert link_iterable_by_fields(unlinked, internal=True) == expected
+
+
+def test_link_index_reused_across_calls():
+    other = [
+        {"name": "foo", "categories": ["bar"], "database": "db", "code": "first"},
+        {"name": "baz", "categories": ("bar",), "database": "db", "code": "second"},
+    ]
+    index = LinkIndex.from_nodes(other, fields=["name", "categories"])
+    assert len(index) == 2
+
+    first = [{"exchanges": [{"name": "FOO", "categories": ("bar",)}]}]
+    second = [{"exchanges": [{"name": "baz", "categories": ["Bar"]}]}]
+    linked = link_iterable_by_fields(first, index=index)
+    assert linked[0]["exchanges"][0]["input"] == ("db", "first")
+    linked = link_iterable_by_fields(second, index=index)
+    assert linked[0]["exchanges"][0]["input"] == ("db", "second")
+
+
+def test_link_index_fields_mismatch():
+    index = LinkIndex.from_nodes([], fields=["name"])
+    with pytest.raises(ValueError):
+        link_iterable_by_fields([], index=index, fields=["name", "unit"])
+
+
+def test_link_index_nonunique_error_message():
+    data = [
+        {"name": "foo", "database": "a", "code": "b"},
+        {"name": "foo", "database": "a", "code": "c"},
+    ]
+    index = LinkIndex.from_nodes(data, fields=["name"])
+    with pytest.raises(StrategyError) as error:
+        index.get({"name": "foo"})
+    assert str(error.value) == format_nonunique_key_error(
+        {"name": "foo"}, ["name"], [data[1]]
+    )
+
+
+def test_link_index_fields_dont_run_together():
+    index = LinkIndex.from_nodes(
+        [{"name": "ab", "unit": "c", "database": "a", "code": "b"}],
+        fields=["name", "unit"],
+    )
+    assert index.get({"name": "a", "unit": "bc"}) is None
+    assert index.get({"name": "AB", "unit": "c"}) == ("a", "b")
@@ -1,8 +1,13 @@
 import pytest
 from bw2data.tests import bw2test
 
+from bw2io import Migration
 from bw2io.errors import MissingMigration
-from bw2io.strategies import migrate_datasets, migrate_exchanges
+from bw2io.strategies import (
+    get_migration_index,
+    migrate_datasets,
+    migrate_exchanges,
+)
 
 
 @bw2test
@@ -15,3 +20,32 @@ def test_migrate_exchanges_missing_migration():
 def test_migrate_datasets_missing_migration():
     with pytest.raises(MissingMigration):
         migrate_datasets([], "foo")
+
+
+@bw2test
+def test_migrate_exchanges_with_index():
+    Migration("foo").write(
+        {
+            "fields": ["name", "unit"],
+            "data": [
+                (("Foo", "kg"), {"name": "bar", "multiplier": 2}),
+            ],
+        },
+        description="test",
+    )
+    index = get_migration_index("foo")
+    db = [{"exchanges": [{"name": "foo", "unit": "KG", "amount": 1}]}]
+    assert migrate_exchanges(db, "foo", index=index) == [
+        {
+            "exchanges": [
+                {
+                    "name": "bar",
+                    "unit": "KG",
+                    "amount": 2,
+                    "loc": 2,
+                }
+            ]
+        }
+    ]
+    db = [{"name": "Foo", "unit": "kg"}]
+    assert migrate_datasets(db, "foo", index=index) == [{"name": "bar", "unit": "kg"}]
@@ -0,0 +1,118 @@
+import functools
+from copy import deepcopy
+
+from bw2data.tests import bw2test
+
+from bw2io import SingleOutputEcospold2Importer
+from bw2io.errors import StrategyError
+from bw2io.importers.base_lci import LCIImporter
+from bw2io.strategies import (
+    fix_unreasonably_high_lognormal_uncertainties,
+    link_iterable_by_fields,
+    normalize_units,
+    per_dataset,
+    set_lognormal_loc_value,
+)
+from bw2io.strategies.parallel import (
+    apply_per_dataset_strategies,
+    group_strategies,
+    is_per_dataset,
+)
+
+from ..ecospold2.ecospold2_importer import FIXTURES
+
+
+@per_dataset
+def double_amounts(db):
+    for ds in db:
+        for exc in ds["exchanges"]:
+            exc["amount"] *= 2
+    return db
+
+
+@per_dataset
+def fail_on_b(db):
+    for ds in db:
+        if ds["name"] == "b":
+            raise StrategyError("b")
+    return db
+
+
+def data():
+    return [
+        {
+            "name": name,
+            "unit": "kg",
+            "exchanges": [
+                {
+                    "amount": float(i),
+                    "unit": "kg",
+                    "type": "technosphere",
+                    "uncertainty type": 2,
+                    "scale": 3.0,
+                }
+            ],
+        }
+        for i, name in enumerate("abcdefghij", start=1)
+    ]
+
+
+def test_is_per_dataset():
+    assert is_per_dataset(normalize_units)
+    assert is_per_dataset(
+        functools.partial(fix_unreasonably_high_lognormal_uncertainties, cutoff=1)
+    )
+    assert not is_per_dataset(link_iterable_by_fields)
+
+
+def test_group_strategies():
+    strategies = [
+        normalize_units,
+        double_amounts,
+        link_iterable_by_fields,
+        set_lognormal_loc_value,
+        link_iterable_by_fields,
+    ]
+    assert group_strategies(strategies) == [
+        [normalize_units, double_amounts],
+        [link_iterable_by_fields],
+        [set_lognormal_loc_value],
+        [link_iterable_by_fields],
+    ]
+
+
+def test_apply_per_dataset_strategies():
+    strategies = [
+        normalize_units,
+        double_amounts,
+        set_lognormal_loc_value,
+        functools.partial(fix_unreasonably_high_lognormal_uncertainties, cutoff=1),
+    ]
+    expected = data()
+    for strategy in strategies:
+        expected = strategy(expected)
+
+    original = data()
+    result = apply_per_dataset_strategies(
+        original, strategies, processes=2, chunksize=3
+    )
+    assert result == expected
+    assert original == data()
+
+
+def test_importer_parallel_fallback_on_strategy_error():
+    imp = LCIImporter("test")
+    imp.data = data()
+    imp.apply_strategies([double_amounts, fail_on_b], parallel=True, processes=2)
+    assert imp.applied_strategies == ["double_amounts"]
+    assert imp.data[0]["exchanges"][0]["amount"] == 2
+
+
+@bw2test
+def test_ecospold2_importer_parallel_same_result():
+    expected = SingleOutputEcospold2Importer(FIXTURES, "ei", use_mp=False)
+    expected.apply_strategies()
+    imp = SingleOutputEcospold2Importer(FIXTURES, "ei", use_mp=False)
+    imp.apply_strategies(parallel=True, processes=2)
+    assert imp.data == expected.data
+    assert imp.applied_strategies == expected.applied_strategies
@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+from bw2io.errors import StrategyError
+from bw2io.importers.base_lci import LCIImporter
+from bw2io.importers.profiling import StrategyReport, count_nodes_and_exchanges
+from bw2io.strategies import normalize_units
+
+
+def importer():
+    imp = LCIImporter("test")
+    imp.data = [
+        {
+            "name": "a",
+            "unit": "kg",
+            "exchanges": [
+                {"amount": 1, "unit": "kg", "type": "production"},
+                {"amount": 0, "unit": "MJ", "type": "technosphere"},
+            ],
+        },
+        {"name": "b", "unit": "kg", "exchanges": []},
+    ]
+    return imp
+
+
+def drop_zero_exchanges(data):
+    for ds in data:
+        ds["exchanges"] = [exc for exc in ds["exchanges"] if exc["amount"]]
+    return data
+
+
+def fails(data):
+    raise StrategyError("nope")
+
+
+class Signal:
+    def __init__(self):
+        self.emitted, self.reported = [], []
+
+    def emit(self, done, total):
+        self.emitted.append((done, total))
+
+    def report(self, row):
+        self.reported.append(row["strategy"])
+
+
+def test_count_nodes_and_exchanges():
+    assert count_nodes_and_exchanges(importer().data) == (2, 2)
+    assert count_nodes_and_exchanges(iter([])) == (None, None)
+
+
+def test_apply_strategies_profile():
+    imp = importer()
+    imp.signal = Signal()
+    imp.apply_strategies([normalize_units, drop_zero_exchanges, fails], profile=True)
+    report = imp.strategy_report
+    assert isinstance(report, StrategyReport)
+    assert [row["strategy"] for row in report] == [
+        "normalize_units",
+        "drop_zero_exchanges",
+        "fails",
+    ]
+    assert report[1]["exchanges_before"] == 2
+    assert report[1]["exchanges_after"] == 1
+    assert report[1]["nodes_after"] == 2
+    assert report[2]["error"] == "nope"
+    assert all(row["time"] >= 0 and row["stats"] is None for row in report)
+    assert imp.applied_strategies == ["normalize_units", "drop_zero_exchanges"]
+    assert imp.signal.emitted == [(1, 3), (2, 3), (3, 3)]
+    assert imp.signal.reported == [row["strategy"] for row in report]
+
+    assert json.loads(report.to_json()) == report.to_dicts()
+    assert "stats" not in report.to_dicts()[0]
+    assert "drop_zero_exchanges" in str(report)
+
+
+def test_apply_strategies_profile_new_report():
+    imp = importer()
+    imp.apply_strategies([normalize_units], profile=True)
+    imp.apply_strategies([drop_zero_exchanges], profile=True)
+    assert len(imp.strategy_report) == 1
+
+
+def test_apply_strategies_cprofile():
+    imp = importer()
+    imp.apply_strategies([drop_zero_exchanges], profile="cprofile")
+    assert imp.strategy_report[0]["stats"] is not None
+    assert "drop_zero_exchanges" in imp.strategy_report.print_stats(
+        "drop_zero_exchanges"
+    )
+    with pytest.raises(KeyError):
+        imp.strategy_report.print_stats("normalize_units")
+
+
+def test_apply_strategies_no_profile():
+    imp = importer()
+    imp.apply_strategies([normalize_units])
+    assert not hasattr(imp, "strategy_report")
@@ -1,5 +1,8 @@
+import gzip
+import io
 import json
 import shutil
+import tarfile
 
 import pytest
 from bw2data import Database, Method, projects
@@ -7,6 +10,8 @@ from bw2data.tests import bw2test
 
 from bw2io.backup import (
     _add_project_metadata,
+    _BlockGzipReader,
+    _BlockGzipWriter,
     _extract_single_directory_tarball,
     _remove_project_metadata,
     _restore_project_metadata,
@@ -115,3 +120,58 @@ def test_restore_project(sourced, tmp_path):
     assert projects.current == "something-else"
     assert projects.dataset.is_sourced
     assert projects.dataset.revision == revision
+
+
+def test_block_gzip_round_trip(tmp_path):
+    data = b"".join(str(i).encode() for i in range(200_000))
+    with open(tmp_path / "data.gz", "wb") as f:
+        writer = _BlockGzipWriter(f, threads=2, block_size=10_000)
+        writer.write(data[:500_000])
+        writer.set_stored(True)
+        writer.write(data[500_000:])
+        writer.close()
+    # Valid gzip file
+    assert gzip.decompress((tmp_path / "data.gz").read_bytes()) == data
+    with open(tmp_path / "data.gz", "rb") as f:
+        reader = _BlockGzipReader(f, threads=2)
+        assert reader.read(7) == data[:7]
+        assert reader.read(123_456) == data[7:123_463]
+        assert reader.read() == data[123_463:]
+        assert reader.read(10) == b""
+        reader.close()
+
+
+def test_restore_parallel_backup(sourced, tmp_path):
+    (projects.dir / "array.npy").write_bytes(bytes(100_000))
+    filepath = backup_project_directory(
+        "test-sourced", timestamp=False, dir_backup=tmp_path, parallel=True, threads=2
+    )
+    # Readable as a normal ``.tar.gz`` file
+    with tarfile.open(filepath, "r:gz") as tar:
+        assert any(name.endswith("/array.npy") for name in tar.getnames())
+    # Stored uncompressed
+    assert filepath.stat().st_size > 100_000
+
+    revision = projects.dataset.revision
+    projects.set_current("default")
+    projects.delete_project(name="test-sourced", delete_dir=True)
+
+    restore_project_directory(filepath, project_name="something-else", switch=True)
+    assert projects.current == "something-else"
+    assert projects.dataset.revision == revision
+    assert (projects.dir / "array.npy").read_bytes() == bytes(100_000)
+    assert Database("foo").metadata
+
+
+def test_parallel_backup_path_traversal(tmp_path):
+    with open(tmp_path / "evil.tar.gz", "wb") as f:
+        writer = _BlockGzipWriter(f, threads=1)
+        with tarfile.open(fileobj=writer, mode="w|") as tar:
+            info = tarfile.TarInfo("../evil.txt")
+            info.size = 4
+            tar.addfile(info, io.BytesIO(b"evil"))
+        writer.close()
+    (tmp_path / "out").mkdir()
+    with pytest.raises(Exception, match="path traversal"):
+        _extract_single_directory_tarball(tmp_path / "evil.tar.gz", tmp_path / "out")
+    assert not (tmp_path / "evil.txt").exists()